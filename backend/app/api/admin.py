@@ -0,0 +1,79 @@
+from typing import Optional
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.profiling import ProfilingSwitch, PROFILE_TARGETS, DEFAULT_PROFILE_TTL, MAX_PROFILE_TTL, list_profiles
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """X-Admin-Token 헤더가 PROFILE_SECRET과 같아야 함 (비밀값이 없으면 관리자 API 비활성)"""
+    if not settings.PROFILE_SECRET or not x_admin_token or not hmac.compare_digest(x_admin_token, settings.PROFILE_SECRET):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+# ==================== Request Models ====================
+
+class ProfilingRequest(BaseModel):
+    mode: str = "sample"          # sample (모든 스레드, flamegraph) / cprofile (함수별 누적 시간)
+    memory: bool = True           # tracemalloc 스냅샷 포함
+    ttl: int = DEFAULT_PROFILE_TTL  # 자동 해제까지 (초, 최대 MAX_PROFILE_TTL)
+
+
+# ==================== Endpoints ====================
+# Redis / 프로파일 디렉터리를 동기로 읽으므로 def (FastAPI가 스레드풀에서 실행)
+
+@router.get("/profiling")
+def get_profiling():
+    """대상별 프로파일링 상태 + 저장된 프로파일 파일"""
+    try:
+        return {
+            "targets": ProfilingSwitch().get_all(),
+            "files": list_profiles()
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed to read profiling state: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/profiling/{target}")
+def enable_profiling(target: str, request: ProfilingRequest):
+    """
+    프로파일링 켜기 (배포 없이, ttl 후 자동 해제)
+
+    crawl_full_site / incremental_update는 다음 작업 실행부터,
+    api는 X-Profile 헤더가 있는 요청만 프로파일링한다.
+    """
+    if target not in PROFILE_TARGETS:
+        raise HTTPException(status_code=404, detail=f"Unknown profiling target (one of {', '.join(PROFILE_TARGETS)})")
+    if not 0 < request.ttl <= MAX_PROFILE_TTL:
+        raise HTTPException(status_code=400, detail=f"ttl must be between 1 and {MAX_PROFILE_TTL} seconds")
+    
+    try:
+        config = ProfilingSwitch().enable(target, mode=request.mode, ttl=request.ttl, memory=request.memory)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to enable profiling: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {"target": target, **config}
+
+@router.delete("/profiling/{target}")
+def disable_profiling(target: str):
+    """프로파일링 끄기"""
+    if target not in PROFILE_TARGETS:
+        raise HTTPException(status_code=404, detail=f"Unknown profiling target (one of {', '.join(PROFILE_TARGETS)})")
+    
+    try:
+        return {"target": target, "disabled": ProfilingSwitch().disable(target)}
+    
+    except Exception as e:
+        logger.error(f"Failed to disable profiling: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
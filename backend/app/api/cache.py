@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException
+
+from app.core.logger import logger
+from app.services.query_cache import QueryCache
+
+router = APIRouter(prefix="/api/cache", tags=["cache"])
+
+
+# ==================== Endpoints ====================
+
+@router.get("/stats")
+async def get_cache_stats():
+    """쿼리 캐시 hit / miss / eviction 카운터"""
+    try:
+        return QueryCache().get_stats()
+    
+    except Exception as e:
+        logger.error(f"Failed to read cache stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,9 +1,28 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import urlparse
+import json
+import threading
+import uuid
 
-from celery_app import crawl_single_url, crawl_full_site, incremental_update, celery_app
+from celery_app import crawl_single_url, crawl_full_site, crawl_url_batch, incremental_update, celery_app
+from app.core.database import redis_client_async
 from app.core.logger import logger
+from app.services.crawl_service import CrawlService, MAX_BATCH_URLS
+from app.services.link_graph import LinkGraph
+from app.services.multi_crawler import MAX_SEED_HOSTS
+from app.services.progress import progress_channel, progress_last_key, TERMINAL_STATES
+from app.services.single_flight import single_flight_key, claim_async, release_async
+from app.services.url_utils import URLNormalizer
+
+# SSE keep-alive 간격 (초)
+SSE_KEEPALIVE_INTERVAL = 15.0
+
+# /graph 응답의 고아 페이지 목록 상한 (offset / limit으로 페이지 단위 조회)
+MAX_ORPHANS_PAGE = 1000
 
 router = APIRouter(prefix="/api/crawl", tags=["crawl"])
 
@@ -16,9 +35,14 @@ class CrawlURLRequest(BaseModel):
 
 class FullCrawlRequest(BaseModel):
     seed_url: HttpUrl = "https://www.dickinson.edu"
+    seed_urls: List[HttpUrl] = []  # 주면 seed_url 대신 사용 (시드 호스트별 병렬 크롤링)
     max_pages: int = 100
 
 
+class BatchCrawlRequest(BaseModel):
+    urls: List[str]  # 서버에서 정규화 / 중복 제거 (유효하지 않은 URL은 건너뜀)
+
+
 class IncrementalUpdateRequest(BaseModel):
     priority: str = "high"  # high, medium, low
 
@@ -27,14 +51,35 @@ class IncrementalUpdateRequest(BaseModel):
 
 @router.post("/single")
 async def crawl_single(request: CrawlURLRequest):
-    """단일 URL 크롤링 (백그라운드)"""
+    """
+    단일 URL 크롤링 (백그라운드)
+    
+    같은 정규화 URL의 작업이 진행 중이면 새 작업을 만들지 않고 그 작업 ID를 돌려준다.
+    """
+    url = str(request.url)
+    lock_key = single_flight_key("single", URLNormalizer.normalize(url) or url)
+    task_id = str(uuid.uuid4())
+    
     try:
-        task = crawl_single_url.delay(str(request.url))
+        existing = await claim_async(redis_client_async, lock_key, task_id)
+        if existing:
+            return {
+                "status": "in_progress",
+                "task_id": existing,
+                "url": url,
+                "message": "Same URL is already being crawled"
+            }
+        
+        try:
+            crawl_single_url.apply_async(args=[url], kwargs={"lock_key": lock_key}, task_id=task_id)
+        except Exception:
+            await release_async(redis_client_async, lock_key, task_id)
+            raise
         
         return {
             "status": "started",
-            "task_id": task.id,
-            "url": str(request.url),
+            "task_id": task_id,
+            "url": url,
             "message": "Crawling task started in background"
         }
     
@@ -44,17 +89,23 @@ async def crawl_single(request: CrawlURLRequest):
 
 @router.post("/full")
 async def start_full_crawl(request: FullCrawlRequest):
-    """전체 사이트 크롤링 시작"""
+    """전체 사이트 크롤링 시작 (여러 시드면 호스트별 병렬)"""
+    seeds = list(dict.fromkeys(str(url) for url in request.seed_urls or [request.seed_url]))
+    hosts = {urlparse(url).netloc.lower() for url in seeds}
+    if len(hosts) > MAX_SEED_HOSTS:
+        raise HTTPException(status_code=400, detail=f"Too many seed hosts: {len(hosts)} (max {MAX_SEED_HOSTS})")
+    
     try:
         task = crawl_full_site.delay(
-            seed_url=str(request.seed_url),
+            seed_urls=seeds,
             max_pages=request.max_pages
         )
         
         return {
             "status": "started",
             "task_id": task.id,
-            "seed_url": str(request.seed_url),
+            "seed_urls": seeds,
+            "hosts": sorted(hosts),
             "max_pages": request.max_pages,
             "message": "Full site crawl started. This may take 2-3 hours."
         }
@@ -64,6 +115,38 @@ async def start_full_crawl(request: FullCrawlRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/batch")
+async def start_batch_crawl(request: BatchCrawlRequest):
+    """
+    URL 목록 새로고침 (백그라운드, 작업 하나)
+    
+    호스트별로 묶어 병렬 처리하고, 진행률은 /task/{task_id}/events 하나로 본다.
+    """
+    groups, invalid = CrawlService.group_batch_urls(request.urls)
+    urls = [url for host_urls in groups.values() for url in host_urls]
+    if not urls:
+        raise HTTPException(status_code=400, detail="No valid URLs")
+    if len(urls) > MAX_BATCH_URLS:
+        raise HTTPException(status_code=400, detail=f"Too many URLs: {len(urls)} (max {MAX_BATCH_URLS})")
+    
+    try:
+        task = crawl_url_batch.delay(urls)
+        
+        return {
+            "status": "started",
+            "task_id": task.id,
+            "total": len(urls),
+            "duplicates": len(request.urls) - len(urls) - invalid,
+            "invalid": invalid,
+            "hosts": {host: len(host_urls) for host, host_urls in groups.items()},
+            "message": "Batch crawl started"
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed to start batch crawl: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/update")
 async def start_incremental_update(request: IncrementalUpdateRequest):
     """증분 업데이트 시작"""
@@ -82,31 +165,130 @@ async def start_incremental_update(request: IncrementalUpdateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _read_task_status(task_id: str) -> dict:
+    """Celery result backend 조회 (동기 - 스레드풀에서 실행)"""
+    task = celery_app.AsyncResult(task_id)
+    
+    response = {
+        "task_id": task_id,
+        "status": task.state,
+        "result": None
+    }
+    
+    if task.state == 'PENDING':
+        response["message"] = "Task is waiting to start"
+    
+    elif task.state == 'PROGRESS':
+        response["progress"] = task.info
+    
+    elif task.state == 'SUCCESS':
+        response["result"] = task.result
+    
+    elif task.state == 'FAILURE':
+        response["error"] = str(task.info)
+    
+    return response
+
+
 @router.get("/task/{task_id}")
 async def get_task_status(task_id: str):
     """Celery Task 상태 확인"""
     try:
-        task = celery_app.AsyncResult(task_id)
-        
-        response = {
-            "task_id": task_id,
-            "status": task.state,
-            "result": None
-        }
-        
-        if task.state == 'PENDING':
-            response["message"] = "Task is waiting to start"
-        
-        elif task.state == 'PROGRESS':
-            response["progress"] = task.info
-        
-        elif task.state == 'SUCCESS':
-            response["result"] = task.result
+        # AsyncResult 조회가 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        return await run_in_threadpool(_read_task_status, task_id)
+    
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Task not found: {e}")
+
+
+@router.get("/task/{task_id}/events")
+async def stream_task_events(task_id: str, request: Request):
+    """
+    Task 진행률 스트림 (Server-Sent Events)
+    
+    워커가 Redis pub/sub으로 발행한 진행률 이벤트를 그대로 전달한다.
+    종료 상태(SUCCESS/FAILURE/REVOKED) 이벤트 후 스트림을 닫는다.
+    """
+    async def event_stream():
+        pubsub = redis_client_async.pubsub()
+        # 마지막 이벤트 조회 전에 구독해야 사이에 발행된 이벤트를 놓치지 않음
+        await pubsub.subscribe(progress_channel(task_id))
         
-        elif task.state == 'FAILURE':
-            response["error"] = str(task.info)
+        try:
+            last = await redis_client_async.get(progress_last_key(task_id))
+            if last:
+                yield f"data: {last}\n\n"
+                if json.loads(last).get("state") in TERMINAL_STATES:
+                    return
+            
+            while not await request.is_disconnected():
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=SSE_KEEPALIVE_INTERVAL
+                )
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                data = message["data"]
+                yield f"data: {data}\n\n"
+                if json.loads(data).get("state") in TERMINAL_STATES:
+                    break
         
-        return response
+        finally:
+            await pubsub.unsubscribe(progress_channel(task_id))
+            await pubsub.aclose()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# 저장된 그래프 버전(saved_at)별 분석 결과 (그래프가 다시 저장될 때까지 PageRank 재계산 없음)
+_graph_cache: dict = {}
+_graph_cache_lock = threading.Lock()
+
+
+def _analyze_link_graph() -> dict:
+    """현재 저장된 그래프의 통계 / PageRank / 고아 페이지 (버전이 같으면 캐시)"""
+    version = LinkGraph.saved_version()
+    with _graph_cache_lock:
+        if _graph_cache.get("version") != version or "graph" not in _graph_cache:
+            graph = LinkGraph.load()
+            _graph_cache.update(
+                version=graph.version,
+                graph=graph,
+                rank=graph.pagerank(),
+                stats=graph.get_statistics(),
+                orphans=graph.orphans()
+            )
+        return dict(_graph_cache)
+
+
+def _read_link_graph(top_k: int, orphans_offset: int, orphans_limit: int) -> dict:
+    """링크 그래프 분석 (동기 - 스레드풀에서 실행)"""
+    analysis = _analyze_link_graph()
+    graph, orphans = analysis["graph"], analysis["orphans"]
+    return {
+        **analysis["stats"],
+        "version": analysis["version"],
+        "top_pages": [{"url": url, "pagerank": score} for url, score in graph.top_pages(top_k, rank=analysis["rank"])],
+        "orphans": orphans[orphans_offset:orphans_offset + orphans_limit],
+        "orphans_total": len(orphans),
+        "orphans_offset": orphans_offset
+    }
+
+
+@router.get("/graph")
+async def get_link_graph(top_k: int = 20, orphans_offset: int = 0, orphans_limit: int = 100):
+    """링크 그래프 통계 (PageRank 상위 페이지, 고아 페이지는 offset / limit 단위)"""
+    orphans_offset = max(orphans_offset, 0)
+    orphans_limit = max(0, min(orphans_limit, MAX_ORPHANS_PAGE))
+    try:
+        return await run_in_threadpool(_read_link_graph, top_k, orphans_offset, orphans_limit)
     
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Task not found: {e}")
\ No newline at end of file
+        logger.error(f"Failed to read link graph: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
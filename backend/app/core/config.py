@@ -24,6 +24,12 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
     
+    # 로컬 데이터 (벡터 인덱스 등 디스크 파일)
+    DATA_DIR: str = "data"
+    
+    # X-Profile 헤더 / 관리자 API X-Admin-Token 헤더로 요구하는 비밀값 (비어 있으면 둘 다 비활성)
+    PROFILE_SECRET: str = ""
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
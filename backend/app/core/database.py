@@ -1,6 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 import weaviate
 from weaviate.classes.init import Auth
 from app.core.config import settings
@@ -19,6 +20,12 @@ mongodb_db_sync = mongodb_client_sync[settings.MONGODB_DB_NAME]
 # Redis
 redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+# Redis (바이너리 값용 - 임베딩 캐시 등)
+redis_client_binary = Redis.from_url(settings.REDIS_URL)
+
+# FastAPI용 Redis (비동기 - pub/sub 구독 등)
+redis_client_async = AsyncRedis.from_url(settings.REDIS_URL, decode_responses=True)
+
 # Weaviate
 # 환경 변수 설정
 WEAVIATE_GRPC_PORT = settings.WEAVIATE_GRPC_PORT
@@ -85,6 +92,15 @@ def close_connections():
         mongodb_client_async.close()
         mongodb_client_sync.close()
         redis_client.close()
+        redis_client_binary.close()
         weaviate_client.close()
+    except:
+        pass
+
+
+async def close_async_connections():
+    """비동기 연결 종료"""
+    try:
+        await redis_client_async.aclose()
     except:
         pass
\ No newline at end of file
@@ -1,31 +1,183 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# 환경 변수 (settings는 필수 값이 없으면 로드에 실패하므로 로거는 직접 읽음)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text" if os.getenv("ENVIRONMENT", "development") == "development" else "json")
+
+# 비동기 출력 큐 (가득 차면 INFO 이하는 버림, WARNING 이상은 잠시 기다림)
+LOG_QUEUE_SIZE = 10000
+LOG_BLOCK_TIMEOUT = 1.0
+
+# 호출 위치별 샘플링 (INFO 이하): 창마다 처음 BURST개는 모두, 이후는 EVERY개 중 1개
+LOG_SAMPLE_WINDOW = float(os.getenv("LOG_SAMPLE_WINDOW", "10"))
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "20"))
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+# 레코드 기본 속성 (나머지는 extra로 받은 필드로 JSON에 포함)
+_RESERVED = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime", "always"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (extra 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "where": f"{record.module}:{record.lineno}",
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    호출 위치별 INFO 로그 샘플링
+
+    페이지마다 찍히는 로그는 같은 위치에서 반복되므로, 창(LOG_SAMPLE_WINDOW초)마다
+    처음 LOG_SAMPLE_BURST개 이후로는 LOG_SAMPLE_EVERY개 중 1개만 내보낸다.
+    WARNING 이상과 extra={'always': True} 레코드는 항상 통과하고,
+    창이 바뀔 때 버린 수를 요약 로그로 남긴다.
+    """
+
+    def __init__(self, window: float = LOG_SAMPLE_WINDOW, burst: int = LOG_SAMPLE_BURST, every: int = LOG_SAMPLE_EVERY):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.every = max(every, 1)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._dropped: Dict[Tuple[str, int], int] = {}
+        self.summary_logger: Optional[logging.Logger] = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or getattr(record, "always", False) or self.burst <= 0:
+            return True
+
+        site = (record.module, record.lineno)
+        summary = None
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                summary = self._dropped
+                self._counts, self._dropped = {}, {}
+                self._window_start = now
+
+            count = self._counts.get(site, 0) + 1
+            self._counts[site] = count
+            keep = count <= self.burst or (count - self.burst) % self.every == 0
+            if not keep:
+                self._dropped[site] = self._dropped.get(site, 0) + 1
+
+        if summary and self.summary_logger is not None:
+            self.summary_logger.info(
+                f"Log sampling: dropped {sum(summary.values())} lines in the last window",
+                extra={"always": True, "dropped": {f"{m}:{n}": c for (m, n), c in summary.items()}}
+            )
+        if keep and count > self.burst:
+            record.sampled = self.every
+        return keep
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 INFO 이하는 버리고 (호출 스레드를 막지 않음) 버린 수만 센다"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                try:
+                    self.queue.put(record, timeout=LOG_BLOCK_TIMEOUT)
+                    return
+                except queue.Full:
+                    pass
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_listener(handler: NonBlockingQueueHandler, output: logging.Handler):
+    """출력 스레드 시작 (fork된 자식 프로세스에서는 새 큐로 다시 시작)"""
+    global _listener
+    handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """남은 로그를 모두 출력하고 출력 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logger(name: str = "rush") -> logging.Logger:
-    """로거 설정"""
-    
+    """
+    로거 설정
+
+    호출 스레드는 큐에 넣기만 하고 출력은 별도 스레드가 한다 (LOG_FORMAT=json이면 한 줄 JSON).
+    """
+
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
+    logger.setLevel(LOG_LEVEL)
+
     # 이미 핸들러가 있으면 추가하지 않음
     if logger.handlers:
         return logger
-    
-    # 콘솔 핸들러
+
+    # 콘솔 핸들러 (출력 스레드에서만 사용)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    
+    console_handler.setLevel(LOG_LEVEL)
+
     # 포맷터
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
     console_handler.setFormatter(formatter)
-    
-    logger.addHandler(console_handler)
-    
+
+    # 큐 핸들러 + 샘플링
+    queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    sampling = SamplingFilter()
+    sampling.summary_logger = logger
+    queue_handler.addFilter(sampling)
+
+    _start_listener(queue_handler, console_handler)
+    # Celery prefork 워커는 fork 후 출력 스레드가 없으므로 자식에서 다시 시작
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: _start_listener(queue_handler, console_handler))
+    atexit.register(stop_logging)
+
+    logger.addHandler(queue_handler)
+
     return logger
 
 # 전역 로거
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
@@ -1,10 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import hmac
 
 from app.core.config import settings
-from app.core.database import check_connections, close_connections
+from app.core.database import check_connections, close_connections, close_async_connections
 from app.api.crawl import router as crawl_router
+from app.api.cache import router as cache_router
+from app.api.admin import router as admin_router
+from app.services.profiling import ProfilingSwitch, start_profile, finish_profile
 
 
 @asynccontextmanager
@@ -14,6 +19,7 @@ async def lifespan(app: FastAPI):
     yield
     # 종료 시
     print("🛑 RUSH API Shutting down...")
+    await close_async_connections()
     close_connections()
 
 
@@ -35,6 +41,31 @@ app.add_middleware(
 
 # 라우터 등록
 app.include_router(crawl_router)
+app.include_router(cache_router)
+app.include_router(admin_router)
+
+
+# 요청별 프로파일링 (관리자가 api 대상을 켰고 요청의 X-Profile 헤더가 PROFILE_SECRET과 같을 때만)
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    token = request.headers.get("x-profile")
+    if not token or not settings.PROFILE_SECRET or not hmac.compare_digest(token, settings.PROFILE_SECRET):
+        return await call_next(request)
+    
+    config = await run_in_threadpool(ProfilingSwitch().get, "api")
+    
+    # 이벤트 루프 스레드 전체를 잡으므로 동시에 처리된 다른 요청도 함께 기록됨
+    run = start_profile("api", config)
+    if run is None:
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        # 측정만 루프에서 멈추고, 파일 저장 / 메모리 스냅샷은 스레드풀에서
+        run.pause()
+        await run_in_threadpool(finish_profile, run)
+    response.headers["X-Profile-Id"] = run.result["run_id"]
+    return response
 
 
 @app.get("/")
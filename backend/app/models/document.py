@@ -1,7 +1,19 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+import re
+
+
+# 코퍼스 통계 문서 (corpus_stats 컬렉션, create / update_content / delete_by_url이 $inc로 갱신)
+STATS_DOC_ID = "corpus"
+# 통계 갱신에 필요한 필드만 읽음
+STATS_PROJECTION = {"category": 1, "priority": 1, "word_count": 1}
+
+# 연속으로 이만큼 크롤링에 실패하면 inactive (이후 sweep 대상)
+MAX_ERROR_COUNT = 3
 
 
 class PyObjectId(str):
@@ -29,6 +41,9 @@ class Section(BaseModel):
     """섹션 구조"""
     level: str
     title: str
+    start: int = -1                      # 본문 내 시작 오프셋 (-1: 본문에서 찾지 못함)
+    end: int = -1
+    content_hash: Optional[str] = None   # 섹션 텍스트 해시 (None: 섹션 해시 도입 이전 문서)
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -42,12 +57,17 @@ class Document(BaseModel):
     category: str = Field(..., description="Page category")
     content: str = Field(..., description="Body text")
     content_hash: str = Field(..., description="Content hash (SHA256)")
+    raw_hash: Optional[str] = Field(default=None, description="Raw HTML body hash (SHA256)")
     sections: List[Section] = Field(default_factory=list, description="Section structure")
     word_count: int = Field(default=0, description="Number of words")
     priority: str = Field(default="medium", description="Update Priority (high/medium/low)")
     crawled_at: datetime = Field(default_factory=datetime.now)
     last_updated: Optional[datetime] = None
     status: str = "active"  # active, inactive, error
+    last_seen: Optional[datetime] = None       # 마지막으로 크롤링에서 확인된 시각
+    error_count: int = 0                       # 연속 크롤링 실패 횟수
+    last_error: Optional[str] = None
+    inactive_since: Optional[datetime] = None  # inactive가 된 시각 (sweep 유예 기준)
     
     model_config = ConfigDict(
         populate_by_name=True,
@@ -57,18 +77,161 @@ class Document(BaseModel):
     )
 
 
+def _stats_increment(category: str, priority: str, count: int, words: int) -> Dict:
+    """통계 문서 $inc 갱신 (없으면 upsert로 생성)"""
+    return {
+        "$inc": {
+            "total_documents": count,
+            "total_words": words,
+            f"categories.{category}.count": count,
+            f"categories.{category}.total_words": words,
+            f"priorities.{priority}": count
+        },
+        "$set": {"updated_at": datetime.now()}
+    }
+
+
+def _unique_by_url(documents: List["Document"]) -> List["Document"]:
+    """create_many 입력에서 같은 URL은 첫 문서만 (배치 안 중복 제거)"""
+    unique: Dict[str, Document] = {}
+    for document in documents:
+        unique.setdefault(document.normalized_url, document)
+    return list(unique.values())
+
+
+def _bulk_outcome(result=None, error: Optional[BulkWriteError] = None) -> Tuple[List[int], List[int]]:
+    """bulk_write 결과 (또는 부분 실패 오류) → (새로 만든 연산 인덱스, 실패한 연산 인덱스)"""
+    if error is not None:
+        return (
+            [item['index'] for item in error.details.get('upserted', [])],
+            [item['index'] for item in error.details.get('writeErrors', [])]
+        )
+    return list(result.upserted_ids), []
+
+
+def _stats_increment_many(rows: List[Tuple[str, str, int]], count: int = 1) -> Dict:
+    """
+    여러 문서 추가 / 삭제를 한 번의 $inc로 합침
+
+    Args:
+        rows: (category, priority, word_count)
+        count: 1이면 추가, -1이면 삭제
+    """
+    update = {"$inc": {}, "$set": {"updated_at": datetime.now()}}
+    for category, priority, words in rows:
+        for key, value in _stats_increment(category, priority, count, count * words)["$inc"].items():
+            update["$inc"][key] = update["$inc"].get(key, 0) + value
+    return update
+
+
+# 전체 재집계 (reconcile_statistics)
+STATS_PIPELINE = [
+    {
+        "$facet": {
+            "categories": [
+                {"$group": {"_id": "$category", "count": {"$sum": 1}, "total_words": {"$sum": "$word_count"}}}
+            ],
+            "priorities": [
+                {"$group": {"_id": "$priority", "count": {"$sum": 1}}}
+            ]
+        }
+    }
+]
+
+
+def _stats_from_facet(facet: Dict) -> Dict:
+    categories = {
+        doc["_id"]: {"count": doc["count"], "total_words": doc["total_words"]}
+        for doc in facet["categories"]
+    }
+    return {
+        "total_documents": sum(c["count"] for c in categories.values()),
+        "total_words": sum(c["total_words"] for c in categories.values()),
+        "categories": categories,
+        "priorities": {doc["_id"]: doc["count"] for doc in facet["priorities"]}
+    }
+
+
+def _stats_from_doc(doc: Dict) -> Dict:
+    """저장된 통계 문서 → get_statistics 결과 (0이 된 카테고리 / 우선순위는 제외)"""
+    return {
+        "categories": {
+            name: value for name, value in (doc.get("categories") or {}).items() if value.get("count")
+        },
+        "priorities": {name: count for name, count in (doc.get("priorities") or {}).items() if count},
+        "total_documents": doc.get("total_documents", 0),
+        "total_words": doc.get("total_words", 0),
+        "updated_at": doc.get("updated_at"),
+        "reconciled_at": doc.get("reconciled_at")
+    }
+
+
+def _stats_drift(stored: Optional[Dict], actual: Dict) -> Dict:
+    """저장된 카운터와 실제 집계의 차이 (실제 - 저장)"""
+    stored = stored or {}
+    return {
+        "total_documents": actual["total_documents"] - stored.get("total_documents", 0),
+        "total_words": actual["total_words"] - stored.get("total_words", 0)
+    }
+
+
 class DocumentRepositoryAsync:
     """MongoDB Document 저장소"""
     
     def __init__(self, db):
         self.collection = db.documents
+        self.stats = db.corpus_stats
     
     async def create(self, document: Document) -> str:
-        """문서 생성"""
+        """문서 생성 (통계 카운터 증가)"""
         doc_dict = document.model_dump(by_alias=True, exclude={"id"})
         result = await self.collection.insert_one(doc_dict)
+        await self._inc_stats(document.category, document.priority, 1, document.word_count)
         return str(result.inserted_id)
     
+    async def create_many(self, documents: List[Document]) -> Dict[str, List[str]]:
+        """
+        문서 일괄 생성 (bulk upsert 한 번 + 통계 $inc 한 번)
+        
+        normalized_url 기준 $setOnInsert upsert라 이미 있는 URL(다른 경로가 먼저 저장)은 건드리지 않는다.
+        개수와 통계는 쓰기 결과 기준 (부분 실패여도 만든 문서는 반영)
+        
+        Returns:
+            {'created': 새로 만든 URL, 'failed': 쓰기 실패한 URL} - 둘 다 아니면 이미 있던 URL
+        """
+        documents = _unique_by_url(documents)
+        if not documents:
+            return {'created': [], 'failed': []}
+        
+        ops = [
+            UpdateOne(
+                {"normalized_url": document.normalized_url},
+                {"$setOnInsert": document.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+            for document in documents
+        ]
+        try:
+            created, failed = _bulk_outcome(await self.collection.bulk_write(ops, ordered=False))
+        except BulkWriteError as e:
+            created, failed = _bulk_outcome(error=e)
+        
+        if created:
+            await self.stats.update_one({"_id": STATS_DOC_ID}, _stats_increment_many(
+                [(documents[i].category, documents[i].priority, documents[i].word_count) for i in created]
+            ), upsert=True)
+        return {
+            'created': [documents[i].normalized_url for i in created],
+            'failed': [documents[i].normalized_url for i in failed]
+        }
+    
+    async def _inc_stats(self, category: str, priority: str, count: int, words: int):
+        await self.stats.update_one(
+            {"_id": STATS_DOC_ID},
+            _stats_increment(category, priority, count, words),
+            upsert=True
+        )
+    
     async def find_by_url(self, url: str) -> Optional[Document]:
         """URL로 문서 찾기"""
         doc = await self.collection.find_one({"normalized_url": url})
@@ -76,27 +239,153 @@ class DocumentRepositoryAsync:
             return Document(**doc)
         return None
     
+    async def find_by_urls(self, urls: List[str]) -> Dict[str, Document]:
+        """URL 목록의 문서를 한 번에 조회 (normalized_url → Document, 없는 URL은 빠짐)"""
+        cursor = self.collection.find({"normalized_url": {"$in": urls}})
+        return {document.normalized_url: document for document in [Document(**doc) async for doc in cursor]}
+    
     async def update_content(
         self, 
         url: str, 
         content: str, 
         content_hash: str,
-        sections: List[Dict]
+        sections: List[Dict],
+        raw_hash: Optional[str] = None,
+        word_count: Optional[int] = None
     ) -> bool:
-        """콘텐츠 업데이트"""
+        """콘텐츠 업데이트 (word_count를 주면 통계의 단어 수도 차이만큼 갱신)"""
+        update = {
+            "content": content,
+            "content_hash": content_hash,
+            "sections": sections,
+            "raw_hash": raw_hash,
+            "last_updated": datetime.now()
+        }
+        if word_count is not None:
+            update["word_count"] = word_count
+        
+        previous = await self.collection.find_one_and_update(
+            {"normalized_url": url},
+            {"$set": update},
+            projection=STATS_PROJECTION,
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
+            return False
+        
+        if word_count is not None and word_count != previous.get("word_count", 0):
+            await self._inc_stats(previous["category"], previous["priority"], 0, word_count - previous.get("word_count", 0))
+        return True
+    
+    async def set_raw_hash(self, url: str, raw_hash: Optional[str]) -> bool:
+        """원본 HTML 해시만 갱신 (본문은 그대로, 마크업만 바뀐 경우)"""
         result = await self.collection.update_one(
             {"normalized_url": url},
+            {"$set": {"raw_hash": raw_hash}}
+        )
+        return result.modified_count > 0
+    
+    async def find_by_raw_hash(self, urls: List[str], raw_hash: str) -> Optional[Document]:
+        """URL 후보 중 원본 HTML 해시가 같은 문서"""
+        doc = await self.collection.find_one({"normalized_url": {"$in": urls}, "raw_hash": raw_hash})
+        if doc:
+            return Document(**doc)
+        return None
+    
+    # ==================== Mark & Sweep ====================
+    
+    async def mark_seen(self, urls: List[str], seen_at: Optional[datetime] = None) -> int:
+        """
+        크롤링에서 확인된 문서 표시 (last_seen 갱신, 실패 횟수 초기화, inactive였으면 다시 active)
+        
+        Returns:
+            갱신된 문서 수
+        """
+        if not urls:
+            return 0
+        result = await self.collection.update_many(
+            {"normalized_url": {"$in": urls}},
             {
-                "$set": {
-                    "content": content,
-                    "content_hash": content_hash,
-                    "sections": sections,
-                    "last_updated": datetime.now()
-                }
+                "$set": {"last_seen": seen_at or datetime.now(), "error_count": 0, "status": "active"},
+                "$unset": {"last_error": "", "inactive_since": ""}
             }
         )
+        return result.modified_count
+    
+    async def record_failure(self, url: str, error: str, max_errors: int = MAX_ERROR_COUNT) -> bool:
+        """
+        크롤링 실패 기록 (연속 max_errors번이면 inactive)
+        
+        Returns:
+            이번 실패로 inactive가 됐으면 True
+        """
+        doc = await self.collection.find_one_and_update(
+            {"normalized_url": url},
+            {"$inc": {"error_count": 1}, "$set": {"last_error": error}},
+            projection={"error_count": 1, "status": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc is None or doc["error_count"] < max_errors or doc.get("status") != "active":
+            return False
+        
+        result = await self.collection.update_one(
+            {"normalized_url": url, "status": "active"},
+            {"$set": {"status": "inactive", "inactive_since": datetime.now()}}
+        )
         return result.modified_count > 0
     
+    async def mark_unseen(self, before: datetime, hosts: List[str], exclude: Optional[List[str]] = None) -> int:
+        """
+        전체 크롤링에서 확인되지 않은 active 문서를 inactive로 (크롤링한 호스트의 문서만)
+        
+        Args:
+            before: 크롤링 시작 시각 (last_seen이 이전이거나 없으면 대상)
+            hosts: 크롤링한 호스트 (다른 호스트 문서는 건드리지 않음)
+            exclude: 이번 크롤링에서 요청했지만 저장하지 못한 URL (실패는 record_failure가 처리)
+            
+        Returns:
+            inactive가 된 문서 수
+        """
+        if not hosts:
+            return 0
+        host_pattern = "^https://(" + "|".join(re.escape(host) for host in hosts) + ")/"
+        result = await self.collection.update_many(
+            {
+                "status": "active",
+                "normalized_url": {"$regex": host_pattern, "$nin": exclude or []},
+                "$or": [{"last_seen": {"$lt": before}}, {"last_seen": None}]
+            },
+            {"$set": {"status": "inactive", "inactive_since": datetime.now(), "last_error": "not_seen_in_full_crawl"}}
+        )
+        return result.modified_count
+    
+    async def find_sweepable(self, inactive_before: datetime, limit: int = 0) -> List[str]:
+        """inactive_before 이전부터 inactive인 문서 URL"""
+        cursor = self.collection.find(
+            {"status": "inactive", "inactive_since": {"$lt": inactive_before}},
+            {"normalized_url": 1, "_id": 0}
+        ).limit(limit)
+        return [doc["normalized_url"] async for doc in cursor]
+    
+    async def delete_many_by_urls(self, urls: List[str]) -> int:
+        """
+        문서 일괄 삭제 (delete_many 한 번 + 통계 $inc 한 번)
+        
+        Returns:
+            삭제된 문서 수
+        """
+        if not urls:
+            return 0
+        docs = [doc async for doc in self.collection.find({"normalized_url": {"$in": urls}}, projection=STATS_PROJECTION)]
+        result = await self.collection.delete_many({"normalized_url": {"$in": urls}})
+        if docs:
+            await self.stats.update_one(
+                {"_id": STATS_DOC_ID},
+                _stats_increment_many([(doc["category"], doc["priority"], doc.get("word_count", 0)) for doc in docs], count=-1),
+                upsert=True
+            )
+        return result.deleted_count
+    
     async def get_all_urls(self) -> List[str]:
         """모든 문서의 URL 가져오기"""
         cursor = await self.collection.find({}, {"normalized_url": 1})
@@ -113,49 +402,106 @@ class DocumentRepositoryAsync:
         )
         return [doc['url'] async for doc in documents]
     
-    async def count(self) -> int:
-        """총 문서 수"""
-        return await self.collection.count_documents({})
+    async def count(self, status: Optional[str] = None) -> int:
+        """총 문서 수 (status를 주면 그 상태의 문서만)"""
+        return await self.collection.count_documents({"status": status} if status else {})
     
     async def get_statistics(self) -> Dict:
-        """통계 정보"""
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$category",
-                    "count": {"$sum": 1},
-                    "total_words": {"$sum": "$word_count"}
-                }
-            }
-        ]
+        """
+        통계 정보 (통계 문서 한 건 조회)
         
-        stats = {"categories": {}}
-        async for doc in self.collection.aggregate(pipeline):
-            stats["categories"][doc["_id"]] = {
-                "count": doc["count"],
-                "total_words": doc["total_words"]
-            }
+        한 번도 재집계하지 않은 통계 문서는 (카운터 도입 전 문서가 빠진 upsert 결과일 수 있으므로)
+        처음 읽을 때 전체 재집계한다.
+        """
+        doc = await self.stats.find_one({"_id": STATS_DOC_ID})
+        if doc is None or doc.get("reconciled_at") is None:
+            return await self.reconcile_statistics()
+        return _stats_from_doc(doc)
+    
+    async def reconcile_statistics(self) -> Dict:
+        """
+        전체 집계로 통계 문서 재작성 (카운터 드리프트 보정)
         
-        stats["total_documents"] = await self.count()
-        return stats
+        집계 중에 들어온 쓰기는 반영되지 않을 수 있으므로 한가한 시간에 주기적으로 실행한다.
+        
+        Returns:
+            보정된 통계 + drift (실제 - 저장된 값)
+        """
+        stored = await self.stats.find_one({"_id": STATS_DOC_ID})
+        facet = (await self.collection.aggregate(STATS_PIPELINE).to_list(1) or [{"categories": [], "priorities": []}])[0]
+        actual = _stats_from_facet(facet)
+        
+        now = datetime.now()
+        doc = {**actual, "updated_at": now, "reconciled_at": now}
+        await self.stats.replace_one({"_id": STATS_DOC_ID}, doc, upsert=True)
+        return {**_stats_from_doc(doc), "drift": _stats_drift(stored, actual)}
     
     async def delete_by_url(self, url: str) -> bool:
-        """URL로 문서 삭제"""
-        result = await self.collection.delete_one({"normalized_url": url})
-        return result.deleted_count > 0
+        """URL로 문서 삭제 (통계 카운터 감소)"""
+        deleted = await self.collection.find_one_and_delete({"normalized_url": url}, projection=STATS_PROJECTION)
+        if deleted is None:
+            return False
+        
+        await self._inc_stats(deleted["category"], deleted["priority"], -1, -deleted.get("word_count", 0))
+        return True
 
 class DocumentRepository:
     """MongoDB Document 저장소"""
     
     def __init__(self, db):
         self.collection = db.documents
+        self.stats = db.corpus_stats
     
     def create(self, document: Document) -> str:
-        """문서 생성"""
+        """문서 생성 (통계 카운터 증가)"""
         doc_dict = document.model_dump(by_alias=True, exclude={"id"})
         result = self.collection.insert_one(doc_dict)
+        self._inc_stats(document.category, document.priority, 1, document.word_count)
         return str(result.inserted_id)
     
+    def create_many(self, documents: List[Document]) -> Dict[str, List[str]]:
+        """
+        문서 일괄 생성 (bulk upsert 한 번 + 통계 $inc 한 번)
+        
+        normalized_url 기준 $setOnInsert upsert라 이미 있는 URL(다른 경로가 먼저 저장)은 건드리지 않는다.
+        개수와 통계는 쓰기 결과 기준 (부분 실패여도 만든 문서는 반영)
+        
+        Returns:
+            {'created': 새로 만든 URL, 'failed': 쓰기 실패한 URL} - 둘 다 아니면 이미 있던 URL
+        """
+        documents = _unique_by_url(documents)
+        if not documents:
+            return {'created': [], 'failed': []}
+        
+        ops = [
+            UpdateOne(
+                {"normalized_url": document.normalized_url},
+                {"$setOnInsert": document.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+            for document in documents
+        ]
+        try:
+            created, failed = _bulk_outcome(self.collection.bulk_write(ops, ordered=False))
+        except BulkWriteError as e:
+            created, failed = _bulk_outcome(error=e)
+        
+        if created:
+            self.stats.update_one({"_id": STATS_DOC_ID}, _stats_increment_many(
+                [(documents[i].category, documents[i].priority, documents[i].word_count) for i in created]
+            ), upsert=True)
+        return {
+            'created': [documents[i].normalized_url for i in created],
+            'failed': [documents[i].normalized_url for i in failed]
+        }
+    
+    def _inc_stats(self, category: str, priority: str, count: int, words: int):
+        self.stats.update_one(
+            {"_id": STATS_DOC_ID},
+            _stats_increment(category, priority, count, words),
+            upsert=True
+        )
+    
     def find_by_url(self, url: str) -> Optional[Document]:
         """URL로 문서 찾기"""
         doc = self.collection.find_one({"normalized_url": url})
@@ -163,27 +509,153 @@ class DocumentRepository:
             return Document(**doc)
         return None
     
+    def find_by_urls(self, urls: List[str]) -> Dict[str, Document]:
+        """URL 목록의 문서를 한 번에 조회 (normalized_url → Document, 없는 URL은 빠짐)"""
+        cursor = self.collection.find({"normalized_url": {"$in": urls}})
+        return {document.normalized_url: document for document in [Document(**doc) for doc in cursor]}
+    
     def update_content(
         self, 
         url: str, 
         content: str, 
         content_hash: str,
-        sections: List[Dict]
+        sections: List[Dict],
+        raw_hash: Optional[str] = None,
+        word_count: Optional[int] = None
     ) -> bool:
-        """콘텐츠 업데이트"""
+        """콘텐츠 업데이트 (word_count를 주면 통계의 단어 수도 차이만큼 갱신)"""
+        update = {
+            "content": content,
+            "content_hash": content_hash,
+            "sections": sections,
+            "raw_hash": raw_hash,
+            "last_updated": datetime.now()
+        }
+        if word_count is not None:
+            update["word_count"] = word_count
+        
+        previous = self.collection.find_one_and_update(
+            {"normalized_url": url},
+            {"$set": update},
+            projection=STATS_PROJECTION,
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
+            return False
+        
+        if word_count is not None and word_count != previous.get("word_count", 0):
+            self._inc_stats(previous["category"], previous["priority"], 0, word_count - previous.get("word_count", 0))
+        return True
+    
+    def set_raw_hash(self, url: str, raw_hash: Optional[str]) -> bool:
+        """원본 HTML 해시만 갱신 (본문은 그대로, 마크업만 바뀐 경우)"""
         result = self.collection.update_one(
             {"normalized_url": url},
+            {"$set": {"raw_hash": raw_hash}}
+        )
+        return result.modified_count > 0
+    
+    def find_by_raw_hash(self, urls: List[str], raw_hash: str) -> Optional[Document]:
+        """URL 후보 중 원본 HTML 해시가 같은 문서"""
+        doc = self.collection.find_one({"normalized_url": {"$in": urls}, "raw_hash": raw_hash})
+        if doc:
+            return Document(**doc)
+        return None
+    
+    # ==================== Mark & Sweep ====================
+    
+    def mark_seen(self, urls: List[str], seen_at: Optional[datetime] = None) -> int:
+        """
+        크롤링에서 확인된 문서 표시 (last_seen 갱신, 실패 횟수 초기화, inactive였으면 다시 active)
+        
+        Returns:
+            갱신된 문서 수
+        """
+        if not urls:
+            return 0
+        result = self.collection.update_many(
+            {"normalized_url": {"$in": urls}},
             {
-                "$set": {
-                    "content": content,
-                    "content_hash": content_hash,
-                    "sections": sections,
-                    "last_updated": datetime.now()
-                }
+                "$set": {"last_seen": seen_at or datetime.now(), "error_count": 0, "status": "active"},
+                "$unset": {"last_error": "", "inactive_since": ""}
             }
         )
+        return result.modified_count
+    
+    def record_failure(self, url: str, error: str, max_errors: int = MAX_ERROR_COUNT) -> bool:
+        """
+        크롤링 실패 기록 (연속 max_errors번이면 inactive)
+        
+        Returns:
+            이번 실패로 inactive가 됐으면 True
+        """
+        doc = self.collection.find_one_and_update(
+            {"normalized_url": url},
+            {"$inc": {"error_count": 1}, "$set": {"last_error": error}},
+            projection={"error_count": 1, "status": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc is None or doc["error_count"] < max_errors or doc.get("status") != "active":
+            return False
+        
+        result = self.collection.update_one(
+            {"normalized_url": url, "status": "active"},
+            {"$set": {"status": "inactive", "inactive_since": datetime.now()}}
+        )
         return result.modified_count > 0
     
+    def mark_unseen(self, before: datetime, hosts: List[str], exclude: Optional[List[str]] = None) -> int:
+        """
+        전체 크롤링에서 확인되지 않은 active 문서를 inactive로 (크롤링한 호스트의 문서만)
+        
+        Args:
+            before: 크롤링 시작 시각 (last_seen이 이전이거나 없으면 대상)
+            hosts: 크롤링한 호스트 (다른 호스트 문서는 건드리지 않음)
+            exclude: 이번 크롤링에서 요청했지만 저장하지 못한 URL (실패는 record_failure가 처리)
+            
+        Returns:
+            inactive가 된 문서 수
+        """
+        if not hosts:
+            return 0
+        host_pattern = "^https://(" + "|".join(re.escape(host) for host in hosts) + ")/"
+        result = self.collection.update_many(
+            {
+                "status": "active",
+                "normalized_url": {"$regex": host_pattern, "$nin": exclude or []},
+                "$or": [{"last_seen": {"$lt": before}}, {"last_seen": None}]
+            },
+            {"$set": {"status": "inactive", "inactive_since": datetime.now(), "last_error": "not_seen_in_full_crawl"}}
+        )
+        return result.modified_count
+    
+    def find_sweepable(self, inactive_before: datetime, limit: int = 0) -> List[str]:
+        """inactive_before 이전부터 inactive인 문서 URL"""
+        cursor = self.collection.find(
+            {"status": "inactive", "inactive_since": {"$lt": inactive_before}},
+            {"normalized_url": 1, "_id": 0}
+        ).limit(limit)
+        return [doc["normalized_url"] for doc in cursor]
+    
+    def delete_many_by_urls(self, urls: List[str]) -> int:
+        """
+        문서 일괄 삭제 (delete_many 한 번 + 통계 $inc 한 번)
+        
+        Returns:
+            삭제된 문서 수
+        """
+        if not urls:
+            return 0
+        docs = list(self.collection.find({"normalized_url": {"$in": urls}}, projection=STATS_PROJECTION))
+        result = self.collection.delete_many({"normalized_url": {"$in": urls}})
+        if docs:
+            self.stats.update_one(
+                {"_id": STATS_DOC_ID},
+                _stats_increment_many([(doc["category"], doc["priority"], doc.get("word_count", 0)) for doc in docs], count=-1),
+                upsert=True
+            )
+        return result.deleted_count
+    
     def get_all_urls(self) -> List[str]:
         """모든 문서의 URL 가져오기"""
         cursor = self.collection.find({}, {"normalized_url": 1})
@@ -200,33 +672,45 @@ class DocumentRepository:
         )
         return [doc['url'] for doc in documents]
     
-    def count(self) -> int:
-        """총 문서 수"""
-        return self.collection.count_documents({})
+    def count(self, status: Optional[str] = None) -> int:
+        """총 문서 수 (status를 주면 그 상태의 문서만)"""
+        return self.collection.count_documents({"status": status} if status else {})
     
     def get_statistics(self) -> Dict:
-        """통계 정보"""
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$category",
-                    "count": {"$sum": 1},
-                    "total_words": {"$sum": "$word_count"}
-                }
-            }
-        ]
+        """
+        통계 정보 (통계 문서 한 건 조회)
         
-        stats = {"categories": {}}
-        for doc in self.collection.aggregate(pipeline):
-            stats["categories"][doc["_id"]] = {
-                "count": doc["count"],
-                "total_words": doc["total_words"]
-            }
+        한 번도 재집계하지 않은 통계 문서는 (카운터 도입 전 문서가 빠진 upsert 결과일 수 있으므로)
+        처음 읽을 때 전체 재집계한다.
+        """
+        doc = self.stats.find_one({"_id": STATS_DOC_ID})
+        if doc is None or doc.get("reconciled_at") is None:
+            return self.reconcile_statistics()
+        return _stats_from_doc(doc)
+    
+    def reconcile_statistics(self) -> Dict:
+        """
+        전체 집계로 통계 문서 재작성 (카운터 드리프트 보정)
         
-        stats["total_documents"] = self.count()
-        return stats
+        집계 중에 들어온 쓰기는 반영되지 않을 수 있으므로 한가한 시간에 주기적으로 실행한다.
+        
+        Returns:
+            보정된 통계 + drift (실제 - 저장된 값)
+        """
+        stored = self.stats.find_one({"_id": STATS_DOC_ID})
+        facet = (list(self.collection.aggregate(STATS_PIPELINE)) or [{"categories": [], "priorities": []}])[0]
+        actual = _stats_from_facet(facet)
+        
+        now = datetime.now()
+        doc = {**actual, "updated_at": now, "reconciled_at": now}
+        self.stats.replace_one({"_id": STATS_DOC_ID}, doc, upsert=True)
+        return {**_stats_from_doc(doc), "drift": _stats_drift(stored, actual)}
     
     def delete_by_url(self, url: str) -> bool:
-        """URL로 문서 삭제"""
-        result = self.collection.delete_one({"normalized_url": url})
-        return result.deleted_count > 0
\ No newline at end of file
+        """URL로 문서 삭제 (통계 카운터 감소)"""
+        deleted = self.collection.find_one_and_delete({"normalized_url": url}, projection=STATS_PROJECTION)
+        if deleted is None:
+            return False
+        
+        self._inc_stats(deleted["category"], deleted["priority"], -1, -deleted.get("word_count", 0))
+        return True
\ No newline at end of file
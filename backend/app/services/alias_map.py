@@ -0,0 +1,138 @@
+from typing import Dict, Iterable, List
+import time
+
+from app.core.logger import logger
+
+
+# Redis 키: 별칭 URL → 최종 URL (301/308 redirect 도착지 / 같은 호스트 rel=canonical)
+ALIAS_MAP_KEY = "alias:map"
+# 별칭 → 마지막 기록 시각 (sorted set, 해시 필드에는 TTL이 없으므로 여기서 만료 관리)
+ALIAS_SEEN_KEY = "alias:seen"
+
+# 이 기간 동안 다시 확인되지 않은 별칭은 삭제 → 다음 크롤링에서 별칭 URL을 한 번 다시 가져와 재확인
+ALIAS_TTL = 60 * 60 * 24 * 30  # 30일
+
+# 별칭 체인을 따라갈 최대 횟수 (순환 방지)
+MAX_ALIAS_HOPS = 5
+
+
+class AliasMap:
+    """
+    URL 별칭 맵 (정규화된 URL 기준)
+
+    크롤링 중 발견한 영구 redirect와 canonical 태그를 Redis 해시에 저장하고,
+    큐에 넣기 전에 조회하여 같은 페이지를 별칭으로 다시 가져오지 않게 한다.
+    임시 redirect는 remember()로 이번 프로세스에서만 쓰고, 저장한 별칭도 ALIAS_TTL 후 prune()으로 만료된다.
+    """
+
+    def __init__(self, redis=None):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+        self._local: Dict[str, str] = {}
+
+    def _lookup(self, urls: List[str]) -> Dict[str, str]:
+        """로컬 → Redis 순으로 별칭 조회 (Redis는 HMGET 한 번)"""
+        found = {url: self._local[url] for url in urls if url in self._local}
+        missing = [url for url in urls if url not in found]
+        if not missing:
+            return found
+
+        try:
+            values = self.redis.hmget(ALIAS_MAP_KEY, missing)
+        except Exception as e:
+            logger.warning(f"Alias map lookup failed: {e}")
+            return found
+
+        for url, target in zip(missing, values):
+            if target:
+                self._local[url] = target
+                found[url] = target
+        return found
+
+    def resolve_many(self, urls: Iterable[str]) -> List[str]:
+        """URL 목록을 최종 URL로 변환 (입력 순서 유지, 별칭이 없으면 그대로)"""
+        resolved = list(urls)
+        pending = list(range(len(resolved)))
+
+        for _ in range(MAX_ALIAS_HOPS):
+            found = self._lookup(list({resolved[i] for i in pending}))
+            pending = [i for i in pending if resolved[i] in found and found[resolved[i]] != resolved[i]]
+            if not pending:
+                break
+            for i in pending:
+                resolved[i] = found[resolved[i]]
+
+        return resolved
+
+    def resolve(self, url: str) -> str:
+        return self.resolve_many([url])[0]
+
+    def remember(self, aliases: Iterable[str], target: str) -> List[str]:
+        """이번 프로세스에서만 쓰는 별칭 등록"""
+        added = [alias for alias in aliases if alias and alias != target]
+        for alias in added:
+            self._local[alias] = target
+        return added
+
+    def record(self, aliases: Iterable[str], target: str) -> int:
+        """
+        별칭 영구 저장
+
+        Returns:
+            저장한 별칭 수
+        """
+        added = self.remember(aliases, target)
+        if not added:
+            return 0
+
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(ALIAS_MAP_KEY, mapping={alias: target for alias in added})
+            pipe.zadd(ALIAS_SEEN_KEY, {alias: time.time() for alias in added})
+            # target이 예전에 별칭이었다면 제거 (A → B 이후 B가 최종 URL이 된 경우)
+            pipe.hdel(ALIAS_MAP_KEY, target)
+            pipe.zrem(ALIAS_SEEN_KEY, target)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Alias map write failed for {target}: {e}")
+            return 0
+
+        self._local.pop(target, None)
+        return len(added)
+
+    def prune(self, max_age: int = ALIAS_TTL) -> int:
+        """
+        max_age 동안 다시 기록되지 않은 별칭 삭제
+
+        기록 시각이 없는 별칭(만료 관리 이전에 저장된 것)도 함께 삭제한다.
+        영구 별칭이면 다음 크롤링에서 다시 기록된다.
+
+        Returns:
+            삭제한 별칭 수
+        """
+        expired = self.redis.zrangebyscore(ALIAS_SEEN_KEY, '-inf', time.time() - max_age)
+
+        aliases = self.redis.hkeys(ALIAS_MAP_KEY)
+        if aliases:
+            pipe = self.redis.pipeline(transaction=False)
+            for alias in aliases:
+                pipe.zscore(ALIAS_SEEN_KEY, alias)
+            expired += [alias for alias, score in zip(aliases, pipe.execute()) if score is None]
+
+        if not expired:
+            return 0
+
+        pipe = self.redis.pipeline()
+        pipe.hdel(ALIAS_MAP_KEY, *expired)
+        pipe.zrem(ALIAS_SEEN_KEY, *expired)
+        pipe.execute()
+
+        for alias in expired:
+            self._local.pop(alias.decode('utf-8') if isinstance(alias, bytes) else alias, None)
+        logger.info(f"Alias map pruned: {len(expired)} stale aliases")
+        return len(expired)
+
+    def size(self) -> int:
+        return self.redis.hlen(ALIAS_MAP_KEY)
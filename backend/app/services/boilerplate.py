@@ -0,0 +1,313 @@
+from typing import Dict, Iterator, List, Set, Tuple
+from collections import deque
+import hashlib
+import random
+import time
+
+from redis.exceptions import WatchError
+
+from app.core.logger import logger
+
+
+# Redis 키 (호스트별)
+DF_KEY_PREFIX = "boilerplate:df:"        # 블록 지문 → 등장한 페이지 수
+PAGES_KEY_PREFIX = "boilerplate:pages:"  # 관찰한 페이지 수
+DECAY_LOCK_PREFIX = "boilerplate:decay:" # 감쇠 중 표시 (워커 간 중복 감쇠 방지)
+
+# 후보 블록
+BLOCK_TAGS = {'header', 'nav', 'footer', 'aside', 'div', 'section', 'ul', 'ol', 'form', 'table'}
+MAX_BLOCK_DEPTH = 6      # <body> 기준 깊이
+MIN_BLOCK_TEXT = 20      # 이보다 짧은 블록은 무시 (문자 수)
+
+# 템플릿 판정: MIN_PAGES 이상 관찰했고 페이지의 60% 이상에 같은 블록이 있으면 boilerplate
+BOILERPLATE_RATIO = 0.6
+MIN_PAGES = 20
+# 제거 후 남는 텍스트가 이보다 짧으면 제거하지 않음 (템플릿뿐인 페이지 / 중복 페이지 보호)
+MIN_REMAINING_TEXT = 200
+
+# 학습 (템플릿이 안정되면 일부 페이지만 관찰, 주기적으로 감쇠하여 템플릿 변경 반영)
+FULL_OBSERVE_PAGES = 200
+OBSERVE_SAMPLE_RATE = 0.1
+REFRESH_INTERVAL = 300.0
+
+# 지문 해시 크기 제한 (페이지마다 다른 블록도 모두 쌓이므로)
+MAX_DF_FIELDS = 5000                 # 넘으면 관찰 직후 감쇠, 감쇠 후에는 빈도 상위 절반만 유지
+MODEL_TTL = 60 * 60 * 24 * 30        # 이 기간 관찰이 없는 호스트 모델은 만료
+DECAY_MIN_PAGES = FULL_OBSERVE_PAGES  # 주기 감쇠는 이만큼 관찰한 호스트만 (학습 중인 모델 보호)
+DECAY_LOCK_TTL = 60
+DECAY_MAX_RETRIES = 5                # 감쇠 도중 관찰이 끼어들면 (WATCH 실패) 다시 시도
+
+
+def _text(element) -> str:
+    return ' '.join(element.text_content().split())
+
+
+def block_fingerprint(element, text: str) -> str:
+    """태그 + id + class + 텍스트 지문 (페이지마다 다른 블록은 지문도 다름)"""
+    key = f"{element.tag}|{element.get('id', '')}|{element.get('class', '')}|{text}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def iter_blocks(body) -> Iterator[Tuple[object, str, str]]:
+    """(블록, 텍스트, 지문) - 부모가 자식보다 먼저 (BFS)"""
+    queue = deque((child, 1) for child in body)
+    while queue:
+        element, depth = queue.popleft()
+        if not isinstance(element.tag, str):
+            continue
+        if element.tag in BLOCK_TAGS:
+            text = _text(element)
+            if len(text) < MIN_BLOCK_TEXT:
+                continue
+            yield element, text, block_fingerprint(element, text)
+        if depth < MAX_BLOCK_DEPTH:
+            queue.extend((child, depth + 1) for child in element)
+
+
+class BoilerplateModel:
+    """
+    사이트 공통 블록 (헤더 / 메가 메뉴 / 사이드바 / 푸터) 학습 및 제거
+
+    페이지마다 블록 지문을 관찰하여 Redis에 호스트별 등장 빈도를 누적하고,
+    대부분의 페이지에 반복되는 블록을 trafilatura 실행 전에 DOM에서 제거한다.
+    """
+
+    def __init__(self, redis=None, refresh_interval: float = REFRESH_INTERVAL):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+        self.refresh_interval = refresh_interval
+        # host → (boilerplate 지문, 관찰 페이지 수, 로드 시각)
+        self._templates: Dict[str, Tuple[Set[str], int, float]] = {}
+
+    # ==================== 템플릿 ====================
+
+    def _load(self, host: str) -> Tuple[Set[str], int, float]:
+        pages = int(self.redis.get(PAGES_KEY_PREFIX + host) or 0)
+        template: Set[str] = set()
+        if pages >= MIN_PAGES:
+            threshold = pages * BOILERPLATE_RATIO
+            template = {
+                fp for fp, count in self.redis.hgetall(DF_KEY_PREFIX + host).items()
+                if int(count) >= threshold
+            }
+        return template, pages, time.monotonic()
+
+    def template(self, host: str) -> Set[str]:
+        """호스트의 boilerplate 지문 (refresh_interval마다 다시 로드)"""
+        cached = self._templates.get(host)
+        if cached is None or time.monotonic() - cached[2] > self.refresh_interval:
+            try:
+                cached = self._load(host)
+            except Exception as e:
+                logger.warning(f"Boilerplate template load failed for {host}: {e}")
+                cached = (cached[0] if cached else set(), cached[1] if cached else 0, time.monotonic())
+            self._templates[host] = cached
+        return cached[0]
+
+    # ==================== 학습 ====================
+
+    def observe(self, host: str, fingerprints: Set[str]):
+        """페이지 하나의 블록 지문 누적 (지문 수가 MAX_DF_FIELDS를 넘으면 감쇠)"""
+        pages = self._templates.get(host, (set(), 0, 0.0))[1]
+        if pages >= FULL_OBSERVE_PAGES and random.random() > OBSERVE_SAMPLE_RATE:
+            return
+
+        df_key, pages_key = DF_KEY_PREFIX + host, PAGES_KEY_PREFIX + host
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for fp in fingerprints:
+                pipe.hincrby(df_key, fp, 1)
+            pipe.incr(pages_key)
+            pipe.hlen(df_key)
+            pipe.expire(df_key, MODEL_TTL)
+            pipe.expire(pages_key, MODEL_TTL)
+            fields = pipe.execute()[-3]
+        except Exception as e:
+            logger.warning(f"Boilerplate observe failed for {host}: {e}")
+            return
+
+        if fields > MAX_DF_FIELDS:
+            self.decay(host)
+
+    def decay(self, host: str) -> bool:
+        """
+        카운트 절반으로 감쇠 (사라진 템플릿 블록 / 한 번만 나온 블록 정리)
+
+        WATCH 트랜잭션으로 읽기-쓰기 사이에 들어온 관찰을 잃지 않으며,
+        남는 지문은 빈도 상위 MAX_DF_FIELDS // 2개로 제한한다.
+
+        Returns:
+            감쇠했으면 True (다른 워커가 감쇠 중이거나 재시도를 모두 실패하면 False)
+        """
+        df_key, pages_key = DF_KEY_PREFIX + host, PAGES_KEY_PREFIX + host
+        lock_key = DECAY_LOCK_PREFIX + host
+        try:
+            if not self.redis.set(lock_key, 1, nx=True, ex=DECAY_LOCK_TTL):
+                return False
+        except Exception as e:
+            logger.warning(f"Boilerplate decay failed for {host}: {e}")
+            return False
+
+        try:
+            for _ in range(DECAY_MAX_RETRIES):
+                pipe = self.redis.pipeline(transaction=True)
+                try:
+                    pipe.watch(df_key, pages_key)
+                    counts = pipe.hgetall(df_key)
+                    pages = int(pipe.get(pages_key) or 0)
+
+                    halved = {fp: int(count) // 2 for fp, count in counts.items() if int(count) >= 2}
+                    if len(halved) > MAX_DF_FIELDS // 2:
+                        top = sorted(halved.items(), key=lambda item: item[1], reverse=True)[:MAX_DF_FIELDS // 2]
+                        halved = dict(top)
+
+                    pipe.multi()
+                    pipe.delete(df_key)
+                    if halved:
+                        pipe.hset(df_key, mapping=halved)
+                        pipe.expire(df_key, MODEL_TTL)
+                    pipe.set(pages_key, pages // 2, ex=MODEL_TTL)
+                    pipe.execute()
+                except WatchError:
+                    continue
+                finally:
+                    pipe.reset()
+
+                self._templates.pop(host, None)
+                logger.info(f"Boilerplate model decayed for {host}: {len(counts)} → {len(halved)} blocks")
+                return True
+
+            logger.warning(f"Boilerplate decay for {host} gave up after {DECAY_MAX_RETRIES} concurrent updates")
+            return False
+        finally:
+            self.redis.delete(lock_key)
+
+    def decay_all(self, min_pages: int = DECAY_MIN_PAGES) -> Dict[str, int]:
+        """
+        학습된 모든 호스트 모델 감쇠 (주기 작업)
+
+        Returns:
+            {'hosts': 감쇠한 호스트 수, 'skipped': 관찰이 적거나 감쇠하지 못한 호스트 수}
+        """
+        stats = {'hosts': 0, 'skipped': 0}
+        for key in self.redis.scan_iter(match=PAGES_KEY_PREFIX + "*"):
+            host = key[len(PAGES_KEY_PREFIX):]
+            if int(self.redis.get(key) or 0) >= min_pages and self.decay(host):
+                stats['hosts'] += 1
+            else:
+                stats['skipped'] += 1
+        return stats
+
+    # ==================== 제거 ====================
+
+    def prune(self, host: str, tree) -> Dict:
+        """
+        lxml 트리에서 boilerplate 블록 제거 (관찰도 함께)
+
+        Returns:
+            {'blocks': 제거한 블록 수, 'chars': 제거한 텍스트 길이}
+        """
+        body = tree.find('.//body')
+        if body is None:
+            body = tree
+
+        blocks: List[Tuple[object, str, str]] = list(iter_blocks(body))
+        self.observe(host, {fp for _, _, fp in blocks})
+
+        template = self.template(host)
+        if not template:
+            return {'blocks': 0, 'chars': 0}
+
+        # 가장 바깥 블록만 선택 (BFS 순서이므로 조상이 먼저 선택됨)
+        selected = []
+        selected_ids: Set[int] = set()
+        for element, text, fp in blocks:
+            if fp not in template:
+                continue
+            if any(id(ancestor) in selected_ids for ancestor in element.iterancestors()):
+                continue
+            selected.append((element, text))
+            selected_ids.add(id(element))
+
+        removed_chars = sum(len(text) for _, text in selected)
+        if len(_text(body)) - removed_chars < MIN_REMAINING_TEXT:
+            return {'blocks': 0, 'chars': 0}
+
+        for element, _ in selected:
+            element.drop_tree()
+        removed = len(selected)
+
+        return {'blocks': removed, 'chars': removed_chars}
+
+    def get_statistics(self, host: str) -> Dict:
+        template, pages, _ = self._load(host)
+        return {'host': host, 'pages_observed': pages, 'template_blocks': len(template)}
+
+
+# 테스트 코드 (학습 후 제거 비율 / 페이지당 시간)
+if __name__ == "__main__":
+    import lxml.html
+
+    class _DictRedis:
+        def __init__(self):
+            self.data = {}
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def hgetall(self, key):
+            return dict(self.data.get(key, {}))
+
+        def pipeline(self, transaction=True):
+            redis = self
+
+            class _Pipe:
+                def __init__(self):
+                    self.result = []
+
+                def hincrby(self, key, field, amount):
+                    fields = redis.data.setdefault(key, {})
+                    fields[field] = fields.get(field, 0) + amount
+
+                def incr(self, key):
+                    redis.data[key] = int(redis.data.get(key, 0)) + 1
+
+                def hlen(self, key):
+                    self.result.append(len(redis.data.get(key, {})))
+
+                def expire(self, key, seconds):
+                    self.result.append(True)
+
+                def execute(self):
+                    return self.result
+            return _Pipe()
+
+    menu = ''.join(f"<li><a href='/m/{i}'>Menu item number {i}</a></li>" for i in range(300))
+    sidebar = ''.join(f"<p>Quick link {i} to another department page</p>" for i in range(40))
+
+    def make_page(i: int) -> str:
+        body = ''.join(f"<p>Paragraph {j} of article {i} with some real content.</p>" for j in range(15))
+        return (
+            f"<html><body><header><nav class='mega'><ul>{menu}</ul></nav></header>"
+            f"<div class='layout'><aside class='sidebar'>{sidebar}</aside><main>{body}</main></div>"
+            f"<footer id='footer'><p>Dickinson College · Carlisle, PA 17013 · 717-243-5121</p></footer></body></html>"
+        )
+
+    model = BoilerplateModel(redis=_DictRedis(), refresh_interval=0)
+    for i in range(MIN_PAGES):
+        model.prune("www.dickinson.edu", lxml.html.fromstring(make_page(i)))
+
+    html = make_page(999)
+    before = len(lxml.html.fromstring(html).text_content())
+    t0 = time.perf_counter()
+    tree = lxml.html.fromstring(html)
+    result = model.prune("www.dickinson.edu", tree)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"\n{'='*60}")
+    print("Boilerplate Pruning Benchmark")
+    print(f"  Template blocks learned: {len(model.template('www.dickinson.edu'))}")
+    print(f"  Pruned: {result['blocks']} blocks, {before:,} → {len(tree.text_content()):,} chars")
+    print(f"  Parse + prune: {elapsed_ms:.2f}ms")
@@ -0,0 +1,416 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+
+from app.core.logger import logger
+
+
+# 청킹 기본값 (ai_context.md 3) Chunking Strategy)
+DEFAULT_TOKENIZER = "sentence-transformers/all-MiniLM-L6-v2"
+MIN_CHUNK_TOKENS = 700
+MAX_CHUNK_TOKENS = 1000
+OVERLAP_RATIO = 0.15  # 10-20% 오버랩
+
+# 토큰 수 캐시 크기 (문단 단위, 메모리 상한)
+TOKEN_CACHE_SIZE = 65536
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_APPROX_TOKEN = re.compile(r'\w+|[^\w\s]', re.UNICODE)
+
+
+@dataclass
+class Chunk:
+    """검색 단위 청크"""
+    id: str            # "{doc_id}_chunk_{i}"
+    doc_id: str
+    chunk_index: int
+    text: str
+    section: str       # "h2:Curriculum"
+    title: str
+    source_url: str
+    category: str = "general"
+    token_count: int = 0
+    section_index: int = -1      # 첫 문단의 섹션 인덱스
+    end_section_index: int = -1  # 마지막 문단의 섹션 인덱스
+
+
+@lru_cache(maxsize=4)
+def _load_tokenizer(model_name: str):
+    """
+    Fast(Rust) 토크나이저 로드 (프로세스당 1회)
+
+    tokenizers 패키지가 없으면 None 반환 → 정규식 근사치 사용
+    """
+    try:
+        from tokenizers import Tokenizer
+        tokenizer = Tokenizer.from_pretrained(model_name)
+        tokenizer.no_truncation()
+        tokenizer.no_padding()
+        return tokenizer
+    except Exception as e:
+        logger.warning(f"Fast tokenizer unavailable ({model_name}): {e}. Using regex approximation")
+        return None
+
+
+class TokenCounter:
+    """
+    캐시된 토큰 카운터
+
+    문단 단위로 한 번만 토큰화하고 결과를 캐시에 보관한다.
+    청크 윈도우의 토큰 수는 문단 토큰 수의 합으로 계산하므로
+    오버랩 구간을 다시 토큰화하지 않는다.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_TOKENIZER, cache_size: int = TOKEN_CACHE_SIZE):
+        self.model_name = model_name
+        self.tokenizer = _load_tokenizer(model_name)
+        self.cache_size = cache_size
+        self._cache: Dict[str, int] = {}
+
+    def _remember(self, text: str, n: int):
+        # 상한 초과 시 초기화 (메모리 상한 유지)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[text] = n
+
+    def count(self, text: str) -> int:
+        """텍스트 토큰 수 (캐시)"""
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        """
+        여러 문단의 토큰 수
+
+        캐시 미스만 모아서 encode_batch로 한 번에 토큰화
+        """
+        counts: List[int] = [0] * len(texts)
+        misses: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            cached = self._cache.get(text)
+            if cached is None:
+                misses.setdefault(text, []).append(i)
+            else:
+                counts[i] = cached
+
+        if not misses:
+            return counts
+
+        unique = list(misses.keys())
+        if self.tokenizer is not None:
+            encodings = self.tokenizer.encode_batch(unique, add_special_tokens=False)
+            new_counts = [len(encoding.ids) for encoding in encodings]
+        else:
+            new_counts = [len(_APPROX_TOKEN.findall(text)) for text in unique]
+
+        for text, n in zip(unique, new_counts):
+            self._remember(text, n)
+            for i in misses[text]:
+                counts[i] = n
+
+        return counts
+
+
+class HeaderChunker:
+    """
+    헤더 기반 스트리밍 청커
+
+    ContentExtractor._extract_sections가 찾은 헤딩(h1/h2/h3)을 기준으로
+    본문을 섹션으로 나누고, 섹션 안에서 700-1000 토큰 청크로 묶는다.
+    """
+
+    def __init__(
+        self,
+        min_tokens: int = MIN_CHUNK_TOKENS,
+        max_tokens: int = MAX_CHUNK_TOKENS,
+        overlap_ratio: float = OVERLAP_RATIO,
+        token_counter: Optional[TokenCounter] = None
+    ):
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.overlap_tokens = int(max_tokens * overlap_ratio)
+        self.counter = token_counter or TokenCounter()
+
+    # ==================== 섹션 분할 ====================
+
+    def split_sections(self, content: str, sections: List[Dict]) -> List[Tuple[str, int, List[str]]]:
+        """
+        본문을 헤딩 기준 섹션으로 분할
+
+        Args:
+            content: 본문 텍스트 (trafilatura 출력, 줄 단위)
+            sections: [{'level': 'h2', 'title': '...'}] (문서 순서)
+
+        Returns:
+            [(섹션 라벨, 섹션 인덱스, 문단 리스트)]
+        """
+        paragraphs = [line.strip() for line in content.split('\n')]
+        paragraphs = [p for p in paragraphs if p]
+
+        result = []
+        current_label = ""
+        current_index = -1
+        current: List[str] = []
+        next_section = 0
+
+        for paragraph in paragraphs:
+            # 헤딩은 문서 순서대로 등장하므로 앞으로만 탐색
+            matched = None
+            for j in range(next_section, len(sections)):
+                if sections[j].get('title') == paragraph:
+                    matched = j
+                    break
+
+            if matched is not None:
+                if current:
+                    result.append((current_label, current_index, current))
+                section = sections[matched]
+                current_label = f"{section.get('level', 'h2')}:{section['title']}"
+                current_index = matched
+                current = [paragraph]
+                next_section = matched + 1
+            else:
+                current.append(paragraph)
+
+        if current:
+            result.append((current_label, current_index, current))
+
+        return result
+
+    # ==================== 청크 생성 ====================
+
+    def _split_long_paragraph(self, paragraph: str) -> List[str]:
+        """max_tokens를 넘는 문단을 문장 단위로 분할"""
+        sentences = _SENTENCE_SPLIT.split(paragraph)
+        pieces = []
+        current = []
+        current_tokens = 0
+
+        for sentence, n in zip(sentences, self.counter.count_many(sentences)):
+            if current and current_tokens + n > self.max_tokens:
+                pieces.append(' '.join(current))
+                current, current_tokens = [], 0
+
+            # 한 문장이 max_tokens 초과 → 단어 단위 강제 분할
+            if n > self.max_tokens:
+                words = sentence.split()
+                step = max(1, len(words) * self.max_tokens // n)
+                for k in range(0, len(words), step):
+                    pieces.append(' '.join(words[k:k + step]))
+                continue
+
+            current.append(sentence)
+            current_tokens += n
+
+        if current:
+            pieces.append(' '.join(current))
+
+        return pieces
+
+    def _units(self, sections: List[Tuple[str, int, List[str]]]) -> Iterator[Tuple[str, int, str, int]]:
+        """(섹션 라벨, 섹션 인덱스, 문단, 토큰 수) 스트림"""
+        for label, index, paragraphs in sections:
+            counts = self.counter.count_many(paragraphs)
+            for paragraph, n in zip(paragraphs, counts):
+                if n > self.max_tokens:
+                    pieces = self._split_long_paragraph(paragraph)
+                    for piece, m in zip(pieces, self.counter.count_many(pieces)):
+                        yield label, index, piece, m
+                else:
+                    yield label, index, paragraph, n
+
+    def chunk_document(self, document: Dict) -> Iterator[Chunk]:
+        """
+        문서 하나를 청크 스트림으로 변환
+
+        Args:
+            document: MongoDB 문서 (dict) 또는 Document 모델
+
+        Yields:
+            Chunk
+        """
+        if hasattr(document, 'model_dump'):
+            document = document.model_dump(by_alias=True)
+
+        content = document.get('content') or ""
+        if not content.strip():
+            return
+
+        doc_id = str(document.get('_id') or document.get('normalized_url'))
+        source_url = document.get('normalized_url') or document.get('url', '')
+        title = document.get('title', '')
+        category = document.get('category', 'general')
+        sections = [
+            s if isinstance(s, dict) else s.model_dump()
+            for s in (document.get('sections') or [])
+        ]
+
+        # 현재 윈도우: (문단, 토큰 수, 섹션 라벨, 섹션 인덱스)
+        window: List[Tuple[str, int, str, int]] = []
+        window_tokens = 0
+        chunk_index = 0
+
+        def emit():
+            nonlocal chunk_index
+            chunk = Chunk(
+                id=f"{doc_id}_chunk_{chunk_index}",
+                doc_id=doc_id,
+                chunk_index=chunk_index,
+                text='\n'.join(unit[0] for unit in window),
+                section=window[0][2],
+                title=title,
+                source_url=source_url,
+                category=category,
+                token_count=window_tokens,
+                section_index=window[0][3],
+                end_section_index=window[-1][3]
+            )
+            chunk_index += 1
+            return chunk
+
+        def overlap_tail() -> Tuple[List[Tuple[str, int, str, int]], int]:
+            """다음 청크로 넘길 꼬리 문단 (overlap_tokens 이내)"""
+            tail = []
+            tokens = 0
+            for unit in reversed(window[1:]):
+                if tokens + unit[1] > self.overlap_tokens:
+                    break
+                tail.insert(0, unit)
+                tokens += unit[1]
+            return tail, tokens
+
+        for label, index, paragraph, n in self._units(self.split_sections(content, sections)):
+            if window:
+                section_break = index != window[-1][3] and window_tokens >= self.min_tokens
+                overflow = window_tokens + n > self.max_tokens
+
+                if section_break:
+                    # 섹션 경계: 오버랩 없이 새 청크
+                    yield emit()
+                    window, window_tokens = [], 0
+                elif overflow:
+                    yield emit()
+                    window, window_tokens = overlap_tail()
+                    # 오버랩 + 새 문단이 여전히 넘치면 오버랩 포기
+                    if window_tokens + n > self.max_tokens:
+                        window, window_tokens = [], 0
+
+            window.append((paragraph, n, label, index))
+            window_tokens += n
+
+        if window:
+            yield emit()
+
+    def iter_chunks(self, documents: Iterable[Dict]) -> Iterator[Chunk]:
+        """문서 스트림 → 청크 스트림 (한 번에 한 문서만 메모리에 유지)"""
+        for document in documents:
+            try:
+                yield from self.chunk_document(document)
+            except Exception as e:
+                url = document.get('normalized_url') if isinstance(document, dict) else None
+                logger.error(f"Chunking failed for {url}: {e}")
+
+
+# 코퍼스 스캔 시 필요한 필드만 가져오기
+CORPUS_PROJECTION = {
+    'normalized_url': 1,
+    'url': 1,
+    'title': 1,
+    'category': 1,
+    'content': 1,
+    'sections': 1
+}
+
+
+def iter_corpus_chunks(
+    collection=None,
+    chunker: Optional[HeaderChunker] = None,
+    query: Optional[Dict] = None,
+    batch_size: int = 100
+) -> Iterator[Chunk]:
+    """
+    documents 컬렉션 전체를 단일 패스로 청킹 (커서 배치 단위로 메모리 제한)
+
+    Args:
+        collection: MongoDB 컬렉션 (기본: documents)
+        chunker: HeaderChunker (기본 설정)
+        query: 문서 필터 (기본: active 문서)
+        batch_size: 커서 배치 크기
+    """
+    if collection is None:
+        from app.core.database import mongodb_db_sync
+        collection = mongodb_db_sync.documents
+
+    chunker = chunker or HeaderChunker()
+    cursor = collection.find(query or {'status': 'active'}, CORPUS_PROJECTION).batch_size(batch_size)
+
+    yield from chunker.iter_chunks(cursor)
+
+
+def chunk_document(document: Dict) -> List[Chunk]:
+    """단일 문서 청킹 (ai_context.md 계약)"""
+    return list(HeaderChunker().chunk_document(document))
+
+
+# 테스트 코드 (처리량 벤치마크)
+if __name__ == "__main__":
+    import random
+    import time
+    import tracemalloc
+
+    random.seed(42)
+    vocab = [
+        'dickinson', 'college', 'students', 'faculty', 'course', 'major', 'minor',
+        'requirements', 'campus', 'housing', 'dining', 'admissions', 'deadline',
+        'application', 'financial', 'aid', 'research', 'program', 'study', 'abroad',
+        'the', 'of', 'and', 'to', 'in', 'for', 'with', 'on', 'is', 'are'
+    ]
+
+    # 문단 풀 (문서 생성 비용이 측정을 왜곡하지 않도록 미리 생성)
+    paragraph_pool = [
+        ' '.join(random.choices(vocab, k=random.randint(20, 150))).capitalize() + '.'
+        for _ in range(5000)
+    ]
+
+    def make_document(i: int) -> Dict:
+        sections = []
+        lines = []
+        for s in range(random.randint(2, 8)):
+            title = f"Section {s} of page {i}"
+            sections.append({'level': random.choice(['h1', 'h2', 'h3']), 'title': title})
+            lines.append(title)
+            lines.extend(random.sample(paragraph_pool, random.randint(2, 12)))
+        return {
+            '_id': f"doc{i}",
+            'normalized_url': f"https://www.dickinson.edu/page/{i}",
+            'title': f"Page {i}",
+            'category': 'academics',
+            'content': '\n'.join(lines),
+            'sections': sections
+        }
+
+    n_docs = 2000
+    chunker = HeaderChunker()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    n_chunks = 0
+    n_tokens = 0
+    for chunk in chunker.iter_chunks(make_document(i) for i in range(n_docs)):
+        n_chunks += 1
+        n_tokens += chunk.token_count
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\n{'='*60}")
+    print("Chunker Benchmark")
+    print(f"  Tokenizer: {'fast' if chunker.counter.tokenizer else 'regex approximation'}")
+    print(f"  Documents: {n_docs}")
+    print(f"  Chunks: {n_chunks} (avg {n_tokens // max(n_chunks, 1)} tokens)")
+    print(f"  Elapsed: {elapsed:.2f}s")
+    print(f"  Throughput: {n_chunks / elapsed:,.0f} chunks/s")
+    print(f"  Peak memory: {peak / 1024 / 1024:.1f} MB")
@@ -1,51 +1,195 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import httpx
 from bs4 import BeautifulSoup
 from trafilatura import extract
 from trafilatura.settings import use_config
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urljoin, urlparse, parse_qs
 import re
 import base64
+import hashlib
+import time
+import lxml.html
 
 from app.core.logger import logger
-from app.services.hash_utils import compute_content_hash
+from app.services.boilerplate import BoilerplateModel
+from app.services.fetch_cache import NegativeCache
+from app.services.hash_utils import compute_content_hash, hash_sections
+from app.services.http_client import HttpClientPool, get_http_pool
+from app.services.site_adapters import SiteAdapter, get_adapter
+from app.services.url_utils import URLNormalizer
 
-"""
-TODO: Extract dynamic contents
-"""
+# 동적(클라이언트 렌더링) 사이트는 site_adapters의 JSON 어댑터로 처리
+
+# 다운로드 상한 (이보다 큰 페이지는 중단하고 다시 가져오지 않음)
+MAX_HTML_BYTES = 5 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+# 영구 저장할 redirect (302/303/307은 이번 크롤링에서만 별칭으로 사용)
+PERMANENT_REDIRECT_STATUSES = (301, 308)
+# Content-Type이 없거나 모호할 때 본문 앞부분으로 판별
+SNIFF_CONTENT_TYPES = ('', 'text/plain', 'application/octet-stream')
+BINARY_SIGNATURES = (
+    b'%PDF', b'\x89PNG', b'\xff\xd8\xff', b'GIF8', b'PK\x03\x04',
+    b'\xd0\xcf\x11\xe0', b'ID3', b'RIFF', b'\x00\x00\x00'
+)
+
+# 단계별 추출 (fast → full → bs4, 품질 점수가 기준 이상이면 중단)
+EXTRACTION_TIERS = ('fast', 'full', 'bs4')
+QUALITY_THRESHOLD = 0.6
+MIN_CONTENT_CHARS = 100
+MIN_CONTENT_WORDS = 50        # 이보다 짧은 페이지는 저장하지 않음 (모든 크롤링 / 저장 경로 공통)
+DENSE_LINE_CHARS = 80         # 줄당 평균 글자 수가 이 이상이면 밀도 만점 (메뉴/링크 목록은 짧은 줄)
+EXPECTED_TEXT_RATIO = 0.02    # HTML 크기 대비 본문 길이가 이 이상이면 만점
+MAX_QUALITY_HEADINGS = 20
+
+
+def extraction_quality(text: Optional[str], html_size: int, headings: List[str]) -> float:
+    """
+    추출 결과 품질 점수 (0~1, 추출기를 다시 돌리지 않는 저비용 지표)
+    
+    텍스트 밀도 0.4 + 헤딩 커버리지 0.4 + HTML 대비 길이 0.2
+    (boilerplate 제거 후 남은 헤딩이 본문에 얼마나 들어 있는지로 누락 여부를 본다)
+    """
+    if not text or len(text) < MIN_CONTENT_CHARS:
+        return 0.0
+    
+    lines = [line for line in text.split('\n') if line.strip()]
+    density = min(len(text) / max(len(lines), 1) / DENSE_LINE_CHARS, 1.0)
+    
+    if headings:
+        lowered = text.lower()
+        coverage = sum(1 for heading in headings if heading.lower() in lowered) / len(headings)
+    else:
+        coverage = 0.5   # 헤딩 없는 페이지는 중립
+    
+    ratio = min(len(text) / max(html_size, 1) / EXPECTED_TEXT_RATIO, 1.0)
+    return round(0.4 * density + 0.4 * coverage + 0.2 * ratio, 4)
+
+
+def _sniff_html(head: bytes) -> bool:
+    """본문 앞부분이 HTML처럼 보이는지"""
+    if head.startswith(BINARY_SIGNATURES):
+        return False
+    sample = head[:1024].lstrip(b'\xef\xbb\xbf \t\r\n')
+    return sample.startswith(b'<') and b'\x00' not in sample
 
 
 class ContentExtractor:
     """웹페이지 콘텐츠 추출기"""
     
-    def __init__(self):
-        # Requests 세션 (Retry 전략 포함)
-        self.session = self._create_session()
+    def __init__(
+        self,
+        http: Optional[HttpClientPool] = None,
+        negative_cache: Optional[NegativeCache] = None,
+        max_bytes: int = MAX_HTML_BYTES,
+        boilerplate: Optional[BoilerplateModel] = None
+    ):
+        # 프로세스 공유 HTTP/2 클라이언트 (재시도 포함)
+        self.http = http or get_http_pool()
+        
+        # HTML이 아니거나 너무 큰 URL 기록
+        self.negative_cache = negative_cache or NegativeCache()
+        self.max_bytes = max_bytes
+        
+        # 사이트 공통 블록 (헤더 / 메뉴 / 푸터) 학습 모델
+        self.boilerplate = boilerplate or BoilerplateModel()
+        self.boilerplate_stats = {'pages': 0, 'blocks': 0, 'chars': 0}
+        
+        # 단계별 추출 통계 (단계별 시도/채택/시간, 카테고리별 시간)
+        self.extraction_stats = {
+            'pages': 0,
+            'tiers': {tier: {'attempts': 0, 'hits': 0, 'seconds': 0.0} for tier in EXTRACTION_TIERS},
+            'categories': {}
+        }
         
         # Trafilatura 설정
         self.traf_config = use_config()
         self.traf_config.set("DEFAULT", "MIN_EXTRACTED_SIZE", "500")
         self.traf_config.set("DEFAULT", "MIN_OUTPUT_SIZE", "300")
     
-    def _create_session(self) -> requests.Session:
-        """Retry 전략이 포함된 세션 생성"""
-        session = requests.Session()
+    def fetch(self, url: str) -> Optional[Dict]:
+        """
+        URL 가져오기 (스트리밍, redirect 체인 포함)
+        
+        헤더의 Content-Type / Content-Length로 HTML이 아니거나 너무 큰 응답은
+        본문을 받기 전에 중단하고, 읽는 바이트 수도 max_bytes로 제한한다.
+        중단한 URL은 negative cache에 기록하여 다시 가져오지 않는다.
+        
+        Args:
+            url: 크롤링할 URL
+            
+        Returns:
+            {'url', 'final_url', 'redirects', 'redirect_statuses', 'status', 'headers', 'html', 'raw_hash'} 또는 None (실패/제외 시)
+            raw_hash는 디코딩 전 본문 바이트의 SHA256 (ETag 없이도 변경 여부 판단)
+        """
+        reason = self.negative_cache.get(url)
+        if reason:
+            logger.info(f"Skipping {url} (negative cache: {reason})")
+            return None
         
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=2,  # 1초, 2초, 4초
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
+        try:
+            response = self.http.stream(url)
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return None
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        try:
+            response.raise_for_status()
+            final_url = str(response.url)
+            
+            reason = self._reject_reason(response)
+            body = bytearray()
+            if not reason:
+                for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > self.max_bytes:
+                        reason = f"too_large:>{self.max_bytes}"
+                        break
+            
+            if not reason and response.headers.get('content-type', '').split(';')[0].strip().lower() in SNIFF_CONTENT_TYPES:
+                if not _sniff_html(bytes(body[:2048])):
+                    reason = "sniffed:binary"
+            
+            if reason:
+                logger.warning(f"Skipping {url} ({reason})")
+                self.negative_cache.add(url, reason)
+                normalized_final = URLNormalizer.normalize(final_url)
+                if normalized_final and normalized_final != url:
+                    self.negative_cache.add(normalized_final, reason)
+                return None
+            
+            return {
+                'url': url,
+                'final_url': final_url,
+                'redirects': [str(r.url) for r in response.history],
+                'redirect_statuses': [r.status_code for r in response.history],
+                'status': response.status_code,
+                'headers': dict(response.headers),
+                'html': body.decode(response.encoding or 'utf-8', errors='replace'),
+                'raw_hash': hashlib.sha256(body).hexdigest()
+            }
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return None
         
-        return session
+        finally:
+            response.close()
+    
+    def _reject_reason(self, response: httpx.Response) -> Optional[str]:
+        """헤더만으로 거를 수 있는 응답 (HTML 아님 / Content-Length 초과)"""
+        content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+        if content_type not in HTML_CONTENT_TYPES and content_type not in SNIFF_CONTENT_TYPES:
+            return f"content_type:{content_type}"
+        
+        length = response.headers.get('content-length')
+        # Content-Length는 압축된 크기이므로 압축 응답이면 본문을 읽으며 다시 확인
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            return f"too_large:{length}"
+        
+        return None
     
     def fetch_html(self, url: str) -> Optional[str]:
         """
@@ -57,24 +201,119 @@ class ContentExtractor:
         Returns:
             HTML 문자열 또는 None (실패 시)
         """
-        try:
-            headers = {
-                'User-Agent': 'RUSH-Bot/1.0 (Dickinson College Student Project; +https://github.com/aaronshin43)'
-            }
-            
-            response = self.session.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            return response.text
+        fetched = self.fetch(url)
+        return fetched['html'] if fetched else None
+    
+    def resolve_final_url(self, fetched: Dict, content_data: Dict) -> Tuple[str, List[str]]:
+        """
+        저장할 최종 URL과 별칭 결정
+        
+        rel=canonical (유효한 내부 URL일 때) > redirect 도착지 > 요청 URL
+        
+        Returns:
+            (최종 URL, 별칭 URL 리스트) - 모두 정규화된 URL
+        """
+        chain = [fetched['url'], *fetched.get('redirects', []), fetched['final_url']]
+        normalized = [URLNormalizer.normalize(u) for u in chain]
+        normalized = [u for u in normalized if u]
+        
+        final_url = content_data.get('canonical_url') or (normalized[-1] if normalized else fetched['url'])
+        aliases = list(dict.fromkeys(u for u in normalized if u != final_url))
+        return final_url, aliases
+    
+    @staticmethod
+    def permanent_aliases(fetched: Dict, final_url: str) -> List[str]:
+        """
+        영구 저장해도 되는 별칭 (resolve_final_url 별칭 중 일부)
+        
+        도착지에서 거꾸로 따라가며 301/308 hop만 포함하고, 임시 redirect를 만나면 멈춘다.
+        canonical은 도착한 페이지와 같은 호스트일 때만 (다른 호스트 canonical은 이번 크롤링에서만)
+        
+        Returns:
+            정규화된 별칭 URL 리스트
+        """
+        landed = URLNormalizer.normalize(fetched['final_url']) or fetched['final_url']
+        if landed != final_url and urlparse(landed).netloc != urlparse(final_url).netloc:
+            return []
+        
+        aliases = [landed]
+        hops = zip(reversed(fetched.get('redirects', [])), reversed(fetched.get('redirect_statuses', [])))
+        for url, status in hops:
+            if status not in PERMANENT_REDIRECT_STATUSES:
+                break
+            aliases.append(URLNormalizer.normalize(url))
+        return list(dict.fromkeys(u for u in aliases if u and u != final_url))
+    
+    @staticmethod
+    def has_enough_content(content_data: Dict) -> bool:
+        """저장할 만한 본문인지 (MIN_CONTENT_WORDS 단어 이상)"""
+        return content_data.get('word_count', 0) >= MIN_CONTENT_WORDS
+    
+    def reuse_extraction(self, fetched: Dict, document) -> Optional[Dict]:
+        """
+        원본 HTML이 저장된 문서와 같으면 저장된 추출 결과 재사용
+        
+        trafilatura / BeautifulSoup / 분류 / 해시 계산을 모두 생략한다.
+        
+        Args:
+            fetched: fetch() 결과
+            document: 저장된 Document (raw_hash 포함)
             
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch {url}: {e}")
+        Returns:
+            extract_content와 같은 딕셔너리 + 'url', 'aliases', 'permanent_aliases', 'raw_unchanged' 또는 None (다르면)
+        """
+        if document is None or not document.raw_hash or document.raw_hash != fetched.get('raw_hash'):
             return None
+        
+        final_url, aliases = self.resolve_final_url(fetched, {'canonical_url': document.normalized_url})
+        return {
+            'url': final_url,
+            'aliases': aliases,
+            'permanent_aliases': self.permanent_aliases(fetched, final_url),
+            'title': document.title,
+            'content': document.content,
+            'content_hash': document.content_hash,
+            'raw_hash': document.raw_hash,
+            'raw_unchanged': True,
+            'document_id': str(document.id),
+            'sections': [section.model_dump() for section in document.sections],
+            'category': document.category,
+            'word_count': document.word_count,
+            'priority': document.priority,
+            'canonical_url': document.normalized_url,
+            'crawled_at': datetime.now()
+        }
+    
+    def _prune_boilerplate(self, html: str, url: str):
+        """
+        학습된 boilerplate 블록을 제거한 lxml 트리 (파싱 실패 시 원본 HTML)
+        
+        트리를 그대로 trafilatura에 넘기므로 다시 파싱하지 않는다.
+        """
+        try:
+            tree = lxml.html.fromstring(html)
+        except (ValueError, lxml.etree.ParserError) as e:
+            logger.debug(f"lxml parse failed for {url}: {e}")
+            return html
+        
+        try:
+            pruned = self.boilerplate.prune(urlparse(url).netloc.lower(), tree)
+        except Exception as e:
+            logger.warning(f"Boilerplate pruning failed for {url}: {e}")
+            return tree
+        
+        self.boilerplate_stats['pages'] += 1
+        self.boilerplate_stats['blocks'] += pruned['blocks']
+        self.boilerplate_stats['chars'] += pruned['chars']
+        return tree
     
     def extract_content(self, html: str, url: str) -> Dict:
         """
         HTML에서 콘텐츠 추출
         
+        trafilatura 빠른 모드(fallback 없음)를 먼저 쓰고, 품질 점수가 낮을 때만
+        trafilatura 전체 모드 → BeautifulSoup 순으로 시도하여 점수가 가장 높은 결과를 쓴다.
+        
         Args:
             html: HTML 문자열
             url: 원본 URL
@@ -82,52 +321,167 @@ class ContentExtractor:
         Returns:
             추출된 콘텐츠 딕셔너리
         """
-        # 1. Trafilatura로 본문 추출
-        main_content = extract(
-            html,
-            config=self.traf_config,
-            include_comments=False,
-            include_tables=True,
-            include_links=False,
-            no_fallback=False
-        )
-        
-        # 2. Trafilatura 실패 시 BeautifulSoup 폴백
-        if not main_content or len(main_content) < 100:
-            logger.warning(f"Trafilatura failed for {url}, using BeautifulSoup fallback")
-            main_content = self._extract_with_bs4(html)
-        
-        # 3. BeautifulSoup으로 메타데이터 추출
-        soup = BeautifulSoup(html, 'html.parser')
+        start = time.perf_counter()
         
-        # 제목
-        title = self._extract_title(soup)
+        # 1. 사이트 공통 블록 제거 (트리는 모든 단계에서 재사용, trafilatura는 복사본을 정리함)
+        tree = self._prune_boilerplate(html, url)
         
-        # 섹션 구조
+        # 2. BeautifulSoup으로 메타데이터 추출
+        soup = BeautifulSoup(html, 'html.parser')
+        title = self._extract_title(soup)
+        canonical_url = self._extract_canonical(soup, url)
         sections = self._extract_sections(soup)
         
+        # 3. 단계별 본문 추출
+        headings = self._quality_headings(tree, sections)
+        main_content, tier = self._extract_tiered(tree, html, soup, headings, url)
+        
+        result = self._build_result(url, title, main_content, sections, canonical_url)
+        self._record_page(result['category'], time.perf_counter() - start)
+        result['extraction_tier'] = tier
+        return result
+    
+    def _quality_headings(self, tree, sections: List[Dict]) -> List[str]:
+        """품질 점수용 헤딩 (boilerplate 제거 후 트리 기준, 파싱 실패 시 전체 섹션)"""
+        if isinstance(tree, str):
+            titles = [section['title'] for section in sections]
+        else:
+            titles = [' '.join(h.text_content().split()) for h in tree.iter('h1', 'h2', 'h3')]
+        return [title for title in titles if title][:MAX_QUALITY_HEADINGS]
+    
+    def _extract_tiered(self, tree, html: str, soup: BeautifulSoup, headings: List[str], url: str) -> Tuple[str, str]:
+        """
+        fast → full → bs4 순서로 추출 (품질 기준을 넘으면 중단)
+        
+        Returns:
+            (본문, 채택된 단계)
+        """
+        best_text, best_tier, best_score = "", EXTRACTION_TIERS[0], -1.0
+        
+        for tier in EXTRACTION_TIERS:
+            tier_start = time.perf_counter()
+            if tier == 'bs4':
+                # soup은 메타데이터 추출이 끝난 뒤라 변경해도 됨
+                text = self._extract_with_bs4(html, soup)
+            else:
+                text = extract(
+                    tree,
+                    config=self.traf_config,
+                    include_comments=False,
+                    include_tables=True,
+                    include_links=False,
+                    no_fallback=(tier == 'fast')
+                ) or ""
+            
+            stats = self.extraction_stats['tiers'][tier]
+            stats['attempts'] += 1
+            stats['seconds'] += time.perf_counter() - tier_start
+            
+            score = extraction_quality(text, len(html), headings)
+            if score > best_score:
+                best_text, best_tier, best_score = text, tier, score
+            if score >= QUALITY_THRESHOLD:
+                break
+        
+        if best_tier != EXTRACTION_TIERS[0]:
+            logger.info(f"Extraction fell back to '{best_tier}' for {url} (quality {best_score:.2f})")
+        self.extraction_stats['tiers'][best_tier]['hits'] += 1
+        return best_text, best_tier
+    
+    def _record_page(self, category: str, seconds: float):
+        self.extraction_stats['pages'] += 1
+        category_stats = self.extraction_stats['categories'].setdefault(category, {'pages': 0, 'seconds': 0.0})
+        category_stats['pages'] += 1
+        category_stats['seconds'] += seconds
+    
+    def get_extraction_stats(self) -> Dict:
+        """단계별 채택률 / 평균 시간, 카테고리별 페이지당 시간"""
+        pages = self.extraction_stats['pages']
+        return {
+            'pages': pages,
+            'tiers': {
+                tier: {
+                    'attempts': stats['attempts'],
+                    'hit_rate': round(stats['hits'] / pages, 4) if pages else 0.0,
+                    'avg_ms': round(stats['seconds'] * 1000 / stats['attempts'], 2) if stats['attempts'] else 0.0
+                }
+                for tier, stats in self.extraction_stats['tiers'].items()
+            },
+            'categories': {
+                category: {
+                    'pages': stats['pages'],
+                    'total_s': round(stats['seconds'], 3),
+                    'avg_ms': round(stats['seconds'] * 1000 / stats['pages'], 2)
+                }
+                for category, stats in sorted(
+                    self.extraction_stats['categories'].items(),
+                    key=lambda item: -item[1]['seconds']
+                )
+            }
+        }
+    
+    def _build_result(
+        self,
+        url: str,
+        title: str,
+        content: str,
+        sections: List[Dict],
+        canonical_url: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Dict:
+        """추출 결과 딕셔너리 (HTML / JSON 어댑터 공통)"""
         # 카테고리 추측 (URL 기반)
-        category = self._guess_category(url)
-
+        category = category or self._guess_category(url)
+        
         # 우선순위 추측 (URL 기반)
         priority = self._determine_priority(url, category)
         
-        # 결과 반환
         return {
             'url': url,
             'title': title,
-            'content': main_content,
-            'content_hash': compute_content_hash(main_content),
-            'sections': sections,
+            'content': content,
+            'content_hash': compute_content_hash(content),
+            # 섹션 구조 + 섹션별 범위/해시 (부분 재색인용)
+            'sections': hash_sections(content, sections),
             'category': category,
-            'word_count': len(main_content.split()),
+            'word_count': len(content.split()),
             'priority': priority,
+            'canonical_url': canonical_url,
             'crawled_at': datetime.now()
         }
     
-    def _extract_with_bs4(self, html: str) -> str:
-        """BeautifulSoup으로 본문 추출 (폴백)"""
-        soup = BeautifulSoup(html, 'html.parser')
+    def get_adapter(self, url: str) -> Optional[SiteAdapter]:
+        """화이트리스트 동적 사이트의 JSON 어댑터 (없으면 None)"""
+        return get_adapter(url, self.http)
+    
+    def crawl_structured(self, url: str, adapter: Optional[SiteAdapter] = None) -> Optional[Dict]:
+        """
+        JSON 어댑터로 페이지 크롤링 (렌더링 없이 API 직접 호출)
+        
+        Returns:
+            extract_content와 같은 딕셔너리 + 'links' (어댑터가 찾은 하위 페이지) 또는 None
+        """
+        adapter = adapter or self.get_adapter(url)
+        if adapter is None:
+            return None
+        
+        try:
+            page = adapter.fetch(url)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.error(f"{adapter.name} adapter failed for {url}: {e}")
+            return None
+        
+        if page is None:
+            return None
+        
+        result = self._build_result(page.url, page.title, page.content, page.sections, category=page.category)
+        result['links'] = [link for link in (URLNormalizer.normalize(l) for l in page.links) if link]
+        return result
+    
+    def _extract_with_bs4(self, html: str, soup: Optional[BeautifulSoup] = None) -> str:
+        """BeautifulSoup으로 본문 추출 (폴백, soup을 주면 다시 파싱하지 않고 변경함)"""
+        if soup is None:
+            soup = BeautifulSoup(html, 'html.parser')
         
         # <main>, <article> 태그 우선 탐색
         main = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
@@ -163,6 +517,13 @@ class ContentExtractor:
         
         return "Untitled"
     
+    def _extract_canonical(self, soup: BeautifulSoup, url: str) -> Optional[str]:
+        """<link rel="canonical"> (정규화 후 크롤링 대상 URL일 때만)"""
+        link = soup.find('link', rel='canonical', href=True)
+        if not link:
+            return None
+        return URLNormalizer.normalize(urljoin(url, link['href']))
+    
     def _extract_sections(self, soup: BeautifulSoup) -> List[Dict]:
         """
         섹션 구조 추출 (헤더 기반 - 메타데이터만)
@@ -415,26 +776,44 @@ class ContentExtractor:
         # 최종 fallback
         return 'general'    
     
-    def crawl_page(self, url: str) -> Optional[Dict]:
+    def crawl_page(self, url: str, stored=None) -> Optional[Dict]:
         """
         단일 페이지 크롤링 (fetch + extract)
         
         Args:
             url: 크롤링할 URL
+            stored: 저장된 Document (원본 HTML이 같으면 추출 생략)
             
         Returns:
             추출된 콘텐츠 또는 None
         """
         logger.info(f"Crawling: {url}")
         
+        # 동적 사이트는 JSON 어댑터
+        adapter = self.get_adapter(url)
+        if adapter is not None:
+            content_data = self.crawl_structured(url, adapter)
+            if content_data:
+                content_data.pop('links', None)
+            return content_data
+        
         # HTML 가져오기
-        html = self.fetch_html(url)
-        if not html:
+        fetched = self.fetch(url)
+        if not fetched:
             return None
         
-        # 콘텐츠 추출
+        # 원본 HTML이 그대로면 저장된 추출 결과 사용
+        content_data = self.reuse_extraction(fetched, stored)
+        if content_data:
+            logger.info(f"✓ Raw HTML unchanged: {url}")
+            return content_data
+        
+        # 콘텐츠 추출 (redirect/canonical을 따라 최종 URL로 저장)
         try:
-            content_data = self.extract_content(html, url)
+            content_data = self.extract_content(fetched['html'], fetched['final_url'])
+            content_data['url'], content_data['aliases'] = self.resolve_final_url(fetched, content_data)
+            content_data['permanent_aliases'] = self.permanent_aliases(fetched, content_data['url'])
+            content_data['raw_hash'] = fetched['raw_hash']
             logger.info(f"✓ Extracted {content_data['word_count']} words from {url}")
             return content_data
         except Exception as e:
@@ -1,31 +1,70 @@
-from typing import List, Optional, Tuple
-from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+import time
+from urllib.parse import urlparse
 
 from app.core.logger import logger
 from app.core.database import mongodb_db_sync, close_connections
 from app.models.document import Document, DocumentRepository, Section
-from app.services.crawler import DickinsonCrawler
+from app.services.alias_map import AliasMap
+from app.services.content_extractor import ContentExtractor
+from app.services.multi_crawler import MultiHostCrawler
+from app.services.hash_utils import diff_sections
+from app.services.link_graph import LinkGraph
+from app.services.query_cache import QueryCache
 from app.services.url_utils import URLNormalizer
 
 """
 TODO: Unchanged 카테고리 만들기
 """
 
+# URL 목록 크롤링 (crawl_batch)
+MAX_BATCH_URLS = 5000
+BATCH_CHUNK_SIZE = 100        # 기존 문서 조회 / 새 문서 insert_many 단위
+MAX_BATCH_HOST_WORKERS = 8    # 동시에 처리하는 호스트 수 (호스트 안에서는 순차 + rate limit)
+
+# Mark & sweep
+# 전체 크롤링이 기존 active 문서의 이 비율 이상을 확인했을 때만 나머지를 inactive로 (사이트 장애 시 오표시 방지)
+MIN_SEEN_RATIO = 0.5
+SWEEP_GRACE_DAYS = 7          # inactive가 된 뒤 삭제까지 유예 (다시 확인되면 active로 복귀)
+SWEEP_BATCH_SIZE = 500
+
 class CrawlService:
     """크롤링 및 저장 통합 서비스"""
     
     def __init__(self):
         self.repo = DocumentRepository(mongodb_db_sync)
+        self.query_cache = QueryCache()
+        self.alias_map = AliasMap()
+        self._extractor: Optional[ContentExtractor] = None
+    
+    @property
+    def extractor(self) -> ContentExtractor:
+        """단일 / 목록 크롤링용 추출기 (필요할 때 생성)"""
+        if self._extractor is None:
+            self._extractor = ContentExtractor()
+        return self._extractor
     
-    def save_crawl_result(self, crawl_data: dict) -> Optional[Tuple[str, str]]:
+    def save_crawl_result(
+        self,
+        crawl_data: dict,
+        stored: Optional[Dict[str, Document]] = None,
+        new_documents: Optional[List[Document]] = None
+    ) -> Optional[Tuple[str, str, Optional[List[int]]]]:
         """
         크롤링 결과를 MongoDB에 저장
         
         Args:
             crawl_data: 크롤러가 반환한 데이터
+            stored: 미리 조회한 기존 문서 (normalized_url → Document, 없는 URL은 DB 조회)
+            new_documents: 주면 새 문서를 바로 만들지 않고 여기에 모음 (호출자가 create_many)
             
         Returns:
-            문서 ID 또는 None
+            (문서 ID, 'created'|'updated'|'unchanged', 변경된 섹션 인덱스) 또는 None (저장 실패 / 본문 부족)
+            변경된 섹션은 'updated'일 때만 채워지며, None이면 전체 재처리 대상
+            new_documents에 모은 문서의 ID는 아직 없으므로 None
         """
         try:
             # URL 정규화
@@ -34,23 +73,53 @@ class CrawlService:
                 logger.warning(f"Invalid URL: {crawl_data['url']}")
                 return None
             
+            # 본문이 너무 짧은 페이지 (크롤러 / 단일 / 목록 / 파이프라인 저장 공통)
+            if not ContentExtractor.has_enough_content(crawl_data):
+                logger.warning(f"Skipping {normalized_url} (insufficient content)")
+                return None
+            
+            # 영구 별칭 기록 (301/308 / 같은 호스트 canonical, 다음 크롤링부터 큐에 넣기 전에 최종 URL로 변환)
+            if crawl_data.get('permanent_aliases'):
+                self.alias_map.record(crawl_data['permanent_aliases'], normalized_url)
+            
+            # 원본 HTML이 그대로라 저장된 추출 결과를 재사용한 경우
+            if crawl_data.get('raw_unchanged'):
+                logger.info(f"Document unchanged (raw HTML): {normalized_url}")
+                return (crawl_data['document_id'], 'unchanged', [])
+            
             # 기존 문서 확인
-            existing = self.repo.find_by_url(normalized_url)
+            if stored is not None and normalized_url in stored:
+                existing = stored[normalized_url]
+            else:
+                existing = self.repo.find_by_url(normalized_url)
             
             if existing:
                 # 콘텐츠 변경 확인
                 if existing.content_hash != crawl_data['content_hash']:
-                    logger.info(f"Updating existing document: {normalized_url}")
+                    changed_sections = diff_sections(
+                        existing.content,
+                        [section.model_dump() for section in existing.sections],
+                        crawl_data['content'],
+                        crawl_data['sections']
+                    )
+                    logger.info(f"Updating existing document: {normalized_url} (changed sections: {changed_sections})")
                     self.repo.update_content(
                         normalized_url,
                         crawl_data['content'],
                         crawl_data['content_hash'],
-                        crawl_data['sections']
+                        crawl_data['sections'],
+                        raw_hash=crawl_data.get('raw_hash'),
+                        word_count=crawl_data['word_count']
                     )
-                    return (str(existing.id), 'updated')
+                    # 이 페이지를 인용한 캐시 답변만 제거
+                    self.query_cache.invalidate_source(normalized_url)
+                    return (str(existing.id), 'updated', changed_sections)
                 else:
                     logger.info(f"Document unchanged: {normalized_url}")
-                    return (str(existing.id), 'unchanged')
+                    # 마크업만 바뀐 경우 다음 크롤링에서 추출을 생략하도록 원본 해시 갱신
+                    if crawl_data.get('raw_hash') and existing.raw_hash != crawl_data['raw_hash']:
+                        self.repo.set_raw_hash(normalized_url, crawl_data['raw_hash'])
+                    return (str(existing.id), 'unchanged', [])
             
             # 새 문서 생성
             sections = [Section(**s) for s in crawl_data['sections']]
@@ -62,16 +131,25 @@ class CrawlService:
                 category=crawl_data['category'],
                 content=crawl_data['content'],
                 content_hash=crawl_data['content_hash'],
+                raw_hash=crawl_data.get('raw_hash'),
                 sections=sections,
                 word_count=crawl_data['word_count'],
                 priority=crawl_data['priority'],
                 crawled_at=crawl_data['crawled_at'],
-                status="active"
+                status="active",
+                last_seen=datetime.now()
             )
             
+            if new_documents is not None:
+                # 여러 URL이 같은 최종 URL로 redirect된 경우 한 번만
+                if any(pending.normalized_url == normalized_url for pending in new_documents):
+                    return (None, 'unchanged', [])
+                new_documents.append(document)
+                return (None, 'created', None)
+            
             doc_id = self.repo.create(document)
             logger.info(f"✓ Saved new document: {normalized_url} (ID: {doc_id})")
-            return (doc_id, 'created')
+            return (doc_id, 'created', None)
             
         except Exception as e:
             logger.error(f"Failed to save document: {e}")
@@ -82,21 +160,33 @@ class CrawlService:
         seed_url: str = "https://www.dickinson.edu",
         max_pages: int = 100,
         rate_limit_delay: float = 1.0,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        seed_urls: Optional[List[str]] = None,
+        mark_unseen: bool = False
     ) -> dict:
         """
         크롤링 실행 및 결과 저장
         
+        Args:
+            seed_urls: 여러 시드 (주면 seed_url 대신 사용, 시드 호스트별로 병렬 크롤링)
+            mark_unseen: 프런티어를 다 비운 전체 크롤링이면 확인되지 않은 문서를 inactive로
+        
         Returns:
             통계 정보
         """
-        logger.info(f"Starting crawl and save: {seed_url}")
+        seeds = list(seed_urls or [seed_url])
+        started_at = datetime.now()
+        logger.info(f"Starting crawl and save: {seeds}")
         
-        # 크롤링 실행
-        crawler = DickinsonCrawler(
-            seed_url=seed_url,
+        # 크롤링 실행 (호스트별 병렬, outlink은 링크 그래프에 기록)
+        link_graph = LinkGraph.load()
+        crawler = MultiHostCrawler(
+            seed_urls=seeds,
             max_pages=max_pages,
-            rate_limit_delay=rate_limit_delay
+            rate_limit_delay=rate_limit_delay,
+            link_graph=link_graph,
+            alias_map=self.alias_map,
+            repo=self.repo
         )
         results = crawler.crawl()
         
@@ -105,6 +195,10 @@ class CrawlService:
         unchanged_count = 0
         updated_count = 0
         failed_count = 0
+        changed_urls = []
+        changed_sections: Dict[str, List[int]] = {}
+        seen_urls: List[str] = []
+        save_failures: Dict[str, str] = {}
         
         total = len(results)
     
@@ -115,7 +209,8 @@ class CrawlService:
             
             save_result = self.save_crawl_result(result)
             if save_result:
-                _, status = save_result
+                _, status, sections = save_result
+                seen_urls.append(URLNormalizer.normalize(result['url']))
                 
                 if status == 'created':
                     created_count += 1
@@ -123,8 +218,47 @@ class CrawlService:
                     updated_count += 1
                 elif status == 'unchanged':
                     unchanged_count += 1
+                
+                # 재색인 대상 (청킹/임베딩/Weaviate)
+                if status in ('created', 'updated'):
+                    url = URLNormalizer.normalize(result['url'])
+                    changed_urls.append(url)
+                    # 섹션 diff가 있으면 해당 부분만 재처리
+                    if sections is not None:
+                        changed_sections[url] = sections
             else:
                 failed_count += 1
+                save_failures[URLNormalizer.normalize(result['url']) or result['url']] = "save_failed"
+        
+        # 가져오기 / 추출 / 저장 실패는 연속 실패 횟수로 처리 (MAX_ERROR_COUNT번이면 inactive)
+        failures = crawler.failures
+        failed_count += len(failures)
+        for url, reason in {**failures, **save_failures}.items():
+            try:
+                self.repo.record_failure(url, reason)
+            except Exception as e:
+                logger.error(f"Failed to record crawl failure for {url}: {e}")
+        
+        # Mark: 확인된 문서 last_seen 갱신, 전체 크롤링이면 한 번도 요청하지 않은 문서만 inactive
+        marked_inactive = 0
+        try:
+            self.repo.mark_seen(seen_urls, seen_at=started_at)
+            if mark_unseen:
+                attempted = sorted(set(crawler.fetched) - set(seen_urls))
+                marked_inactive = self._mark_unseen(started_at, list(crawler.crawlers), len(results), max_pages, attempted)
+        except Exception as e:
+            logger.error(f"Failed to mark crawled documents: {e}")
+        
+        # 링크 그래프 저장 + 바뀐 허브가 링크하는 (이번에 방문하지 않은) 페이지
+        recrawl_targets = []
+        try:
+            link_graph.save()
+            recrawl_targets = link_graph.recrawl_targets(
+                changed_urls,
+                exclude={URLNormalizer.normalize(url) for url in crawler.visited}
+            )
+        except Exception as e:
+            logger.error(f"Failed to update link graph: {e}")
         
         # 통계
         stats = {
@@ -133,12 +267,262 @@ class CrawlService:
             "unchanged": unchanged_count,
             "updated": updated_count,
             "failed": failed_count,
+            "marked_inactive": marked_inactive,
+            "changed_urls": changed_urls,
+            "changed_sections": changed_sections,
+            "recrawl_targets": recrawl_targets,
+            "link_graph": link_graph.get_statistics(),
             "crawler_stats": crawler.get_statistics()
         }
         
         logger.info(f"Crawl and save completed: {stats}")
         return stats
     
+    def crawl_single(self, url: str) -> dict:
+        """
+        단일 페이지 크롤링 및 저장 (링크 추출 / rate limit 대기 없음)
+        
+        크롤러와 프런티어 없이 fetch → 추출 → 저장만 한다.
+        원본 HTML이 같으면 저장된 추출 결과를 재사용한다.
+        
+        Returns:
+            {'status': 'created'|'updated'|'unchanged'|'failed', 'url', 'changed_urls',
+             'changed_sections', 'recrawl_targets'}
+        """
+        target = self.alias_map.resolve(URLNormalizer.normalize(url) or url)
+        stats = {
+            "status": "failed",
+            "url": target,
+            "changed_urls": [],
+            "changed_sections": {},
+            "recrawl_targets": []
+        }
+        
+        data = self.extractor.crawl_page(target, stored=self.repo.find_by_url(target))
+        save_result = self.save_crawl_result(data) if data else None
+        if not save_result:
+            self.repo.record_failure(target, "crawl_failed")
+            return stats
+        
+        _, status, sections = save_result
+        stats["status"] = status
+        self.repo.mark_seen([URLNormalizer.normalize(data['url'])])
+        if status in ('created', 'updated'):
+            normalized_url = URLNormalizer.normalize(data['url'])
+            stats["url"] = normalized_url
+            stats["changed_urls"] = [normalized_url]
+            if sections is not None:
+                stats["changed_sections"] = {normalized_url: sections}
+            
+            # 바뀐 페이지가 허브면 링크하는 페이지 재크롤링 (그래프는 바뀐 경우에만 로드)
+            try:
+                stats["recrawl_targets"] = LinkGraph.load().recrawl_targets(
+                    [normalized_url], exclude={normalized_url}
+                )
+            except Exception as e:
+                logger.error(f"Failed to read link graph: {e}")
+        
+        logger.info(f"Single page crawl: {stats['url']} ({status})")
+        return stats
+    
+    def _mark_unseen(
+        self,
+        started_at: datetime,
+        hosts: List[str],
+        crawled: int,
+        max_pages: int,
+        attempted: Optional[List[str]] = None
+    ) -> int:
+        """
+        전체 크롤링에서 확인되지 않은 문서 inactive (예산을 다 쓴 크롤링 / 확인 수가 너무 적으면 건너뜀)
+        
+        attempted: 요청했지만 저장하지 못한 URL (일시적 실패 / 내용 부족 / 별칭) - 표시하지 않음
+        """
+        if crawled >= max_pages:
+            logger.info(f"Skipping unseen marking: crawl stopped at max_pages={max_pages}")
+            return 0
+        
+        active = self.repo.count(status="active")
+        if active and crawled < active * MIN_SEEN_RATIO:
+            logger.warning(f"Skipping unseen marking: only {crawled} pages crawled for {active} active documents")
+            return 0
+        
+        marked = self.repo.mark_unseen(started_at, hosts, exclude=attempted)
+        logger.info(f"Marked {marked} documents inactive (not seen in full crawl)")
+        return marked
+    
+    def sweep_inactive(self, grace_days: int = SWEEP_GRACE_DAYS, batch_size: int = SWEEP_BATCH_SIZE) -> dict:
+        """
+        Sweep: 유예 기간이 지난 inactive 문서의 벡터 / 문서 / 캐시 답변 일괄 삭제 후 통계 재집계
+        
+        벡터를 먼저 지우고 문서를 지우므로, 중간에 실패해도 남은 문서는 다음 sweep에서 다시 처리된다.
+        """
+        from app.services.vector_store import VectorStore
+        
+        store = VectorStore()
+        cutoff = datetime.now() - timedelta(days=grace_days)
+        counts = {"documents": 0, "vectors": 0}
+        
+        while True:
+            urls = self.repo.find_sweepable(cutoff, limit=batch_size)
+            if not urls:
+                break
+            counts["vectors"] += store.delete_vectors_by_sources(urls)
+            counts["documents"] += self.repo.delete_many_by_urls(urls)
+            for url in urls:
+                self.query_cache.invalidate_source(url)
+            if len(urls) < batch_size:
+                break
+        
+        stats = self.repo.reconcile_statistics() if counts["documents"] else self.repo.get_statistics()
+        logger.info(f"Sweep completed: {counts['documents']} documents, {counts['vectors']} vectors deleted")
+        return {**counts, "total_documents": stats["total_documents"]}
+    
+    @staticmethod
+    def group_batch_urls(urls: List[str]) -> Tuple[Dict[str, List[str]], int]:
+        """
+        URL 목록 정규화 + 중복 제거 + 호스트별 분류 (입력 순서 유지)
+        
+        Returns:
+            (호스트 → 정규화 URL 목록, 유효하지 않은 URL 수)
+        """
+        groups: Dict[str, List[str]] = {}
+        seen = set()
+        invalid = 0
+        for url in urls:
+            normalized = URLNormalizer.normalize(url)
+            if not normalized:
+                invalid += 1
+                continue
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            groups.setdefault(urlparse(normalized).netloc, []).append(normalized)
+        return groups, invalid
+    
+    def crawl_batch(
+        self,
+        urls: List[str],
+        rate_limit_delay: float = 1.0,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> dict:
+        """
+        URL 목록 크롤링 및 저장 (링크 추출 없음)
+        
+        호스트별로 묶어 호스트마다 스레드 하나가 순차로 처리하고 (호스트별 rate limit),
+        HTTP 연결은 프로세스 공유 풀을 쓴다. BATCH_CHUNK_SIZE개씩 기존 문서를 한 번에 조회하고
+        새 문서는 insert_many로 모아 쓴다.
+        
+        Args:
+            urls: 크롤링할 URL (정규화 / 중복 제거는 여기서 다시 함)
+            progress_callback: (처리한 수, 전체 수)
+        """
+        groups, invalid = self.group_batch_urls(urls)
+        total = sum(len(host_urls) for host_urls in groups.values())
+        logger.info(f"Batch crawl starting: {total} URLs on {len(groups)} hosts")
+        
+        lock = threading.Lock()
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+        per_host: Dict[str, Dict[str, int]] = {}
+        changed_urls: List[str] = []
+        changed_sections: Dict[str, List[int]] = {}
+        done = [0]
+        
+        def record(host: str, status: str, data: Optional[dict], sections):
+            with lock:
+                counts[status] += 1
+                per_host[host][status] += 1
+                if status in ('created', 'updated'):
+                    url = URLNormalizer.normalize(data['url'])
+                    changed_urls.append(url)
+                    if sections is not None:
+                        changed_sections[url] = sections
+                done[0] += 1
+                current = done[0]
+            if progress_callback:
+                progress_callback(current, total)
+        
+        def crawl_host(host: str, host_urls: List[str]):
+            # 추출기는 스레드마다 (HTTP 연결 풀은 공유)
+            extractor = ContentExtractor()
+            per_host[host] = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+            last_fetch = 0.0
+            
+            for start in range(0, len(host_urls), BATCH_CHUNK_SIZE):
+                chunk = self.alias_map.resolve_many(host_urls[start:start + BATCH_CHUNK_SIZE])
+                stored = self.repo.find_by_urls(list(set(chunk)))
+                new_documents: List[Document] = []
+                seen: List[str] = []
+                
+                try:
+                    for url in chunk:
+                        wait = rate_limit_delay - (time.monotonic() - last_fetch)
+                        if wait > 0:
+                            time.sleep(wait)
+                        last_fetch = time.monotonic()
+                        
+                        data = extractor.crawl_page(url, stored=stored.get(url))
+                        save_result = self.save_crawl_result(data, stored=stored, new_documents=new_documents) if data else None
+                        if not save_result:
+                            self.repo.record_failure(url, "crawl_failed")
+                            record(host, 'failed', None, None)
+                            continue
+                        _, status, sections = save_result
+                        seen.append(URLNormalizer.normalize(data['url']))
+                        record(host, status, data, sections)
+                finally:
+                    # 중간에 실패해도 이미 처리한 새 문서는 저장
+                    written = self.repo.create_many(new_documents)
+                    if written['failed']:
+                        logger.error(f"Batch insert failed for {len(written['failed'])} URLs on {host}")
+                    # 'created'로 센 문서를 쓰기 결과로 보정 (다른 경로가 먼저 저장 → unchanged, 쓰기 실패 → failed)
+                    buffered = {document.normalized_url for document in new_documents}
+                    existed = len(buffered - set(written['created']) - set(written['failed']))
+                    with lock:
+                        for status, n in (('unchanged', existed), ('failed', len(written['failed']))):
+                            counts['created'] -= n
+                            counts[status] += n
+                            per_host[host]['created'] -= n
+                            per_host[host][status] += n
+                    self.repo.mark_seen(seen)
+        
+        start = time.time()
+        if groups:
+            with ThreadPoolExecutor(
+                max_workers=min(len(groups), MAX_BATCH_HOST_WORKERS),
+                thread_name_prefix="batch-host"
+            ) as pool:
+                futures = {host: pool.submit(crawl_host, host, host_urls) for host, host_urls in groups.items()}
+                for host, future in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Batch crawl failed for host {host}: {e}", exc_info=True)
+        
+        # 바뀐 허브가 링크하는 (이번 목록에 없는) 페이지
+        recrawl_targets = []
+        if changed_urls:
+            try:
+                recrawl_targets = LinkGraph.load().recrawl_targets(
+                    changed_urls,
+                    exclude={url for host_urls in groups.values() for url in host_urls}
+                )
+            except Exception as e:
+                logger.error(f"Failed to read link graph: {e}")
+        
+        stats = {
+            "total": total,
+            "invalid": invalid,
+            **counts,
+            "hosts": per_host,
+            "elapsed_s": round(time.time() - start, 2),
+            "changed_urls": changed_urls,
+            "changed_sections": changed_sections,
+            "recrawl_targets": recrawl_targets
+        }
+        logger.info(f"Batch crawl completed: {total} URLs in {stats['elapsed_s']}s ({counts})")
+        return stats
+    
     def get_statistics(self) -> dict:
         """저장된 문서 통계"""
         # print(self.repo.get_all_urls())
@@ -1,12 +1,16 @@
-from typing import Set, List, Optional
-from collections import deque
+from typing import Dict, Set, List, Optional
 from urllib.parse import urljoin
+import queue
+import threading
 import time
 from bs4 import BeautifulSoup
 
 from app.core.logger import logger
 from app.services.url_utils import URLNormalizer
 from app.services.content_extractor import ContentExtractor
+from app.services.alias_map import AliasMap
+from app.services.frontier import CrawlFrontier
+from app.services.link_graph import LinkGraph
 
 
 class DickinsonCrawler:
@@ -16,32 +20,57 @@ class DickinsonCrawler:
         self,
         seed_url: str = "https://www.dickinson.edu",
         max_pages: int = 100,
-        rate_limit_delay: float = 1.0
+        rate_limit_delay: float = 1.0,
+        link_graph: Optional[LinkGraph] = None,
+        alias_map: Optional[AliasMap] = None,
+        repo=None,
+        visited: Optional[Set[str]] = None,
+        fetched: Optional[Set[str]] = None,
+        coordinator=None
     ):
         """
         Args:
             seed_url: 시작 URL
             max_pages: 최대 크롤링 페이지 수
             rate_limit_delay: 요청 간 대기 시간 (초)
+            link_graph: outlink을 기록할 링크 그래프 (선택)
+            alias_map: 큐에 넣기 전 조회할 URL 별칭 맵 (기본: Redis alias:map)
+            repo: DocumentRepository (주면 원본 HTML이 같은 페이지는 저장된 추출 결과 재사용)
+            visited / fetched: 다른 호스트 크롤러와 공유하는 중복 제거 집합 (멀티 호스트 크롤링)
+            coordinator: CrawlCoordinator (다른 호스트 링크 전달 / 종료 판단)
         """
         self.seed_url = seed_url
         self.max_pages = max_pages
         self.rate_limit_delay = rate_limit_delay
+        self.link_graph = link_graph
+        self.alias_map = alias_map or AliasMap()
+        self.repo = repo
         
         self.extractor = ContentExtractor()
-        self.visited: Set[str] = set()
-        self.queue: deque = deque([seed_url])
+        self.visited: Set[str] = visited if visited is not None else set()
+        self.fetched: Set[str] = fetched if fetched is not None else set()  # 요청한 URL + 발견한 별칭 (크롤링당 1회만 가져오기)
+        self.coordinator = coordinator
+        self.inbox: queue.SimpleQueue = queue.SimpleQueue()  # 다른 호스트 크롤러가 보낸 (URL, 깊이)
+        self._graph_lock = coordinator.graph_lock if coordinator is not None else threading.Lock()
+        # visited / fetched 확인 후 추가를 원자적으로 (공유 집합이면 다른 호스트 크롤러와 같은 잠금)
+        self._seen_lock = coordinator.seen_lock if coordinator is not None else threading.Lock()
+        # 우선순위 프런티어 (URL 가치 + in-link - 깊이, 카테고리별 예산 상한)
+        self.queue = CrawlFrontier(max_pages, self._classify, link_graph=link_graph)
         self.results: List[dict] = []
+        self.failures: Dict[str, str] = {}  # 가져오기 / 추출에 실패한 URL → 사유 (저장 후 record_failure)
+        self.http_stats: dict = {}
+        self.raw_unchanged = 0  # 원본 HTML이 같아 추출을 생략한 페이지 수
         
         logger.info(f"Crawler initialized: max_pages={max_pages}, delay={rate_limit_delay}s")
     
-    def extract_links(self, html: str, base_url: str) -> List[str]:
+    def extract_links(self, html: str, base_url: str, include_visited: bool = False) -> List[str]:
         """
         HTML에서 내부 링크 추출
         
         Args:
             html: HTML 문자열
             base_url: 기준 URL
+            include_visited: 방문한 URL도 포함 (링크 그래프용)
             
         Returns:
             정규화된 URL 리스트
@@ -58,70 +87,209 @@ class DickinsonCrawler:
             # 정규화
             normalized = URLNormalizer.normalize(absolute_url)
             
-            if normalized and normalized not in self.visited:
+            if normalized and (include_visited or normalized not in self.visited):
                 links.append(normalized)
         
         return links
     
-    def crawl(self) -> List[dict]:
-        """
-        BFS 크롤링 실행
+    def _classify(self, url: str) -> str:
+        """URL → 카테고리 - 페이지를 가져오기 전 URL만으로 판단"""
+        return self.extractor._guess_category(url)
+    
+    def _reuse_extraction(self, url: str, fetched: dict) -> Optional[dict]:
+        """요청 URL / redirect 도착지로 저장된 문서 중 원본 HTML 해시가 같은 문서의 추출 결과"""
+        if self.repo is None:
+            return None
         
-        Returns:
-            크롤링된 페이지 데이터 리스트
-        """
-        logger.info(f"Starting crawl from {self.seed_url}")
-        start_time = time.time()
+        candidates = list(dict.fromkeys(
+            u for u in (url, URLNormalizer.normalize(fetched['final_url'])) if u
+        ))
+        try:
+            document = self.repo.find_by_raw_hash(candidates, fetched['raw_hash'])
+        except Exception as e:
+            logger.warning(f"Raw hash lookup failed for {url}: {e}")
+            return None
         
-        while self.queue and len(self.visited) < self.max_pages:
-            url = self.queue.popleft()
-            
-            # 이미 방문한 URL 스킵
-            if url in self.visited:
+        content_data = self.extractor.reuse_extraction(fetched, document)
+        if content_data:
+            self.raw_unchanged += 1
+        return content_data
+    
+    def _drain_inbox(self):
+        """다른 호스트 크롤러가 보낸 링크를 프런티어로"""
+        while True:
+            try:
+                url, depth = self.inbox.get_nowait()
+            except queue.Empty:
+                return
+            if url not in self.visited and url not in self.fetched:
+                self.queue.push(url, depth=depth, linked=True)
+    
+    def _crawl_loop(self):
+        while len(self.visited) < self.max_pages:
+            self._drain_inbox()
+            if not self.queue:
+                # 다른 호스트 크롤러가 링크를 보낼 수 있으므로 모두 끝날 때까지 대기
+                if self.coordinator is None or not self.coordinator.wait_for_work(self):
+                    break
                 continue
             
+            url = self.queue.pop()
+            depth = self.queue.depth(url)
+            
+            # 이미 방문했거나 가져온 적 있는 URL 스킵 (별칭 포함)
+            with self._seen_lock:
+                if url in self.visited or url in self.fetched:
+                    continue
+                self.fetched.add(url)
+            
             # 크롤링
             try:
-                # HTML 가져오기
-                html = self.extractor.fetch_html(url)
-                if not html:
-                    logger.warning(f"Skipping {url} (fetch failed)")
-                    continue
+                adapter = self.extractor.get_adapter(url)
+                if adapter is not None:
+                    # 동적 사이트: JSON 어댑터 (렌더링 없음, 하위 페이지 링크도 어댑터가 제공)
+                    content_data = self.extractor.crawl_structured(url, adapter)
+                    if not content_data:
+                        logger.warning(f"Skipping {url} ({adapter.name} adapter failed)")
+                        self.failures[url] = "adapter_failed"
+                        continue
+                    final_url = url
+                    page_links = content_data.pop('links', [])
+                    aliases = []
+                    permanent_aliases = []
+                else:
+                    # HTML 가져오기 (redirect 체인 포함)
+                    fetched = self.extractor.fetch(url)
+                    if not fetched:
+                        logger.warning(f"Skipping {url} (fetch failed)")
+                        self.failures[url] = "fetch_failed"
+                        continue
+                    
+                    # 원본 HTML이 저장된 문서와 같으면 추출 생략, 아니면 콘텐츠 추출
+                    content_data = self._reuse_extraction(url, fetched)
+                    if content_data is None:
+                        content_data = self.extractor.extract_content(fetched['html'], fetched['final_url'])
+                        if content_data:
+                            content_data['raw_hash'] = fetched['raw_hash']
+                    
+                    if not content_data:
+                        logger.warning(f"Skipping {url} (extraction failed)")
+                        self.failures[url] = "extraction_failed"
+                        continue
+                    
+                    # 최종 URL (redirect 도착지 / canonical) 기준으로 저장, 별칭은 다시 가져오지 않음
+                    # 별칭은 이번 크롤링 동안 모두 사용, 영구 저장은 301/308 / 같은 호스트 canonical만
+                    final_url, aliases = self.extractor.resolve_final_url(fetched, content_data)
+                    permanent_aliases = self.extractor.permanent_aliases(fetched, final_url)
+                    self.alias_map.remember(aliases, final_url)
+                    with self._seen_lock:
+                        self.fetched.update(aliases)
+                    if final_url in self.visited:
+                        logger.info(f"Skipping {url} (alias of {final_url})")
+                        continue
+                    
+                    # 바뀌지 않은 페이지는 링크 그래프에 기록된 outlink 사용 (HTML 파싱 생략)
+                    if content_data.get('raw_unchanged') and self.link_graph is not None and self.link_graph.has_outlinks(final_url):
+                        page_links = self.link_graph.outlinks(final_url)
+                    else:
+                        page_links = self.extract_links(
+                            fetched['html'],
+                            fetched['final_url'],
+                            include_visited=self.link_graph is not None
+                        )
                 
-                # 콘텐츠 추출
-                content_data = self.extractor.extract_content(html, url)
-                if not content_data or content_data['word_count'] < 50:
+                if not self.extractor.has_enough_content(content_data):
                     logger.warning(f"Skipping {url} (insufficient content)")
                     continue
                 
-                # 결과 저장
+                content_data['url'] = final_url
+                content_data['aliases'] = aliases
+                content_data['permanent_aliases'] = permanent_aliases
+                
+                # 결과 저장 (다른 별칭으로 같은 최종 URL을 먼저 저장한 크롤러가 있으면 스킵)
+                with self._seen_lock:
+                    if final_url in self.visited:
+                        logger.info(f"Skipping {url} (alias of {final_url})")
+                        continue
+                    self.visited.add(final_url)
                 self.results.append(content_data)
-                self.visited.add(url)
+                self.queue.commit(url)
                 
                 # 진행 상황 로깅
                 progress = len(self.visited)
-                logger.info(f"[{progress}/{self.max_pages}] ✓ {url}")
+                logger.info(
+                    f"[{progress}/{self.max_pages}] ✓ {final_url}",
+                    extra={'event': 'page_crawled', 'url': final_url, 'words': content_data['word_count']}
+                )
                 
-                # 내부 링크 추출 및 큐에 추가
-                links = self.extract_links(html, url)
+                # 내부 링크 추출 (알려진 별칭은 최종 URL로 변환) 및 큐에 추가
+                links = list(dict.fromkeys(self.alias_map.resolve_many(page_links)))
+                if self.link_graph is not None:
+                    with self._graph_lock:
+                        self.link_graph.set_outlinks(final_url, links)
+                links = [link for link in links if link not in self.visited and link not in self.fetched]
+                # 크롤러가 따로 있는 호스트의 링크는 그 크롤러로 전달
+                if self.coordinator is not None:
+                    links = [link for link in links if not self.coordinator.route(link, depth + 1, self)]
+                new_links = sum(1 for link in links if link not in self.queue)
                 for link in links:
-                    if link not in self.visited:
-                        self.queue.append(link)
+                    self.queue.push(link, depth=depth + 1, linked=True)
                 
-                logger.info(f"  → Found {len(links)} new links, queue size: {len(self.queue)}")
+                logger.info(f"  → Found {new_links} new links, queue size: {len(self.queue)}")
                 
                 # Rate limiting
                 time.sleep(self.rate_limit_delay)
                 
             except Exception as e:
                 logger.error(f"Error crawling {url}: {e}")
+                self.failures[url] = f"error:{type(e).__name__}"
                 continue
+    
+    def crawl(self) -> List[dict]:
+        """
+        크롤링 실행 (우선순위 프런티어 순)
+        
+        Returns:
+            크롤링된 페이지 데이터 리스트
+        """
+        logger.info(f"Starting crawl from {self.seed_url}")
+        start_time = time.time()
+        http_before = self.extractor.http.get_stats()
+        
+        # 시드도 알려진 별칭이면 최종 URL로
+        seed = URLNormalizer.normalize(self.seed_url) or self.seed_url
+        self.queue.push(self.alias_map.resolve(seed), depth=0)
+        
+        try:
+            self._crawl_loop()
+        finally:
+            if self.coordinator is not None:
+                self.coordinator.finished(self)
         
         elapsed = time.time() - start_time
+        self.http_stats = self.extractor.http.get_stats(since=http_before)
         logger.info(f"\nCrawl completed!")
         logger.info(f"  Pages crawled: {len(self.results)}")
         logger.info(f"  Time elapsed: {elapsed:.2f}s")
-        logger.info(f"  Avg time per page: {elapsed/len(self.results):.2f}s")
+        logger.info(f"  Avg time per page: {elapsed/max(len(self.results), 1):.2f}s")
+        logger.info(
+            f"  HTTP: {self.http_stats['requests']} requests, "
+            f"{self.http_stats['connections_opened']} connections "
+            f"({self.http_stats['connections_per_1000_pages']}/1000 pages, http2 {self.http_stats['http2_ratio']:.0%})"
+        )
+        extraction = self.extractor.get_extraction_stats()
+        if extraction['pages']:
+            logger.info(
+                "  Extraction tiers: " + ", ".join(
+                    f"{tier} {stats['hit_rate']:.0%} ({stats['avg_ms']}ms)"
+                    for tier, stats in extraction['tiers'].items()
+                )
+            )
+        if self.extractor.boilerplate_stats['blocks']:
+            logger.info(
+                f"  Boilerplate: {self.extractor.boilerplate_stats['blocks']} blocks / "
+                f"{self.extractor.boilerplate_stats['chars']} chars pruned"
+            )
         
         return self.results
     
@@ -140,7 +308,12 @@ class DickinsonCrawler:
             'total_pages': len(self.results),
             'total_words': total_words,
             'avg_words_per_page': total_words // len(self.results),
-            'categories': categories
+            'categories': categories,
+            'http': self.http_stats,
+            'boilerplate': dict(self.extractor.boilerplate_stats),
+            'raw_unchanged': self.raw_unchanged,
+            'extraction': self.extractor.get_extraction_stats(),
+            'frontier': self.queue.get_statistics()
         }
 
 
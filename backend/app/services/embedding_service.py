@@ -0,0 +1,358 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from functools import lru_cache
+import re
+import time
+
+import numpy as np
+
+from app.core.logger import logger
+from app.services.chunker import Chunk
+from app.services.hash_utils import compute_content_hash
+
+
+# 임베딩 기본값 (ai_context.md 4) Embedding)
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# 배치 구성 (길이 정렬 후 토큰 예산 단위로 묶음)
+MAX_BATCH_SIZE = 64
+BATCH_TOKEN_BUDGET = 16384  # 배치 내 최대 길이 × 배치 크기 상한
+
+# 긴 입력 윈도우 분할 (모델 max_seq_length를 넘는 부분이 잘리지 않도록)
+# 청크(700-1000 토큰)는 모델 입력 한도(MiniLM 256)보다 길어서, 윈도우별로 임베딩한 뒤 토큰 수 가중 평균
+DEFAULT_MAX_SEQ_LENGTH = 256
+SPECIAL_TOKENS = 2            # [CLS] / [SEP]
+WINDOW_OVERLAP = 0.1
+WORDPIECES_PER_WORD = 1.3     # 토크나이저가 없을 때 단어 수 → 토큰 수 근사
+
+# 임베딩 캐시 (Redis)
+CACHE_PREFIX = "emb"
+POOLING_TAG = "mean"  # 캐시 키의 모델 ID에 붙임 (잘린 입력으로 만든 이전 벡터와 구분)
+CACHE_TTL = 60 * 60 * 24 * 90  # 90일
+CACHE_IO_BATCH = 500
+
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def clean_text(text: str) -> str:
+    """임베딩 입력 정리 (제어 문자 제거, 공백 정규화)"""
+    text = _CONTROL_CHARS.sub(' ', text or '')
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def embedding_cache_key(text: str, model_id: str) -> str:
+    """캐시 키: 정리된 텍스트 해시 + 모델 ID"""
+    return f"{CACHE_PREFIX}:{model_id}:{compute_content_hash(text)}"
+
+
+@lru_cache(maxsize=2)
+def _load_model(model_name: str):
+    """SentenceTransformer 모델 로드 (프로세스당 1회, CPU)"""
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Loading embedding model: {model_name}")
+    return SentenceTransformer(model_name, device="cpu")
+
+
+class EmbeddingService:
+    """
+    배치 CPU 임베딩 서비스
+
+    - 길이순 정렬 후 토큰 예산 단위로 동적 배치 → 패딩 최소화
+    - 텍스트 해시 + 모델 ID 키로 Redis에 벡터 캐시 → 텍스트가 같으면 재계산 없음
+    - 모델 입력 한도보다 긴 텍스트는 겹치는 윈도우로 나눠 임베딩 후 평균 (뒷부분도 벡터에 반영)
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        redis=None,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        batch_token_budget: int = BATCH_TOKEN_BUDGET,
+        cache_ttl: int = CACHE_TTL
+    ):
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.batch_token_budget = batch_token_budget
+        self.cache_ttl = cache_ttl
+
+        if redis is None:
+            from app.core.database import redis_client_binary
+            redis = redis_client_binary
+        self.redis = redis
+
+        self._model = None
+        self.last_stats: Dict = {}
+        # 캐시 키용 모델 ID (윈도우 평균 벡터)
+        self.cache_model_id = f"{model_name}#{POOLING_TAG}"
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = _load_model(self.model_name)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    @property
+    def max_tokens(self) -> int:
+        """윈도우 하나의 본문 토큰 수 (모델 max_seq_length - 특수 토큰)"""
+        max_seq_length = getattr(self.model, "max_seq_length", None) or DEFAULT_MAX_SEQ_LENGTH
+        return max(max_seq_length - SPECIAL_TOKENS, 1)
+
+    # ==================== 윈도우 ====================
+
+    def _split_windows(self, text: str, length: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        모델 입력 한도에 맞게 텍스트를 겹치는 윈도우로 분할
+
+        Args:
+            text: 입력 텍스트
+            length: 알고 있는 토큰 수 (한도 안이면 토크나이징 생략)
+
+        Returns:
+            [(윈도우 텍스트, 토큰 수)] - 한도 안이면 원문 하나
+        """
+        limit = self.max_tokens
+        if length is not None and length <= limit:
+            return [(text, length)]
+        step = max(limit - int(limit * WINDOW_OVERLAP), 1)
+        tokenizer = getattr(self.model, "tokenizer", None)
+
+        if tokenizer is not None:
+            ids = tokenizer.encode(text, add_special_tokens=False)
+            if len(ids) <= limit:
+                return [(text, len(ids))]
+            windows = []
+            for start in range(0, len(ids), step):
+                piece = ids[start:start + limit]
+                windows.append((tokenizer.decode(piece), len(piece)))
+                if start + limit >= len(ids):
+                    break
+            return windows
+
+        # 토크나이저가 없는 모델: 단어 단위 근사
+        words = text.split()
+        word_limit = max(int(limit / WORDPIECES_PER_WORD), 1)
+        word_step = max(word_limit - int(word_limit * WINDOW_OVERLAP), 1)
+        if len(words) <= word_limit:
+            return [(text, int(len(words) * WORDPIECES_PER_WORD))]
+        windows = []
+        for start in range(0, len(words), word_step):
+            piece = words[start:start + word_limit]
+            windows.append((" ".join(piece), int(len(piece) * WORDPIECES_PER_WORD)))
+            if start + word_limit >= len(words):
+                break
+        return windows
+
+    # ==================== 캐시 ====================
+
+    def _cache_get(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """MGET으로 캐시 조회 (CACHE_IO_BATCH 단위)"""
+        vectors: List[Optional[np.ndarray]] = []
+        for i in range(0, len(keys), CACHE_IO_BATCH):
+            try:
+                values = self.redis.mget(keys[i:i + CACHE_IO_BATCH])
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                values = [None] * len(keys[i:i + CACHE_IO_BATCH])
+            for value in values:
+                vectors.append(np.frombuffer(value, dtype=np.float32) if value else None)
+        return vectors
+
+    def _cache_set(self, items: List[Tuple[str, np.ndarray]]):
+        """파이프라인으로 캐시 저장"""
+        for i in range(0, len(items), CACHE_IO_BATCH):
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, vector in items[i:i + CACHE_IO_BATCH]:
+                    pipe.set(key, vector.astype(np.float32).tobytes(), ex=self.cache_ttl)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    # ==================== 배치 구성 ====================
+
+    def _make_batches(self, lengths: Sequence[int]) -> List[List[int]]:
+        """
+        길이 기반 동적 배치
+
+        길이 오름차순으로 정렬한 뒤, (배치 내 최대 길이 × 배치 크기)가
+        토큰 예산을 넘지 않도록 묶는다. 비슷한 길이끼리 묶이므로 패딩이 적다.
+
+        Returns:
+            입력 인덱스 배치 리스트
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        batches: List[List[int]] = []
+        current: List[int] = []
+
+        for i in order:
+            longest = max(lengths[i], 1)
+            if current and (
+                len(current) >= self.max_batch_size
+                or longest * (len(current) + 1) > self.batch_token_budget
+            ):
+                batches.append(current)
+                current = []
+            current.append(i)
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    # ==================== 임베딩 ====================
+
+    def embed_texts(self, texts: Sequence[str], lengths: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        텍스트 리스트 임베딩 (캐시 우선)
+
+        Args:
+            texts: 입력 텍스트
+            lengths: 텍스트별 토큰 수 (없으면 토크나이저로 계산, 모델 한도를 넘으면 윈도우 분할)
+
+        Returns:
+            (n, dim) float32 정규화 벡터
+        """
+        start = time.perf_counter()
+        cleaned = [clean_text(t) for t in texts]
+
+        if lengths is None:
+            lengths = [None] * len(cleaned)
+
+        # 실행 내 중복 텍스트는 한 번만 계산
+        unique_index: Dict[str, int] = {}
+        unique_texts: List[str] = []
+        unique_lengths: List[int] = []
+        positions: List[int] = []
+        for text, length in zip(cleaned, lengths):
+            idx = unique_index.get(text)
+            if idx is None:
+                idx = unique_index[text] = len(unique_texts)
+                unique_texts.append(text)
+                unique_lengths.append(length)
+            positions.append(idx)
+
+        keys = [embedding_cache_key(t, self.cache_model_id) for t in unique_texts]
+        cached = self._cache_get(keys)
+
+        miss_indices = [i for i, v in enumerate(cached) if v is None]
+        vectors: List[Optional[np.ndarray]] = list(cached)
+
+        # 캐시에 없는 텍스트만 윈도우로 나눠 임베딩 (길이는 모델이 실제로 보는 윈도우 기준)
+        window_texts: List[str] = []
+        window_lengths: List[int] = []
+        window_owner: List[int] = []
+        for i in miss_indices:
+            for window, length in self._split_windows(unique_texts[i], unique_lengths[i]):
+                window_texts.append(window)
+                window_lengths.append(max(length, 1))
+                window_owner.append(i)
+
+        padded_tokens = 0
+        real_tokens = 0
+        batches = self._make_batches(window_lengths)
+        pooled: Dict[int, np.ndarray] = {}
+        weights: Dict[int, float] = {}
+
+        for batch in batches:
+            batch_lengths = [window_lengths[w] for w in batch]
+            padded_tokens += max(batch_lengths) * len(batch_lengths)
+            real_tokens += sum(batch_lengths)
+
+            encoded = self.model.encode(
+                [window_texts[w] for w in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype(np.float32)
+
+            # 윈도우 벡터를 토큰 수로 가중 합산
+            for w, vector in zip(batch, encoded):
+                owner = window_owner[w]
+                pooled[owner] = pooled.get(owner, 0.0) + vector * window_lengths[w]
+                weights[owner] = weights.get(owner, 0.0) + window_lengths[w]
+
+        new_items = []
+        for i in miss_indices:
+            vector = pooled[i] / weights[i]
+            vector = (vector / max(float(np.linalg.norm(vector)), 1e-12)).astype(np.float32)
+            vectors[i] = vector
+            new_items.append((keys[i], vector))
+        self._cache_set(new_items)
+
+        if unique_texts:
+            matrix = np.vstack([vectors[p] for p in positions]).astype(np.float32, copy=False)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        elapsed = time.perf_counter() - start
+        hits = len(unique_texts) - len(miss_indices)
+        self.last_stats = {
+            "model": self.model_name,
+            "inputs": len(texts),
+            "unique": len(unique_texts),
+            "cache_hits": hits,
+            "cache_misses": len(miss_indices),
+            "hit_rate": round(hits / len(unique_texts), 4) if unique_texts else 0.0,
+            "windows": len(window_texts),
+            "batches": len(batches),
+            "padding_ratio": round(padded_tokens / real_tokens, 3) if real_tokens else 1.0,
+            "elapsed": round(elapsed, 3),
+            "per_second": round(len(texts) / elapsed, 1) if elapsed > 0 else 0.0
+        }
+        logger.info(f"Embedding run: {self.last_stats}")
+        return matrix
+
+    def embed_chunks(self, chunks: Sequence[Chunk]) -> np.ndarray:
+        """청크 임베딩 (ai_context.md 계약, 행 순서 = 입력 순서)"""
+        lengths = [c.token_count or len(c.text.split()) for c in chunks]
+        return self.embed_texts([c.text for c in chunks], lengths)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """검색 쿼리 임베딩 (1차원 벡터)"""
+        return self.embed_texts([query])[0]
+
+
+# 테스트 코드 (처리량 / 캐시 적중률)
+if __name__ == "__main__":
+    import random
+
+    class DictCache:
+        """Redis 대체 (로컬 테스트용)"""
+
+        def __init__(self):
+            self.store = {}
+
+        def mget(self, keys):
+            return [self.store.get(k) for k in keys]
+
+        def pipeline(self, transaction=False):
+            cache = self
+
+            class Pipe:
+                def set(self, key, value, ex=None):
+                    cache.store[key] = value
+
+                def execute(self):
+                    pass
+
+            return Pipe()
+
+    random.seed(0)
+    vocab = ['dickinson', 'college', 'course', 'major', 'housing', 'dining', 'deadline', 'aid', 'the', 'of']
+    texts = [' '.join(random.choices(vocab, k=random.randint(20, 400))) for _ in range(500)]
+
+    service = EmbeddingService(redis=DictCache())
+
+    service.embed_texts(texts)
+    print(f"Cold run: {service.last_stats}")
+
+    # 재크롤링 시나리오: 10%만 변경
+    changed = [t + " updated" if i % 10 == 0 else t for i, t in enumerate(texts)]
+    service.embed_texts(changed)
+    print(f"Warm run: {service.last_stats}")
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from app.core.logger import logger
+
+
+# Redis 키: 다시 가져오지 않을 URL (HTML 아님 / 크기 초과)
+NEGATIVE_KEY_PREFIX = "fetch:negative:"
+NEGATIVE_TTL = 60 * 60 * 24 * 30  # 30일 (페이지가 HTML로 바뀌는 경우 대비)
+
+
+class NegativeCache:
+    """HTML이 아니거나 너무 큰 응답을 낸 URL 기록 (크롤링 대상에서 제외)"""
+
+    def __init__(self, redis=None, ttl: int = NEGATIVE_TTL):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+        self.ttl = ttl
+
+    def get(self, url: str) -> Optional[str]:
+        """기록된 사유 또는 None"""
+        try:
+            return self.redis.get(NEGATIVE_KEY_PREFIX + url)
+        except Exception as e:
+            logger.warning(f"Negative cache read failed for {url}: {e}")
+            return None
+
+    def add(self, url: str, reason: str):
+        try:
+            self.redis.set(NEGATIVE_KEY_PREFIX + url, reason, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Negative cache write failed for {url}: {e}")
+
+    def remove(self, url: str):
+        self.redis.delete(NEGATIVE_KEY_PREFIX + url)
@@ -0,0 +1,212 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import heapq
+import math
+
+
+# URL 기반 가치 (_guess_category 결과)
+# 우선순위 (high/low/static)는 업데이트 주기라 가치로 쓰지 않음 (high = 매일 바뀌는 뉴스 / 이벤트)
+CATEGORY_SCORES = {
+    'admissions': 1.0,
+    'academics': 1.0,
+    'campus_life': 0.5,
+    'about': 0.5,
+    'general_financial': 0.5,
+    'news': -0.5,
+    'events': -0.5,
+}
+DEPTH_WEIGHT = 0.3       # 시드에서 한 단계 멀어질 때마다 감점
+INLINK_WEIGHT = 0.5      # log(1 + in-link 수) 가중치
+
+# 카테고리별 예산 상한 (max_pages 대비). 넘으면 다른 카테고리가 빌 때까지 보류
+DEFAULT_CATEGORY_QUOTA = 0.25
+CATEGORY_QUOTAS = {'admissions': 0.3, 'academics': 0.35, 'news': 0.1, 'events': 0.1}
+
+
+class CrawlFrontier:
+    """
+    우선순위 크롤링 프런티어 (힙)
+
+    URL 가치 (카테고리) + in-link 수 - 깊이로 점수를 매겨 높은 순으로 꺼낸다.
+    새 in-link이 생기거나 더 얕은 경로가 발견되면 점수를 다시 계산해 넣고 (이전 항목은 꺼낼 때 무시),
+    카테고리 상한을 넘은 URL은 다른 후보가 없을 때까지 보류하여 max_pages 예산이 한쪽에 쏠리지 않게 한다.
+    상한은 실제로 저장한 페이지 (commit) 기준이라 가져오기 / 추출에 실패한 URL은 예산을 쓰지 않는다.
+    """
+
+    def __init__(
+        self,
+        max_pages: int,
+        classify: Callable[[str], str],
+        link_graph=None
+    ):
+        """
+        Args:
+            max_pages: 크롤링 예산 (카테고리 상한 계산용)
+            classify: URL → 카테고리
+            link_graph: 이전 크롤링의 링크 그래프 (in-degree를 초기 in-link 수로 사용)
+        """
+        self.max_pages = max_pages
+        self.classify = classify
+
+        self._prior_ids: Dict[str, int] = {}
+        self._prior_inlinks = None
+        if link_graph is not None and link_graph.num_nodes:
+            self._prior_ids = link_graph.ids
+            self._prior_inlinks = link_graph.in_degree()
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._deferred: List[Tuple[float, int, str]] = []
+        self._seq = 0
+
+        self._scores: Dict[str, float] = {}
+        self._depths: Dict[str, int] = {}
+        self._inlinks: Dict[str, int] = {}
+        self._categories: Dict[str, str] = {}   # 추가된 적 있는 모든 URL (꺼낸 URL 포함)
+        self._pending: Set[str] = set()
+        self._committed: Set[str] = set()
+        self._taken: Dict[str, int] = {}        # 카테고리별 저장한 페이지 수
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._pending
+
+    # ==================== 점수 ====================
+
+    def _prior(self, url: str) -> int:
+        node = self._prior_ids.get(url)
+        if node is None or node >= len(self._prior_inlinks):
+            return 0
+        return int(self._prior_inlinks[node])
+
+    def _score(self, url: str) -> float:
+        inlinks = self._inlinks[url] + (self._prior(url) if self._prior_inlinks is not None else 0)
+        return (
+            CATEGORY_SCORES.get(self._categories[url], 0.0)
+            + INLINK_WEIGHT * math.log1p(inlinks)
+            - DEPTH_WEIGHT * self._depths[url]
+        )
+
+    def _quota(self, category: str) -> int:
+        return max(1, math.ceil(self.max_pages * CATEGORY_QUOTAS.get(category, DEFAULT_CATEGORY_QUOTA)))
+
+    # ==================== 추가 / 꺼내기 ====================
+
+    def push(self, url: str, depth: int = 0, linked: bool = False):
+        """
+        URL 추가 (이미 대기 중이면 in-link / 깊이만 갱신하고 점수 재계산)
+
+        Args:
+            depth: 시드로부터의 링크 거리
+            linked: 크롤링한 페이지의 링크로 발견됨 (in-link 1 증가)
+        """
+        if url not in self._categories:
+            self._categories[url] = self.classify(url)
+            self._depths[url] = depth
+            self._inlinks[url] = 0
+        elif url not in self._pending:
+            return  # 이미 꺼낸 URL
+        else:
+            self._depths[url] = min(self._depths[url], depth)
+
+        if linked:
+            self._inlinks[url] += 1
+
+        score = self._score(url)
+        if self._scores.get(url) == score and url in self._pending:
+            return
+        self._scores[url] = score
+        self._pending.add(url)
+        self._seq += 1
+        heapq.heappush(self._heap, (-score, self._seq, url))
+
+    def _valid(self, entry: Tuple[float, int, str]) -> bool:
+        neg_score, _, url = entry
+        return url in self._pending and -neg_score == self._scores[url]
+
+    def pop(self) -> Optional[str]:
+        """점수가 가장 높은 URL (카테고리 상한을 넘은 URL은 다른 후보가 없을 때만)"""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not self._valid(entry):
+                continue
+            category = self._categories[entry[2]]
+            if self._taken.get(category, 0) >= self._quota(category):
+                heapq.heappush(self._deferred, entry)
+                continue
+            self._pending.discard(entry[2])
+            return entry[2]
+
+        while self._deferred:
+            entry = heapq.heappop(self._deferred)
+            if self._valid(entry):
+                self._pending.discard(entry[2])
+                return entry[2]
+
+        return None
+
+    def commit(self, url: str):
+        """꺼낸 URL을 저장했음 (카테고리 상한에 반영, 같은 URL은 한 번만)"""
+        if url in self._pending or url in self._committed or url not in self._categories:
+            return
+        self._committed.add(url)
+        category = self._categories[url]
+        self._taken[category] = self._taken.get(category, 0) + 1
+
+    def depth(self, url: str) -> int:
+        return self._depths.get(url, 0)
+
+    def get_statistics(self) -> Dict:
+        return {
+            'pending': len(self._pending),
+            'deferred': sum(1 for entry in self._deferred if self._valid(entry)),
+            'taken_by_category': dict(sorted(self._taken.items(), key=lambda item: -item[1]))
+        }
+
+
+# 테스트 코드 (FIFO와 우선순위 프런티어의 예산 사용 비교)
+if __name__ == "__main__":
+    from collections import Counter, deque
+    import random
+
+    random.seed(0)
+    # 시드 근처에 뉴스 기사가 몰려 있고, 입학/학과 페이지는 한 단계 더 깊은 사이트
+    site: Dict[str, List[str]] = {"/": [f"/news/article/{i}" for i in range(60)] + ["/admissions", "/academics"]}
+    for i in range(60):
+        site[f"/news/article/{i}"] = [f"/news/article/{random.randrange(200)}" for _ in range(5)]
+    site["/admissions"] = [f"/admissions/{p}" for p in ("apply", "visit", "deadlines", "cost", "aid")]
+    site["/academics"] = [f"/academics/majors/{i}" for i in range(40)]
+
+    def classify(url: str) -> str:
+        for category in ('news', 'admissions', 'academics'):
+            if url.startswith(f"/{category}"):
+                return category
+        return 'general'
+
+    budget = 40
+
+    fifo, seen, order = deque(["/"]), {"/"}, []
+    while fifo and len(order) < budget:
+        url = fifo.popleft()
+        order.append(url)
+        for link in site.get(url, []):
+            if link not in seen:
+                seen.add(link)
+                fifo.append(link)
+
+    frontier = CrawlFrontier(budget, classify)
+    frontier.push("/")
+    crawled: List[str] = []
+    while frontier and len(crawled) < budget:
+        url = frontier.pop()
+        crawled.append(url)
+        frontier.commit(url)
+        for link in site.get(url, []):
+            if link not in crawled:
+                frontier.push(link, frontier.depth(url) + 1, linked=True)
+
+    print(f"\n{'='*60}")
+    print(f"Frontier Benchmark (budget={budget})")
+    print(f"  FIFO:     {dict(Counter(classify(u) for u in order))}")
+    print(f"  Priority: {dict(Counter(classify(u) for u in crawled))}")
+    print(f"  Stats: {frontier.get_statistics()}")
@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional, Tuple
 import hashlib
 
 def compute_content_hash(text: str) -> str:
@@ -31,6 +32,117 @@ def has_content_changed(old_hash: str, new_content: str) -> bool:
     return old_hash != new_hash
 
 
+def hash_sections(content: str, sections: List[Dict]) -> List[Dict]:
+    """
+    섹션별 텍스트 범위와 해시 기록
+    
+    헤딩 제목과 같은 줄을 본문에서 문서 순서대로 찾아 (HeaderChunker.split_sections와 동일),
+    헤딩 줄부터 다음 헤딩 직전까지를 그 섹션의 범위로 본다.
+    본문에서 찾지 못한 헤딩은 start/end = -1, content_hash = "".
+    
+    Args:
+        content: 본문 텍스트
+        sections: [{'level', 'title'}] (문서 순서)
+        
+    Returns:
+        [{'level', 'title', 'start', 'end', 'content_hash'}]
+    """
+    # 줄별 (시작 오프셋, 정리된 텍스트)
+    lines = []
+    offset = 0
+    for line in (content or "").split('\n'):
+        if line.strip():
+            lines.append((offset, line.strip()))
+        offset += len(line) + 1
+    
+    starts = [-1] * len(sections)
+    next_section = 0
+    for line_start, text in lines:
+        for j in range(next_section, len(sections)):
+            if sections[j].get('title') == text:
+                starts[j] = line_start
+                next_section = j + 1
+                break
+    
+    located = [start for start in starts if start >= 0] + [len(content or "")]
+    result = []
+    for section, start in zip(sections, starts):
+        section = {k: v for k, v in section.items() if k not in ('start', 'end', 'content_hash')}
+        if start < 0:
+            result.append({**section, 'start': -1, 'end': -1, 'content_hash': ""})
+            continue
+        end = located[located.index(start) + 1]
+        result.append({
+            **section,
+            'start': start,
+            'end': end,
+            'content_hash': compute_content_hash(content[start:end])
+        })
+    
+    return result
+
+
+def _preamble(content: str, sections: List[Dict]) -> str:
+    """첫 헤딩 이전 텍스트 (청커의 section_index -1)"""
+    starts = [s['start'] for s in sections if s.get('start', -1) >= 0]
+    return (content or "")[:min(starts)] if starts else (content or "")
+
+
+def _section_keys(sections: List[Dict]) -> List[Tuple[str, str, int]]:
+    """(level, title, 같은 제목 내 순번) - 섹션 추가/삭제로 인덱스가 밀려도 짝을 찾기 위한 키"""
+    seen: Dict[Tuple[str, str], int] = {}
+    keys = []
+    for section in sections:
+        base = (section.get('level', ''), section.get('title', ''))
+        keys.append((*base, seen.get(base, 0)))
+        seen[base] = seen.get(base, 0) + 1
+    return keys
+
+
+def diff_sections(
+    old_content: str,
+    old_sections: List[Dict],
+    new_content: str,
+    new_sections: List[Dict]
+) -> Optional[List[int]]:
+    """
+    변경된 섹션 인덱스 (새 sections 기준, -1 = 첫 헤딩 이전 본문)
+    
+    삭제된 섹션은 바로 앞 섹션을 변경으로 표시한다 (그 섹션의 청크가 삭제된 텍스트까지 이어졌을 수 있음).
+    
+    Returns:
+        변경된 인덱스 목록 (오름차순) 또는 None (이전 문서에 섹션 해시가 없어 비교 불가)
+    """
+    if any(s.get('content_hash') is None for s in old_sections):
+        return None
+    
+    changed = set()
+    if compute_content_hash(_preamble(old_content, old_sections)) != \
+            compute_content_hash(_preamble(new_content, new_sections)):
+        changed.add(-1)
+    
+    old_hashes = {
+        key: s.get('content_hash', "")
+        for key, s in zip(_section_keys(old_sections), old_sections)
+    }
+    new_keys = _section_keys(new_sections)
+    new_index = {key: i for i, key in enumerate(new_keys)}
+    
+    for i, (key, section) in enumerate(zip(new_keys, new_sections)):
+        if old_hashes.get(key) != section.get('content_hash', ""):
+            changed.add(i)
+    
+    # 삭제된 섹션 → 살아남은 직전 섹션 (없으면 -1)
+    previous = -1
+    for key in _section_keys(old_sections):
+        if key in new_index:
+            previous = new_index[key]
+        else:
+            changed.add(previous)
+    
+    return sorted(changed)
+
+
 # 테스트
 if __name__ == "__main__":
     text1 = "Computer Science Major requirements aksjhfkjash vkjdsbsakfj absdjkfasbdflkj absdvkjcxjbvjksd..."
@@ -45,4 +157,9 @@ if __name__ == "__main__":
     print(f"Hash 2: {hash2}")
     print(f"Same? {hash1 == hash2}")
     print(f"\nHash 3: {hash3}")
-    print(f"Changed? {has_content_changed(hash1, text3)}")
\ No newline at end of file
+    print(f"Changed? {has_content_changed(hash1, text3)}")
+    
+    old = "Intro\nOverview\nFirst paragraph\nCourses\nCS 101"
+    new = "Intro\nOverview\nFirst paragraph\nCourses\nCS 101, CS 102"
+    headings = [{'level': 'h2', 'title': 'Overview'}, {'level': 'h2', 'title': 'Courses'}]
+    print(f"\nChanged sections: {diff_sections(old, hash_sections(old, headings), new, hash_sections(new, headings))}")
\ No newline at end of file
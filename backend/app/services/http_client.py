@@ -0,0 +1,192 @@
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import os
+import threading
+import time
+
+import httpx
+
+from app.core.logger import logger
+
+
+USER_AGENT = 'RUSH-Bot/1.0 (Dickinson College Student Project; +https://github.com/aaronshin43)'
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.5',
+    # br는 brotli 패키지, HTTP/2는 h2 패키지 필요 (httpx[http2,brotli])
+    'Accept-Encoding': 'br, gzip, deflate'
+}
+
+# 호스트별 연결 풀 (HTTP/2는 연결 하나로 다중화, HTTP/1.1 서버는 최대 이 수만큼)
+PER_HOST_MAX_CONNECTIONS = 4
+KEEPALIVE_EXPIRY = 60.0
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# 재시도 (429 / 5xx / 연결 오류, 1초 → 2초 → 4초)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpClientPool:
+    """
+    프로세스 공유 HTTP 클라이언트
+
+    호스트마다 httpx.Client 하나 (HTTP/2 + keep-alive)를 두고 모든 ContentExtractor가 공유한다.
+    새 TCP 연결 수를 세어 페이지 1,000개당 연결 수를 보고한다.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections_per_host: int = PER_HOST_MAX_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        timeout: httpx.Timeout = HTTP_TIMEOUT,
+        max_retries: int = MAX_RETRIES
+    ):
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        self._clients: Dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()  # 클라이언트 생성 / 통계 갱신 (크롤러 스레드가 공유)
+        self._stats = {
+            'requests': 0,
+            'retries': 0,
+            'connections_opened': 0,
+            'http2_responses': 0
+        }
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _trace(self, event: str, info: Dict):
+        """httpcore trace 훅 - 새 TCP 연결 카운트"""
+        if event == "connection.connect_tcp.complete":
+            self._count('connections_opened')
+
+    def client_for(self, url: str) -> httpx.Client:
+        """URL 호스트의 클라이언트 (없으면 생성)"""
+        host = urlsplit(url).netloc.lower()
+        client = self._clients.get(host)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(host)
+            if client is None:
+                client = httpx.Client(
+                    http2=self.http2,
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    headers=DEFAULT_HEADERS,
+                    follow_redirects=True
+                )
+                self._clients[host] = client
+            return client
+
+    def _send(self, url: str, stream: bool, **kwargs) -> httpx.Response:
+        """GET (429/5xx/연결 오류 재시도)"""
+        client = self.client_for(url)
+        self._count('requests')
+
+        for attempt in range(self.max_retries + 1):
+            request = client.build_request("GET", url, extensions={"trace": self._trace}, **kwargs)
+            try:
+                response = client.send(request, stream=stream)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    if response.http_version == "HTTP/2":
+                        self._count('http2_responses')
+                    return response
+                response.close()
+
+            self._count('retries')
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET (본문 전체 읽기)
+
+        Raises:
+            httpx.HTTPError: 재시도 후에도 실패
+        """
+        return self._send(url, stream=False, **kwargs)
+
+    def stream(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET (헤더만 받은 상태로 반환, 본문은 iter_bytes()로 읽고 호출자가 close())
+
+        Raises:
+            httpx.HTTPError: 재시도 후에도 실패
+        """
+        return self._send(url, stream=True, **kwargs)
+
+    def get_stats(self, since: Optional[Dict] = None) -> Dict:
+        """
+        요청 / 재시도 / 새 연결 수 (이 프로세스 기준)
+
+        Args:
+            since: 이전 get_stats() 결과 (주면 그 이후 구간만 계산)
+        """
+        with self._lock:
+            current = dict(self._stats)
+        counts = {
+            key: value - (since or {}).get(key, 0)
+            for key, value in current.items()
+        }
+        requests = counts['requests']
+        return {
+            **counts,
+            'hosts': len(self._clients),
+            'connections_per_1000_pages': round(counts['connections_opened'] * 1000 / requests, 1) if requests else 0.0,
+            'http2_ratio': round(counts['http2_responses'] / requests, 4) if requests else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+_pool: Optional[HttpClientPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpClientPool:
+    """
+    프로세스당 하나의 HTTP 클라이언트 풀
+
+    Celery prefork 워커는 fork 후 부모의 소켓을 공유하면 안 되므로 pid가 바뀌면 새로 만든다.
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = HttpClientPool()
+            _pool_pid = pid
+            logger.info(f"HTTP client pool created (pid={pid}, http2={_pool.http2})")
+        return _pool
+
+
+def close_http_pool():
+    """현재 프로세스의 HTTP 클라이언트 종료"""
+    global _pool
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
+    _pool = None
@@ -0,0 +1,171 @@
+from typing import Dict, Iterable, List, Optional
+import time
+
+from app.core.logger import logger
+from app.services.chunker import Chunk, HeaderChunker, iter_corpus_chunks
+from app.services.embedding_service import EmbeddingService
+from app.services.hash_utils import compute_content_hash
+from app.services.query_cache import QueryCache
+from app.services.vector_store import VectorStore, build_points
+
+
+# 전체 재구축 시 한 번에 임베딩/업서트할 청크 수
+REBUILD_CHUNK_BATCH = 512
+
+
+class IndexService:
+    """청킹 → 임베딩 → Weaviate 저장 파이프라인"""
+
+    def __init__(
+        self,
+        collection=None,
+        chunker: Optional[HeaderChunker] = None,
+        embedder: Optional[EmbeddingService] = None,
+        store: Optional[VectorStore] = None,
+        query_cache: Optional[QueryCache] = None
+    ):
+        if collection is None:
+            from app.core.database import mongodb_db_sync
+            collection = mongodb_db_sync.documents
+        self.collection = collection
+        self.chunker = chunker or HeaderChunker()
+        self.embedder = embedder or EmbeddingService()
+        self.store = store or VectorStore()
+        self.query_cache = query_cache or QueryCache()
+
+    def index_document(self, document: Dict, changed_sections: Optional[List[int]] = None) -> Dict:
+        """
+        문서 하나 재색인 (해당 페이지의 청크만 교체)
+
+        Args:
+            document: MongoDB 문서
+            changed_sections: CrawlService.save_crawl_result가 보고한 변경 섹션 인덱스
+                              (None이면 페이지 전체 재처리)
+
+        Returns:
+            {'url', 'chunks', 'upserted', 'deleted', 'reused'}
+        """
+        url = document['normalized_url']
+        chunks = list(self.chunker.chunk_document(document))
+
+        if changed_sections is None or not chunks:
+            vectors = self.embedder.embed_chunks(chunks) if chunks else []
+            result = self.store.replace_source(url, build_points(chunks, vectors))
+            return {"url": url, "chunks": len(chunks), "reused": 0, **result}
+
+        # 청킹은 문서 순서대로 결정적이므로 첫 변경 섹션 이전에서 끝나는 청크는 그대로
+        first_changed = min(changed_sections, default=len(document.get('sections') or []))
+        candidates = [chunk for chunk in chunks if chunk.end_section_index >= first_changed]
+
+        # 나머지는 저장된 청크 해시와 비교 (섹션 변경이 청크 경계를 바꾸지 않았으면 재사용)
+        stored = self.store.get_chunk_hashes(url, candidates[0].chunk_index) if candidates else {}
+        dirty = [
+            chunk for chunk in candidates
+            if stored.get(chunk.chunk_index) != compute_content_hash(chunk.text)
+        ]
+
+        upserted = 0
+        if dirty:
+            vectors = self.embedder.embed_chunks(dirty)
+            upserted = self.store.upsert_vectors(build_points(dirty, vectors))
+        deleted = self.store.delete_stale_chunks(url, len(chunks))
+
+        return {
+            "url": url,
+            "chunks": len(chunks),
+            "upserted": upserted,
+            "deleted": deleted,
+            "reused": len(chunks) - len(dirty)
+        }
+
+    def index_urls(
+        self,
+        urls: Iterable[str],
+        changed_sections: Optional[Dict[str, List[int]]] = None
+    ) -> Dict:
+        """
+        URL 목록 재색인 (크롤링 후 created/updated 문서)
+
+        Args:
+            urls: normalized_url 목록
+            changed_sections: {normalized_url: 변경 섹션 인덱스} (없는 URL은 전체 재처리)
+        """
+        self.store.ensure_collection()
+        changed_sections = changed_sections or {}
+
+        indexed = 0
+        removed = 0
+        chunks = 0
+        reused = 0
+        failed = 0
+        touched: List[str] = []
+
+        for url in urls:
+            document = self.collection.find_one({"normalized_url": url})
+            try:
+                if not document or document.get("status", "active") != "active":
+                    removed += self.store.delete_vectors_by_source(url)
+                    touched.append(url)
+                    continue
+
+                result = self.index_document(document, changed_sections.get(url))
+                indexed += 1
+                chunks += result["chunks"]
+                reused += result["reused"]
+                touched.append(url)
+            except Exception as e:
+                failed += 1
+                logger.error(f"Indexing failed for {url}: {e}")
+
+        # 저장 시점에도 제거하지만, 재임베딩 전까지 옛 벡터로 다시 캐시된 답변이 있으므로 upsert 후 한 번 더
+        evicted = self.query_cache.invalidate_sources(touched)
+
+        stats = {
+            "indexed": indexed,
+            "chunks": chunks,
+            "reused_chunks": reused,
+            "removed_vectors": removed,
+            "failed": failed,
+            "evicted_answers": evicted
+        }
+        logger.info(f"Index update completed: {stats}")
+        return stats
+
+    def _flush(self, buffer: List[Chunk]) -> int:
+        vectors = self.embedder.embed_chunks(buffer)
+        return self.store.upsert_vectors(build_points(buffer, vectors))
+
+    def rebuild(self, batch_size: int = REBUILD_CHUNK_BATCH) -> Dict:
+        """
+        전체 재구축
+
+        컬렉션을 새로 만들고 코퍼스를 단일 패스로 청킹하여
+        batch_size 단위로 임베딩 + 배치 upsert 한다.
+        """
+        start = time.time()
+        self.store.recreate_collection()
+
+        buffer: List[Chunk] = []
+        total = 0
+        upserted = 0
+
+        for chunk in iter_corpus_chunks(self.collection, self.chunker):
+            buffer.append(chunk)
+            if len(buffer) >= batch_size:
+                upserted += self._flush(buffer)
+                total += len(buffer)
+                buffer = []
+
+        if buffer:
+            upserted += self._flush(buffer)
+            total += len(buffer)
+
+        elapsed = time.time() - start
+        stats = {
+            "chunks": total,
+            "upserted": upserted,
+            "elapsed": round(elapsed, 2),
+            "chunks_per_sec": round(total / elapsed, 1) if elapsed > 0 else 0.0
+        }
+        logger.info(f"Vector index rebuild completed: {stats}")
+        return stats
@@ -0,0 +1,362 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import math
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from app.core.logger import logger
+
+
+# 인덱스 디렉토리 이름 (settings.DATA_DIR 하위)
+INDEX_DIR_NAME = "vector_index"
+
+# IVF 파라미터
+KMEANS_ITERATIONS = 12
+KMEANS_SAMPLE = 20000
+DEFAULT_NPROBE = 32  # recall@10 ≥ 0.95 (5k-50k 벤치마크)
+
+# 할당 계산 시 블록 크기 (메모리 상한)
+ASSIGN_BLOCK = 8192
+
+
+def default_index_path() -> str:
+    from app.core.config import settings
+    return os.path.join(settings.DATA_DIR, INDEX_DIR_NAME)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """각 벡터의 가장 가까운(내적 최대) 중심 인덱스"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for i in range(0, len(vectors), ASSIGN_BLOCK):
+        labels[i:i + ASSIGN_BLOCK] = np.argmax(vectors[i:i + ASSIGN_BLOCK] @ centroids.T, axis=1)
+    return labels
+
+
+def _train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """구면 k-means (코사인), 샘플로 학습"""
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if len(vectors) > KMEANS_SAMPLE:
+        sample = vectors[rng.choice(len(vectors), KMEANS_SAMPLE, replace=False)]
+
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        # 빈 클러스터는 임의 샘플로 재시작
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+class LocalVectorIndex:
+    """
+    디스크 기반 로컬 벡터 인덱스 (Weaviate 없이 top-k 검색)
+
+    - 벡터: int8(행별 scale) 또는 float16 행렬을 .npy로 저장, np.load(mmap_mode='r')로 로드
+      → 로드는 파일 매핑만 하므로 밀리초 단위, uvicorn 워커 간 페이지 캐시 공유
+    - IVF: k-means 중심 + 리스트별로 정렬된 연속 행 구간(CSR 오프셋)
+      → 쿼리는 nprobe개 리스트 구간만 스캔
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.vectors: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self.meta: Dict = {}
+        self.keys: List[str] = []
+
+    # ==================== 구축 ====================
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        keys: Sequence[str],
+        path: Optional[str] = None,
+        dtype: str = "int8",
+        nlist: Optional[int] = None
+    ) -> "LocalVectorIndex":
+        """
+        임베딩으로 인덱스 구축 후 디스크에 저장 (원자적 교체)
+
+        Args:
+            vectors: (n, dim) 임베딩
+            keys: 행별 식별자 ("{normalized_url}#{chunk_index}")
+            path: 인덱스 디렉토리 (기본: DATA_DIR/vector_index)
+            dtype: 'int8' | 'float16'
+            nlist: IVF 리스트 수 (기본: 4·√n)
+        """
+        start = time.time()
+        path = path or default_index_path()
+        vectors = _normalize(vectors)
+        n, dim = vectors.shape
+
+        nlist = nlist or max(1, min(n, int(4 * math.sqrt(n))))
+        centroids = _train_centroids(vectors, nlist)
+        labels = _assign(vectors, centroids)
+
+        # 리스트 순서로 행 재배치 → 리스트별 연속 구간
+        order = np.argsort(labels, kind='stable')
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+        ordered = vectors[order]
+
+        if dtype == "int8":
+            scales = np.abs(ordered).max(axis=1) / 127.0
+            scales = np.maximum(scales, 1e-12).astype(np.float32)
+            stored = np.round(ordered / scales[:, None]).astype(np.int8)
+        elif dtype == "float16":
+            scales = np.ones(n, dtype=np.float32)
+            stored = ordered.astype(np.float16)
+        else:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+
+        # 임시 디렉토리에 쓰고 교체 (읽는 워커가 반쯤 쓴 파일을 보지 않도록)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        np.save(os.path.join(tmp_path, "vectors.npy"), stored)
+        np.save(os.path.join(tmp_path, "scales.npy"), scales)
+        np.save(os.path.join(tmp_path, "centroids.npy"), centroids.astype(np.float32))
+        np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+        with open(os.path.join(tmp_path, "keys.json"), "w") as f:
+            json.dump([keys[i] for i in order], f)
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump({"count": n, "dim": dim, "dtype": dtype, "nlist": nlist, "built_at": time.time()}, f)
+
+        old_path = f"{path}.old-{os.getpid()}"
+        if os.path.exists(path):
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+        logger.info(f"Local vector index built: {n} vectors, nlist={nlist}, {dtype} in {time.time() - start:.2f}s")
+        return cls.load(path)
+
+    # ==================== 로드 ====================
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "LocalVectorIndex":
+        """
+        mmap으로 인덱스 로드 (벡터는 데이터 복사 없음)
+
+        keys.json도 여기서 함께 읽는다. 검색 시점에 읽으면 그 사이 재구축으로 디렉토리가
+        교체됐을 때 다른 인덱스의 키와 섞일 수 있다.
+        """
+        index = cls(path or default_index_path())
+        with open(os.path.join(index.path, "meta.json")) as f:
+            index.meta = json.load(f)
+        with open(os.path.join(index.path, "keys.json")) as f:
+            index.keys = json.load(f)
+
+        index.vectors = np.load(os.path.join(index.path, "vectors.npy"), mmap_mode='r')
+        index.scales = np.load(os.path.join(index.path, "scales.npy"), mmap_mode='r')
+        index.centroids = np.load(os.path.join(index.path, "centroids.npy"))
+        index.offsets = np.load(os.path.join(index.path, "offsets.npy"))
+        return index
+
+    @property
+    def size(self) -> int:
+        return int(self.meta.get("count", 0))
+
+    # ==================== 검색 ====================
+
+    def _scores(self, start: int, end: int, q: np.ndarray) -> np.ndarray:
+        block = np.asarray(self.vectors[start:end], dtype=np.float32)
+        return (block @ q) * self.scales[start:end]
+
+    def search_rows(self, query: np.ndarray, k: int = 10, nprobe: int = DEFAULT_NPROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """IVF 검색 → (행 번호, 점수)"""
+        q = _normalize(query).ravel()
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+
+        rows = []
+        scores = []
+        for list_id in probes:
+            start, end = int(self.offsets[list_id]), int(self.offsets[list_id + 1])
+            if end > start:
+                rows.append(np.arange(start, end))
+                scores.append(self._scores(start, end, q))
+
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores)
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return rows[top], scores[top]
+
+    def exact_rows(self, query: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """전체 스캔 (저장된 양자화 벡터 기준)"""
+        q = _normalize(query).ravel()
+        scores = self._scores(0, self.size, q)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top, scores[top]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = DEFAULT_NPROBE) -> List[Tuple[str, float]]:
+        """top-k → [(key, score)]"""
+        rows, scores = self.search_rows(query, k, nprobe)
+        keys = self.keys
+        return [(keys[r], float(s)) for r, s in zip(rows, scores)]
+
+    def recall(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        nprobe: int = DEFAULT_NPROBE,
+        exact_vectors: Optional[np.ndarray] = None,
+        exact_keys: Optional[Sequence[str]] = None
+    ) -> float:
+        """
+        정확 검색 대비 recall@k
+
+        exact_vectors/exact_keys가 주어지면 원본 float 벡터의 정확 검색과 비교
+        (양자화 오차 포함), 없으면 저장된 벡터 전체 스캔과 비교 (IVF 오차만)
+        """
+        hits = 0
+        keys = self.keys
+        exact_matrix = _normalize(exact_vectors) if exact_vectors is not None else None
+
+        for query in queries:
+            rows, _ = self.search_rows(query, k, nprobe)
+            found = {keys[r] for r in rows}
+
+            if exact_matrix is not None:
+                scores = exact_matrix @ _normalize(query).ravel()
+                top = np.argpartition(-scores, k - 1)[:k]
+                truth = {exact_keys[i] for i in top}
+            else:
+                truth = {keys[r] for r in self.exact_rows(query, k)[0]}
+
+            hits += len(found & truth)
+
+        return hits / (len(queries) * k) if len(queries) else 0.0
+
+
+# ==================== 프로세스 전역 인덱스 ====================
+
+_local_index: Optional[LocalVectorIndex] = None
+_local_index_mtime: float = 0.0
+_local_index_lock = threading.Lock()
+
+
+def get_local_index(path: Optional[str] = None) -> Optional[LocalVectorIndex]:
+    """
+    로컬 인덱스 (재구축되면 다시 매핑)
+
+    Returns:
+        LocalVectorIndex 또는 None (아직 구축 전)
+    """
+    global _local_index, _local_index_mtime
+    path = path or default_index_path()
+    meta_path = os.path.join(path, "meta.json")
+
+    try:
+        mtime = os.path.getmtime(meta_path)
+    except OSError:
+        return None
+
+    with _local_index_lock:
+        if _local_index is None or mtime != _local_index_mtime:
+            _local_index = LocalVectorIndex.load(path)
+            _local_index_mtime = mtime
+        return _local_index
+
+
+def build_local_index_from_corpus(path: Optional[str] = None, dtype: str = "int8") -> Dict:
+    """documents 컬렉션 → 청킹 → 임베딩(캐시) → 로컬 인덱스"""
+    from app.services.chunker import iter_corpus_chunks
+    from app.services.embedding_service import EmbeddingService
+
+    embedder = EmbeddingService()
+    keys: List[str] = []
+    blocks: List[np.ndarray] = []
+    buffer = []
+
+    def flush():
+        blocks.append(embedder.embed_chunks(buffer))
+        keys.extend(f"{c.source_url}#{c.chunk_index}" for c in buffer)
+        buffer.clear()
+
+    for chunk in iter_corpus_chunks():
+        buffer.append(chunk)
+        if len(buffer) >= 512:
+            flush()
+    if buffer:
+        flush()
+
+    if not blocks:
+        return {"vectors": 0}
+
+    index = LocalVectorIndex.build(np.vstack(blocks), keys, path=path, dtype=dtype)
+    return {"vectors": index.size, "nlist": index.meta["nlist"], "dtype": dtype}
+
+
+# 테스트 코드 (로드 시간 / 지연 시간 / recall 벤치마크)
+if __name__ == "__main__":
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    dim = 384
+
+    def clustered(n: int, n_topics: int = 200) -> np.ndarray:
+        """임베딩과 비슷한 군집 구조의 합성 벡터"""
+        topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+        assignment = rng.integers(0, n_topics, n)
+        return topics[assignment] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+
+    print(f"\n{'='*60}")
+    print("Local Vector Index Benchmark")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (5000, 50000):
+            vectors = clustered(n)
+            keys = [f"https://www.dickinson.edu/page/{i // 5}#{i % 5}" for i in range(n)]
+            queries = clustered(200)
+
+            for dtype in ("int8", "float16"):
+                path = os.path.join(tmp, f"idx_{n}_{dtype}")
+                LocalVectorIndex.build(vectors, keys, path=path, dtype=dtype)
+
+                t0 = time.perf_counter()
+                index = LocalVectorIndex.load(path)
+                load_ms = (time.perf_counter() - t0) * 1000
+
+                size_mb = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1024 / 1024
+
+                for nprobe in (8, 16, 32):
+                    latencies = []
+                    for q in queries:
+                        t0 = time.perf_counter()
+                        index.search_rows(q, 10, nprobe)
+                        latencies.append((time.perf_counter() - t0) * 1000)
+                    p50, p99 = np.percentile(latencies, [50, 99])
+                    recall = index.recall(queries[:100], 10, nprobe, exact_vectors=vectors, exact_keys=keys)
+                    print(
+                        f"  n={n:>6} {dtype:<7} {size_mb:5.1f}MB load {load_ms:5.2f}ms | "
+                        f"nprobe={nprobe:<2} p50 {p50:5.2f}ms p99 {p99:5.2f}ms recall@10 {recall:.3f}"
+                    )
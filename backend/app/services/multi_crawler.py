@@ -0,0 +1,218 @@
+from typing import Dict, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import threading
+import time
+
+from app.core.logger import logger
+from app.services.alias_map import AliasMap
+from app.services.crawler import DickinsonCrawler
+from app.services.link_graph import LinkGraph
+from app.services.url_utils import URLNormalizer
+
+
+# 한 작업의 최대 시드 호스트 수 (호스트마다 스레드 하나, 모두 동시에 실행)
+MAX_SEED_HOSTS = 8
+# 대기 중인 크롤러가 다시 확인하는 간격 (초)
+IDLE_POLL_INTERVAL = 0.5
+
+
+class CrawlCoordinator:
+    """
+    호스트별 크롤러 사이의 링크 전달과 종료 판단
+
+    프런티어가 빈 크롤러는 다른 호스트가 링크를 보낼 수 있으므로 바로 끝내지 않고,
+    모든 크롤러가 대기 중이고 보낸 링크가 없을 때 함께 종료한다.
+    """
+
+    def __init__(self):
+        self.crawlers: Dict[str, DickinsonCrawler] = {}
+        self.owners: Dict[str, DickinsonCrawler] = {}  # 호스트 → 맡은 크롤러 (시드가 아닌 호스트 포함)
+        self.graph_lock = threading.Lock()   # 공유 링크 그래프 갱신
+        self.seen_lock = threading.Lock()    # 공유 visited / fetched 확인 + 추가
+        self._cond = threading.Condition()
+        self._idle: Set[str] = set()
+        self._done: Set[str] = set()
+        self.routed = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def register(self, host: str, crawler: DickinsonCrawler):
+        self.crawlers[host] = crawler
+        self.owners[host] = crawler
+
+    def route(self, url: str, depth: int, sender: DickinsonCrawler) -> bool:
+        """
+        URL 호스트를 맡은 다른 크롤러가 있으면 그 크롤러로 전달
+
+        시드가 아닌 호스트는 처음 링크를 발견한 크롤러가 맡는다 (맡은 크롤러가 끝났으면 보낸 크롤러가 이어받음).
+        한 호스트는 크롤러 하나만 요청하므로 rate_limit_delay 간격이 호스트 단위로 지켜진다.
+
+        Returns:
+            전달했으면 True (보낸 크롤러는 큐에 넣지 않음)
+        """
+        host = self.host_of(url)
+        with self._cond:
+            owner = self.owners.get(host)
+            if owner is None or self.host_of(owner.seed_url) in self._done:
+                self.owners[host] = sender
+                return False
+            if owner is sender:
+                return False
+
+            owner.inbox.put((url, depth))
+            self.routed += 1
+            self._cond.notify_all()
+        return True
+
+    def _all_quiet(self) -> bool:
+        return all(
+            host in self._done or (host in self._idle and crawler.inbox.empty())
+            for host, crawler in self.crawlers.items()
+        )
+
+    def wait_for_work(self, crawler: DickinsonCrawler) -> bool:
+        """
+        프런티어가 빈 크롤러 대기
+
+        Returns:
+            받은 링크가 있으면 True, 모든 크롤러가 끝났으면 False
+        """
+        host = self.host_of(crawler.seed_url)
+        with self._cond:
+            self._idle.add(host)
+            try:
+                while crawler.inbox.empty():
+                    if self._all_quiet() or len(crawler.visited) >= crawler.max_pages:
+                        self._cond.notify_all()
+                        return False
+                    self._cond.wait(IDLE_POLL_INTERVAL)
+                return True
+            finally:
+                self._idle.discard(host)
+
+    def finished(self, crawler: DickinsonCrawler):
+        with self._cond:
+            self._done.add(self.host_of(crawler.seed_url))
+            self._cond.notify_all()
+
+
+class MultiHostCrawler:
+    """
+    여러 시드 / 호스트 병렬 크롤링
+
+    시드 호스트마다 DickinsonCrawler 하나를 스레드로 돌린다. 각 크롤러는 자기 호스트 (와 처음 발견해 맡은
+    시드가 아닌 호스트)의 rate_limit_delay만 지키고 (호스트별 politeness), 방문 / 가져온 URL 집합, 별칭 맵,
+    링크 그래프와 max_pages 예산은 공유한다. 전체 시간은 호스트 합이 아니라 가장 느린 호스트 기준.
+    """
+
+    def __init__(
+        self,
+        seed_urls: List[str],
+        max_pages: int = 100,
+        rate_limit_delay: float = 1.0,
+        link_graph: Optional[LinkGraph] = None,
+        alias_map: Optional[AliasMap] = None,
+        repo=None
+    ):
+        """
+        Raises:
+            ValueError: 시드가 없거나 시드 호스트가 MAX_SEED_HOSTS개를 넘음
+        """
+        self.seed_urls = [URLNormalizer.normalize(url) or url for url in seed_urls]
+        self.max_pages = max_pages
+        self.alias_map = alias_map or AliasMap()
+
+        self.visited: Set[str] = set()
+        self.fetched: Set[str] = set()
+        self.coordinator = CrawlCoordinator()
+        self.results: List[dict] = []
+        self.http_stats: dict = {}
+        self.elapsed = 0.0
+
+        # 호스트별 시드 (같은 호스트의 추가 시드는 시작 전에 프런티어로)
+        seeds_by_host: Dict[str, List[str]] = {}
+        for url in dict.fromkeys(self.seed_urls):
+            seeds_by_host.setdefault(CrawlCoordinator.host_of(url), []).append(url)
+        if not seeds_by_host:
+            raise ValueError("At least one seed URL is required")
+        if len(seeds_by_host) > MAX_SEED_HOSTS:
+            raise ValueError(f"Too many seed hosts: {len(seeds_by_host)} (max {MAX_SEED_HOSTS})")
+
+        for host, seeds in seeds_by_host.items():
+            crawler = DickinsonCrawler(
+                seed_url=seeds[0],
+                max_pages=max_pages,
+                rate_limit_delay=rate_limit_delay,
+                link_graph=link_graph,
+                alias_map=self.alias_map,
+                repo=repo,
+                visited=self.visited,
+                fetched=self.fetched,
+                coordinator=self.coordinator
+            )
+            for seed in seeds[1:]:
+                crawler.inbox.put((self.alias_map.resolve(seed), 0))
+            self.coordinator.register(host, crawler)
+
+        logger.info(f"Multi-host crawler initialized: {len(seeds_by_host)} hosts, max_pages={max_pages}")
+
+    @property
+    def crawlers(self) -> Dict[str, DickinsonCrawler]:
+        return self.coordinator.crawlers
+
+    @property
+    def failures(self) -> Dict[str, str]:
+        """호스트별 크롤러의 실패 URL → 사유"""
+        return {url: reason for crawler in self.crawlers.values() for url, reason in crawler.failures.items()}
+
+    def crawl(self) -> List[dict]:
+        """호스트별 크롤러 병렬 실행 (결과는 호스트 순서대로 합침)"""
+        start = time.time()
+        http = next(iter(self.crawlers.values())).extractor.http
+        http_before = http.get_stats()
+
+        # 대기 중인 크롤러는 아직 시작하지 않은 크롤러를 기다리므로 모든 호스트를 동시에 실행
+        with ThreadPoolExecutor(max_workers=len(self.crawlers), thread_name_prefix="crawl-host") as pool:
+            futures = {host: pool.submit(crawler.crawl) for host, crawler in self.crawlers.items()}
+            for host, future in futures.items():
+                try:
+                    self.results.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Crawl failed for host {host}: {e}", exc_info=True)
+
+        self.elapsed = time.time() - start
+        self.http_stats = http.get_stats(since=http_before)
+
+        per_host = ", ".join(f"{host}={len(c.results)}" for host, c in self.crawlers.items())
+        logger.info(f"Multi-host crawl completed: {len(self.results)} pages in {self.elapsed:.2f}s ({per_host})")
+        return self.results
+
+    def get_statistics(self) -> dict:
+        """전체 통계 + 호스트별 통계"""
+        categories: Dict[str, int] = {}
+        total_words = 0
+        for result in self.results:
+            categories[result['category']] = categories.get(result['category'], 0) + 1
+            total_words += result['word_count']
+
+        return {
+            'total_pages': len(self.results),
+            'total_words': total_words,
+            'avg_words_per_page': total_words // len(self.results) if self.results else 0,
+            'categories': categories,
+            'elapsed_s': round(self.elapsed, 2),
+            'routed_links': self.coordinator.routed,
+            'http': self.http_stats,
+            'hosts': {
+                host: {
+                    'pages': len(crawler.results),
+                    'raw_unchanged': crawler.raw_unchanged,
+                    'extraction': crawler.extractor.get_extraction_stats(),
+                    'frontier': crawler.queue.get_statistics()
+                }
+                for host, crawler in self.crawlers.items()
+            }
+        }
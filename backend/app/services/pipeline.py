@@ -0,0 +1,160 @@
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import json
+import uuid
+import zlib
+
+from app.core.logger import logger
+
+
+# 큐 이름 (celery_app task_routes)
+CRAWL_QUEUE = "crawl"        # 전체 사이트 / 증분 크롤링 (prefork, 동시성 1 - 몇 시간 걸릴 수 있음)
+URL_CRAWL_QUEUE = "crawl_urls"  # 단일 URL / URL 목록 크롤링 (prefork, 전용 워커 - 전체 크롤링 뒤에 밀리지 않도록)
+FETCH_QUEUE = "fetch"        # 페이지 단위 fetch (threads 풀, 높은 동시성)
+EXTRACT_QUEUE = "extract"    # HTML 파싱 / 추출 (prefork, CPU 코어 수)
+PERSIST_QUEUE = "persist"    # MongoDB / Redis 쓰기 (threads 풀)
+EMBED_QUEUE = "embed"        # 청킹 / 임베딩 / 벡터 저장 (prefork, 낮은 동시성)
+
+# Redis 키
+STAGE_KEY_PREFIX = "pipeline:stage:"          # 단계 사이에 넘기는 페이지 데이터 (압축 JSON)
+INDEX_PENDING_KEY = "pipeline:index:pending"  # 저장 후 색인 대기 URL → 변경 섹션 (JSON)
+INDEX_FLUSH_KEY = "pipeline:index:flush"      # 색인 flush 예약 표시
+HOST_SLOT_PREFIX = "pipeline:host:"           # 호스트별 다음 요청 가능 시각
+
+# 다음 단계가 가져가지 않은 데이터는 이 시간 후 삭제 (워커 장애 / 큐 적체 대비)
+STAGE_TTL = 60 * 60 * 6
+# 저장된 페이지를 모아 한 번에 색인하기까지 기다리는 시간 (초)
+INDEX_FLUSH_DELAY = 30
+
+# fetch 단계 호스트별 politeness (모든 fetch 워커 / 스레드 공통, 크롤러의 rate_limit_delay와 같은 간격)
+HOST_FETCH_INTERVAL = 1.0
+# 예약한 자리가 이보다 멀면 스레드를 잡고 기다리지 않고 작업을 그 시각에 한 번 다시 실행
+MAX_FETCH_WAIT = 5.0
+# 이보다 먼 자리는 예약하지 않음 (Redis 브로커 visibility_timeout 1시간보다 짧게, ETA 작업 중복 전달 방지)
+MAX_RESERVE_AHEAD = 30 * 60
+# fetch_page 재시도 상한 (예약 전 대기 + 예약한 자리 1번, 한 호스트에 수만 URL이 몰려도 충분하게)
+MAX_FETCH_RETRIES = 12
+
+# 호스트의 다음 요청 시각을 원자적으로 예약 (Redis 서버 시각 기준, 워커 간 시계 차이 무관)
+# 반환: 기다릴 초 (예약함) / 음수면 -(기다릴 초) (max_ahead 초과, 예약 안 함)
+_RESERVE_SLOT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local next_at = tonumber(redis.call('GET', KEYS[1]) or '0')
+local slot = math.max(now, next_at)
+local wait = slot - now
+if wait > tonumber(ARGV[2]) then
+    return tostring(-wait)
+end
+redis.call('SET', KEYS[1], tostring(slot + interval), 'PX', math.ceil((wait + interval) * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class StageStore:
+    """
+    파이프라인 단계 사이의 페이지 데이터 보관 (Redis)
+
+    Celery 메시지에는 키만 넣고 HTML / 추출 결과 본문은 여기에 둔다.
+    브로커 메시지가 작아지고, 각 단계 워커를 따로 늘리거나 줄일 수 있다.
+    """
+
+    def __init__(self, redis=None, ttl: int = STAGE_TTL):
+        if redis is None:
+            from app.core.database import redis_client_binary
+            redis = redis_client_binary
+        self.redis = redis
+        self.ttl = ttl
+
+    def put(self, stage: str, payload: Dict) -> str:
+        """데이터 저장 후 키 반환 (다음 단계 작업 인자)"""
+        key = f"{STAGE_KEY_PREFIX}{stage}:{uuid.uuid4().hex}"
+        data = zlib.compress(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+        self.redis.set(key, data, ex=self.ttl)
+        return key
+
+    def take(self, key: str) -> Optional[Dict]:
+        """데이터 꺼내고 삭제 (만료됐으면 None)"""
+        pipe = self.redis.pipeline()
+        pipe.get(key)
+        pipe.delete(key)
+        data, _ = pipe.execute()
+        if data is None:
+            logger.warning(f"Pipeline stage data expired: {key}")
+            return None
+        return json.loads(zlib.decompress(data))
+
+    def add_index_pending(self, url: str, sections: Optional[List[int]]) -> bool:
+        """
+        색인 대기 URL 추가
+
+        Returns:
+            flush 작업을 새로 예약해야 하면 True (대기 목록이 비어 있다가 처음 추가됨)
+        """
+        pipe = self.redis.pipeline()
+        pipe.hset(INDEX_PENDING_KEY, url, json.dumps(sections))
+        pipe.set(INDEX_FLUSH_KEY, 1, nx=True, ex=INDEX_FLUSH_DELAY * 10)
+        _, scheduled = pipe.execute()
+        return bool(scheduled)
+
+    def take_index_pending(self) -> Tuple[List[str], Dict[str, List[int]]]:
+        """
+        색인 대기 목록을 모두 꺼냄
+
+        Returns:
+            (URL 목록, 섹션 diff가 있는 URL의 변경 섹션)
+        """
+        pipe = self.redis.pipeline()
+        pipe.hgetall(INDEX_PENDING_KEY)
+        pipe.delete(INDEX_PENDING_KEY, INDEX_FLUSH_KEY)
+        pending, _ = pipe.execute()
+
+        urls, changed_sections = [], {}
+        for url, sections in pending.items():
+            url = url.decode('utf-8') if isinstance(url, bytes) else url
+            urls.append(url)
+            sections = json.loads(sections)
+            if sections is not None:
+                changed_sections[url] = sections
+        return urls, changed_sections
+
+
+class HostRateLimiter:
+    """
+    fetch 단계 호스트별 요청 간격 (Redis)
+
+    재크롤링 URL이 페이지마다 fetch 작업으로 흩어져 threads 풀에서 동시에 실행되므로,
+    같은 호스트 요청은 워커 / 스레드와 관계없이 interval 간격으로 한 번씩만 나가게 한다.
+    자리는 호출 순서대로 max_ahead초 앞까지 예약되므로, 대기 중인 작업은 예약한 시각에 한 번만 다시 실행된다.
+    """
+
+    def __init__(self, redis=None, interval: float = HOST_FETCH_INTERVAL, max_ahead: float = MAX_RESERVE_AHEAD):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+        self.interval = interval
+        self.max_ahead = max_ahead
+
+    def reserve(self, url: str) -> Tuple[bool, float]:
+        """
+        URL 호스트의 다음 요청 자리 예약
+
+        Returns:
+            (예약 여부, 기다릴 초) - 예약했으면 그 시각에 요청,
+            아니면 (max_ahead 초과) 다음 빈 자리까지 남은 초
+        """
+        host = urlparse(url).netloc.lower()
+        try:
+            wait = float(self.redis.eval(_RESERVE_SLOT_SCRIPT, 1, HOST_SLOT_PREFIX + host, self.interval, self.max_ahead))
+        except Exception as e:
+            # Redis 오류로 크롤링이 멈추지 않도록 간격만 지키고 진행
+            logger.warning(f"Host rate limiter unavailable for {host}: {e}")
+            return True, self.interval
+        return wait >= 0, abs(wait)
+
+
+def fetched_payload(fetched: Dict) -> Dict:
+    """fetch() 결과 중 추출 단계에 필요한 부분만 (헤더 제외)"""
+    return {key: fetched[key] for key in ('url', 'final_url', 'redirects', 'redirect_statuses', 'html', 'raw_hash')}
@@ -0,0 +1,394 @@
+from typing import Dict, Iterator, List, Optional
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from datetime import datetime
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from app.core.logger import logger
+
+
+# Redis 키 (대상별 프로파일링 스위치, TTL이 지나면 자동으로 꺼짐)
+PROFILE_KEY_PREFIX = "profiling:target:"
+
+# 프로파일링 대상 (Celery 작업 이름 / API 요청)
+PROFILE_TARGETS = ('crawl_full_site', 'incremental_update', 'api')
+# cprofile: 함수별 누적 시간 (.prof, 현재 스레드만)
+# sample: 모든 스레드 스택 샘플링 (.folded, flamegraph.pl / speedscope 입력 형식)
+PROFILE_MODES = ('cprofile', 'sample')
+DEFAULT_PROFILE_TTL = 3600
+MAX_PROFILE_TTL = 6 * 3600  # 켜 둔 채 잊어도 이 시간 안에 꺼짐
+
+# 스택 샘플링 간격 (초)
+SAMPLE_INTERVAL = 0.01
+# tracemalloc 스냅샷에 남길 프레임 수 / 요약 줄 수
+TRACEMALLOC_FRAMES = 10
+MEMORY_TOP_LINES = 30
+
+# 프로파일 디렉토리 이름 (settings.DATA_DIR 하위)
+PROFILE_DIR_NAME = "profiles"
+# 디렉토리에 남길 최대 실행 수 (오래된 것부터 삭제)
+MAX_PROFILE_RUNS = 50
+
+
+# 프로세스당 한 번에 하나만 (cProfile / tracemalloc은 프로세스 전역)
+_active_run = threading.Lock()
+
+
+def default_profile_dir() -> str:
+    from app.core.config import settings
+    return os.path.join(settings.DATA_DIR, PROFILE_DIR_NAME)
+
+
+class ProfilingSwitch:
+    """
+    런타임 프로파일링 스위치 (Redis)
+
+    관리자 엔드포인트가 켜고 끄며, 작업 / 요청은 시작할 때 한 번 읽는다.
+    배포 없이 켤 수 있고 TTL로 자동 해제되므로 켜 둔 채 잊어도 오래 남지 않는다.
+    """
+
+    def __init__(self, redis=None):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+
+    def enable(self, target: str, mode: str = 'sample', ttl: int = DEFAULT_PROFILE_TTL, memory: bool = True) -> Dict:
+        """
+        Raises:
+            ValueError: 알 수 없는 대상 / 모드, ttl 범위 밖
+        """
+        if target not in PROFILE_TARGETS:
+            raise ValueError(f"Unknown profiling target: {target}")
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        if not 0 < ttl <= MAX_PROFILE_TTL:
+            raise ValueError(f"ttl must be between 1 and {MAX_PROFILE_TTL} seconds")
+
+        config = {
+            'mode': mode,
+            'memory': memory,
+            'enabled_at': datetime.utcnow().isoformat(),
+            'ttl': ttl
+        }
+        self.redis.set(PROFILE_KEY_PREFIX + target, json.dumps(config), ex=ttl)
+        logger.info(f"Profiling enabled: {target} ({mode}, memory={memory}, ttl={ttl}s)")
+        return config
+
+    def disable(self, target: str) -> bool:
+        removed = bool(self.redis.delete(PROFILE_KEY_PREFIX + target))
+        if removed:
+            logger.info(f"Profiling disabled: {target}")
+        return removed
+
+    def get(self, target: str) -> Optional[Dict]:
+        """켜져 있으면 설정, 꺼져 있거나 Redis 오류면 None (프로파일링 때문에 작업이 실패하지 않도록)"""
+        try:
+            value = self.redis.get(PROFILE_KEY_PREFIX + target)
+        except Exception as e:
+            logger.warning(f"Profiling switch read failed: {e}")
+            return None
+        return json.loads(value) if value else None
+
+    def get_all(self) -> Dict[str, Optional[Dict]]:
+        return {target: self.get(target) for target in PROFILE_TARGETS}
+
+
+class StackSampler:
+    """
+    모든 스레드의 호출 스택을 주기적으로 샘플링
+
+    결과는 "스레드;바깥 함수;...;안쪽 함수 횟수" 한 줄씩의 collapsed stack 형식이라
+    flamegraph.pl / speedscope에 바로 넣을 수 있다. cProfile과 달리 호스트별 크롤러 스레드도 잡힌다.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _prune_old_runs(directory: str, keep: int = MAX_PROFILE_RUNS):
+    """실행 단위(같은 접두사 파일들)로 오래된 프로파일 삭제"""
+    runs: Dict[str, List[str]] = {}
+    for name in os.listdir(directory):
+        runs.setdefault(name.split(".", 1)[0], []).append(name)
+    for run in sorted(runs)[:-keep or None]:
+        for name in runs[run]:
+            os.remove(os.path.join(directory, name))
+
+
+class ProfileRun:
+    """
+    프로파일링 실행 하나 (시작 / 중지 / 저장을 나눠 호출할 수 있게)
+
+    pause()는 시작한 스레드에서 호출해야 하고 (cProfile은 스레드별),
+    파일을 쓰는 finish()는 다른 스레드에서 호출해도 된다 (API 미들웨어는 스레드풀에서 저장).
+    """
+
+    def __init__(self, name: str, mode: str = 'sample', memory: bool = True, directory: Optional[str] = None):
+        """
+        Raises:
+            ValueError: 알 수 없는 모드
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+
+        self.mode = mode
+        self.memory = memory
+        self.directory = directory or default_profile_dir()
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{name}-{os.getpid()}"
+        self.base = os.path.join(self.directory, run_id)
+        self.result: Dict = {'run_id': run_id, 'mode': mode, 'files': []}
+
+        self._profiler = cProfile.Profile() if mode == 'cprofile' else None
+        self._sampler = StackSampler() if mode == 'sample' else None
+        self._started_tracemalloc = False
+        self._start = 0.0
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._started_tracemalloc = self.memory and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        self._start = time.time()
+        if self._profiler is not None:
+            self._profiler.enable()
+        else:
+            self._sampler.start()
+
+    def pause(self):
+        """측정 중지 (시작한 스레드에서, 가벼움)"""
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.result['elapsed_s'] = round(time.time() - self._start, 2)
+
+    def finish(self) -> Dict:
+        """샘플러 정지 + 파일 저장 (디스크 쓰기 / 스냅샷이라 느릴 수 있음)"""
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.base + ".prof")
+            self.result['files'].append(self.base + ".prof")
+        else:
+            self._sampler.stop()
+            self._sampler.write(self.base + ".folded")
+            self.result['files'].append(self.base + ".folded")
+            self.result['samples'] = self._sampler.samples
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+            snapshot.dump(self.base + ".tracemalloc")
+            with open(self.base + ".mem.txt", "w") as f:
+                f.write(f"current={current / 1e6:.1f}MB peak={peak / 1e6:.1f}MB\n")
+                for stat in snapshot.statistics('lineno')[:MEMORY_TOP_LINES]:
+                    f.write(f"{stat}\n")
+            self.result['files'] += [self.base + ".tracemalloc", self.base + ".mem.txt"]
+            self.result['peak_mb'] = round(peak / 1e6, 1)
+
+        _prune_old_runs(self.directory)
+        logger.info(
+            f"Profile saved: {self.result['run_id']} ({self.mode}, {self.result.get('elapsed_s')}s)",
+            extra={'always': True, 'profile_files': self.result['files']}
+        )
+        return self.result
+
+
+@contextmanager
+def profile_run(
+    name: str,
+    mode: str = 'sample',
+    memory: bool = True,
+    directory: Optional[str] = None
+) -> Iterator[Dict]:
+    """
+    블록 실행을 프로파일링해 파일로 저장
+
+    {시각}-{이름}-{pid}.prof / .folded (모드별), .tracemalloc (스냅샷) + .mem.txt (상위 할당 위치).
+    yield한 dict의 'files'에 저장 경로가 종료 시 채워진다.
+    memory=True면 tracemalloc이 모든 할당을 추적하므로 실행이 몇 배 느려질 수 있다.
+
+    Raises:
+        ValueError: 알 수 없는 모드
+    """
+    run = ProfileRun(name, mode=mode, memory=memory, directory=directory)
+    run.start()
+    try:
+        yield run.result
+    finally:
+        run.pause()
+        run.finish()
+
+
+@contextmanager
+def maybe_profile(target: str, switch: Optional[ProfilingSwitch] = None) -> Iterator[Optional[Dict]]:
+    """
+    스위치가 켜져 있을 때만 profile_run (꺼져 있으면 Redis GET 한 번뿐)
+
+    사용:
+        with maybe_profile('crawl_full_site'):
+            ...
+    """
+    try:
+        config = (switch or ProfilingSwitch()).get(target)
+    except Exception as e:
+        logger.warning(f"Profiling switch unavailable: {e}")
+        config = None
+
+    with profile_with_config(target, config) as result:
+        yield result
+
+
+def start_profile(target: str, config: Optional[Dict]) -> Optional[ProfileRun]:
+    """
+    이미 읽은 스위치 설정으로 프로파일링 시작 (설정이 없거나 이 프로세스에서 이미 실행 중이면 None)
+
+    시작했으면 같은 스레드에서 pause() 후 finish_profile()로 끝낸다.
+    """
+    if not config or not _active_run.acquire(blocking=False):
+        return None
+    try:
+        run = ProfileRun(target, mode=config.get('mode', 'sample'), memory=config.get('memory', True))
+        run.start()
+    except Exception:
+        _active_run.release()
+        raise
+    return run
+
+
+def finish_profile(run: ProfileRun) -> Dict:
+    """파일 저장 후 프로세스 잠금 해제 (다른 스레드에서 호출 가능)"""
+    try:
+        return run.finish()
+    finally:
+        _active_run.release()
+
+
+@contextmanager
+def profile_with_config(target: str, config: Optional[Dict]) -> Iterator[Optional[Dict]]:
+    """
+    이미 읽은 스위치 설정으로 profile_run (설정이 없으면 아무것도 하지 않고 None)
+
+    이 프로세스에서 이미 프로파일링 중이면 겹치지 않도록 건너뛴다.
+    """
+    run = start_profile(target, config)
+    if run is None:
+        yield None
+        return
+
+    try:
+        yield run.result
+    finally:
+        run.pause()
+        finish_profile(run)
+
+
+def profiled(target: str):
+    """
+    함수 실행을 maybe_profile로 감싸는 데코레이터 (Celery 작업용)
+
+    사용:
+        @celery_app.task(bind=True)
+        @profiled('crawl_full_site')
+        def crawl_full_site(self, ...):
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with maybe_profile(target):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def list_profiles(directory: Optional[str] = None) -> List[Dict]:
+    """저장된 프로파일 파일 (최신순)"""
+    directory = directory or default_profile_dir()
+    if not os.path.isdir(directory):
+        return []
+
+    files = []
+    for name in os.listdir(directory):
+        stat = os.stat(os.path.join(directory, name))
+        files.append({
+            'name': name,
+            'size': stat.st_size,
+            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+        })
+    return sorted(files, key=lambda f: f['name'], reverse=True)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import tempfile
+
+    def busy(n: int) -> int:
+        return sum(i * i for i in range(n))
+
+    def allocate() -> list:
+        return [str(i) * 10 for i in range(200_000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in PROFILE_MODES:
+            with profile_run("demo", mode=mode, directory=tmp) as run:
+                data = allocate()
+                for _ in range(5):
+                    busy(100_000)
+            print(f"\n{mode}: {run['elapsed_s']}s, peak={run.get('peak_mb')}MB, samples={run.get('samples')}")
+            for path in run['files']:
+                print(f"  {os.path.basename(path)} ({os.path.getsize(path)} bytes)")
+
+        folded = next(p for p in os.listdir(tmp) if p.endswith(".folded"))
+        print(f"\nTop stacks ({folded}):")
+        with open(os.path.join(tmp, folded)) as f:
+            for line in f.readlines()[:3]:
+                print(f"  {line.strip()[-100:]}")
@@ -0,0 +1,102 @@
+from typing import Callable, Dict, Optional
+import json
+import time
+
+from app.core.logger import logger
+
+
+# Redis 키
+PROGRESS_CHANNEL_PREFIX = "progress:"      # pub/sub 채널
+PROGRESS_LAST_PREFIX = "progress:last:"    # 마지막 이벤트 (늦게 구독한 클라이언트용)
+PROGRESS_TTL = 60 * 60 * 24
+
+# 발행 간격 (이 간격 안의 이벤트는 합쳐서 최신 것만 발행)
+MIN_PUBLISH_INTERVAL = 0.5
+# Celery result backend(update_state) 갱신 간격 (폴링 호환용, 드물게)
+STATE_UPDATE_INTERVAL = 10.0
+
+TERMINAL_STATES = ('SUCCESS', 'FAILURE', 'REVOKED')
+
+
+def progress_channel(task_id: str) -> str:
+    return PROGRESS_CHANNEL_PREFIX + task_id
+
+
+def progress_last_key(task_id: str) -> str:
+    return PROGRESS_LAST_PREFIX + task_id
+
+
+class ProgressPublisher:
+    """
+    Celery 작업 진행률 발행기 (Redis pub/sub)
+
+    페이지마다 호출되어도 MIN_PUBLISH_INTERVAL 간격으로 합쳐서 발행하고,
+    result backend에는 STATE_UPDATE_INTERVAL 간격으로만 기록한다.
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        redis=None,
+        state_callback: Optional[Callable[[Dict], None]] = None,
+        min_interval: float = MIN_PUBLISH_INTERVAL,
+        state_interval: float = STATE_UPDATE_INTERVAL
+    ):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+        self.task_id = task_id
+        self.state_callback = state_callback
+        self.min_interval = min_interval
+        self.state_interval = state_interval
+
+        self._last_publish = 0.0
+        self._last_state = 0.0
+        self._pending: Optional[Dict] = None
+
+    def _send(self, event: Dict):
+        payload = json.dumps(event, default=str)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(progress_last_key(self.task_id), payload, ex=PROGRESS_TTL)
+            pipe.publish(progress_channel(self.task_id), payload)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Progress publish failed for {self.task_id}: {e}")
+
+    def publish(self, meta: Dict, state: str = 'PROGRESS', force: bool = False):
+        """
+        진행률 이벤트 (합쳐서 발행)
+
+        Args:
+            meta: {'current', 'total', 'status', ...}
+            state: Celery 상태
+            force: 간격과 무관하게 즉시 발행
+        """
+        now = time.monotonic()
+        self._pending = {'task_id': self.task_id, 'state': state, 'ts': time.time(), **meta}
+
+        if force or now - self._last_publish >= self.min_interval:
+            self._send(self._pending)
+            self._pending = None
+            self._last_publish = now
+
+        if self.state_callback and (force or now - self._last_state >= self.state_interval):
+            try:
+                self.state_callback(meta)
+            except Exception as e:
+                logger.warning(f"State update failed for {self.task_id}: {e}")
+            self._last_state = now
+
+    def flush(self):
+        """합쳐 둔 마지막 이벤트 발행"""
+        if self._pending:
+            self._send(self._pending)
+            self._pending = None
+            self._last_publish = time.monotonic()
+
+    def finish(self, state: str = 'SUCCESS', meta: Optional[Dict] = None):
+        """종료 이벤트 (구독자는 이 이벤트를 받고 스트림을 닫음)"""
+        self._pending = None
+        self._send({'task_id': self.task_id, 'state': state, 'ts': time.time(), **(meta or {})})
@@ -0,0 +1,164 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import hashlib
+import json
+import re
+import unicodedata
+
+from app.core.logger import logger
+
+
+# Redis 키 (masterdocen.md Redis Query Cache)
+QUERY_KEY_PREFIX = "cache:query:"
+SOURCE_KEY_PREFIX = "cache:source:"   # normalized_url → 해당 URL을 인용한 쿼리 키 집합
+STATS_KEY = "cache:stats"             # hits / misses / evictions
+
+QUERY_CACHE_TTL = 3600  # 1시간
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    쿼리 정규화 (캐시 적중률 향상)
+
+    "What are the CS requirements?" / "what are the cs requirements" → 같은 키
+    """
+    query = unicodedata.normalize('NFKC', query or '').lower()
+    query = _PUNCTUATION.sub(' ', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+def query_hash(query: str) -> str:
+    """정규화된 쿼리 해시 (16자리)"""
+    return hashlib.sha256(normalize_query(query).encode('utf-8')).hexdigest()[:16]
+
+
+class QueryCache:
+    """
+    Redis 답변 캐시
+
+    답변이 인용한 source URL마다 역색인(cache:source:{url})을 유지하여
+    페이지가 갱신되면 그 페이지를 인용한 답변만 정확히 제거한다.
+    """
+
+    def __init__(self, redis=None, ttl: int = QUERY_CACHE_TTL):
+        if redis is None:
+            from app.core.database import redis_client
+            redis = redis_client
+        self.redis = redis
+        self.ttl = ttl
+
+    def get(self, query: str) -> Optional[Dict]:
+        """캐시 조회 (hit/miss 카운트)"""
+        key = QUERY_KEY_PREFIX + query_hash(query)
+        try:
+            value = self.redis.get(key)
+            self.redis.hincrby(STATS_KEY, 'hits' if value else 'misses', 1)
+        except Exception as e:
+            logger.warning(f"Query cache read failed: {e}")
+            return None
+
+        return json.loads(value) if value else None
+
+    def set(self, query: str, answer: Dict) -> str:
+        """
+        답변 저장 + 인용 URL 역색인 등록
+
+        Args:
+            query: 사용자 질문
+            answer: {'answer': str, 'sources': [normalized_url, ...], ...}
+
+        Returns:
+            캐시 키
+        """
+        key = QUERY_KEY_PREFIX + query_hash(query)
+        sources: List[str] = answer.get('sources') or []
+
+        payload = {
+            **answer,
+            'query': query,
+            'cached_at': datetime.now().isoformat()
+        }
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(key, json.dumps(payload, default=str), ex=self.ttl)
+            for source in sources:
+                source_key = SOURCE_KEY_PREFIX + source
+                pipe.sadd(source_key, key)
+                # 역색인은 가장 늦게 만료되는 답변만큼 유지
+                pipe.expire(source_key, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Query cache write failed: {e}")
+
+        return key
+
+    def invalidate_source(self, normalized_url: str) -> int:
+        """
+        해당 URL을 인용한 답변 제거
+
+        Returns:
+            제거된 캐시 항목 수
+        """
+        return self.invalidate_sources([normalized_url])
+
+    def invalidate_sources(self, normalized_urls: List[str]) -> int:
+        """
+        URL 목록 중 하나라도 인용한 답변 제거 (재색인 후 한 번에)
+
+        Returns:
+            제거된 캐시 항목 수
+        """
+        source_keys = [SOURCE_KEY_PREFIX + url for url in normalized_urls]
+        if not source_keys:
+            return 0
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for source_key in source_keys:
+                pipe.smembers(source_key)
+            keys = set().union(*pipe.execute())
+            if not keys:
+                return 0
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(*keys)
+            pipe.delete(*source_keys)
+            evicted = pipe.execute()[0]
+
+            if evicted:
+                self.redis.hincrby(STATS_KEY, 'evictions', evicted)
+                logger.info(f"Evicted {evicted} cached answers citing {len(source_keys)} pages")
+            return evicted
+
+        except Exception as e:
+            logger.warning(f"Query cache invalidation failed for {len(source_keys)} pages: {e}")
+            return 0
+
+    def get_stats(self) -> Dict:
+        """hit / miss / eviction 카운터"""
+        raw = self.redis.hgetall(STATS_KEY) or {}
+        hits = int(raw.get('hits', 0))
+        misses = int(raw.get('misses', 0))
+        lookups = hits + misses
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': int(raw.get('evictions', 0)),
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0
+        }
+
+    def reset_stats(self):
+        """카운터 초기화"""
+        self.redis.delete(STATS_KEY)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    print(normalize_query("What are the CS   requirements?"))
+    print(normalize_query("what are the cs requirements"))
+    print(query_hash("What are the CS requirements?") == query_hash("what are the cs requirements"))
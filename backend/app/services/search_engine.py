@@ -0,0 +1,449 @@
+from typing import Dict, List, Optional, Sequence, TypedDict
+import math
+import re
+import threading
+import time
+
+import numpy as np
+
+from app.core.logger import logger
+from app.services.chunker import Chunk, HeaderChunker, iter_corpus_chunks
+
+
+# 하이브리드 점수 가중치 (ai_context.md 6) Search)
+VECTOR_WEIGHT = 0.7
+KEYWORD_WEIGHT = 0.3
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 카테고리 비트마스크 (uint64 → 최대 64개, 초과분은 마지막 비트 공유)
+MAX_CATEGORY_BITS = 64
+
+# 인접 청크 병합 후보 배수 (top_k × N개 후보에서 병합)
+CANDIDATE_MULTIPLIER = 4
+
+# 임베딩 배치 (색인 구축 시)
+BUILD_EMBED_BATCH = 512
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'i',
+    'in', 'is', 'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+    'what', 'when', 'where', 'which', 'who', 'will', 'with', 'do', 'does', 'can'
+])
+
+
+class Retrieved(TypedDict):
+    text: str
+    source_url: str
+    title: str
+    section: str
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    """BM25 토큰화 (소문자, 영숫자, 불용어 제거)"""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _min_max(scores: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """mask 범위 내 min-max 정규화 (범위 밖은 0)"""
+    out = np.zeros_like(scores)
+    if not mask.any():
+        return out
+    selected = scores[mask]
+    low, high = selected.min(), selected.max()
+    if high > low:
+        out[mask] = (selected - low) / (high - low)
+    elif high > 0:
+        out[mask] = 1.0
+    return out
+
+
+class HybridSearchEngine:
+    """
+    인메모리 하이브리드 검색 (BM25 + 벡터)
+
+    - 역색인: 용어 → (청크 ID 배열, BM25 가중치 배열), 가중치는 구축 시 미리 계산
+    - 벡터: 정규화된 (n, dim) float32 행렬, 코사인 = 행렬곱
+    - 카테고리 필터: 청크별 uint64 비트마스크
+    """
+
+    def __init__(self, embedder=None):
+        self.embedder = embedder
+        self.size = 0
+
+        self.texts: List[str] = []
+        self.source_urls: List[str] = []
+        self.titles: List[str] = []
+        self.sections: List[str] = []
+        self.chunk_index = np.zeros(0, dtype=np.int32)
+        self.url_ids = np.zeros(0, dtype=np.int32)
+
+        self.category_bits: Dict[str, int] = {}
+        self.chunk_categories = np.zeros(0, dtype=np.uint64)
+
+        self.postings: Dict[str, tuple] = {}
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+    # ==================== 색인 구축 ====================
+
+    def _category_bit(self, category: str) -> np.uint64:
+        bit = self.category_bits.get(category)
+        if bit is None:
+            bit = min(len(self.category_bits), MAX_CATEGORY_BITS - 1)
+            self.category_bits[category] = bit
+        return np.uint64(1) << np.uint64(bit)
+
+    def build(self, chunks: Sequence[Chunk], vectors: np.ndarray) -> "HybridSearchEngine":
+        """
+        청크 + 임베딩으로 색인 구축
+
+        Args:
+            chunks: 청크 리스트
+            vectors: (len(chunks), dim) 임베딩
+        """
+        start = time.time()
+        n = len(chunks)
+
+        self.texts = [c.text for c in chunks]
+        self.source_urls = [c.source_url for c in chunks]
+        self.titles = [c.title for c in chunks]
+        self.sections = [c.section for c in chunks]
+        self.chunk_index = np.fromiter((c.chunk_index for c in chunks), dtype=np.int32, count=n)
+
+        url_lookup: Dict[str, int] = {}
+        self.url_ids = np.fromiter(
+            (url_lookup.setdefault(c.source_url, len(url_lookup)) for c in chunks),
+            dtype=np.int32, count=n
+        )
+
+        self.category_bits = {}
+        self.chunk_categories = np.fromiter(
+            (self._category_bit(c.category) for c in chunks), dtype=np.uint64, count=n
+        )
+
+        # 역색인 (용어 빈도)
+        term_docs: Dict[str, List[int]] = {}
+        term_tfs: Dict[str, List[int]] = {}
+        doc_len = np.zeros(n, dtype=np.float32)
+
+        for i, chunk in enumerate(chunks):
+            counts: Dict[str, int] = {}
+            for token in tokenize(f"{chunk.title} {chunk.text}"):
+                counts[token] = counts.get(token, 0) + 1
+            doc_len[i] = sum(counts.values())
+            for token, tf in counts.items():
+                term_docs.setdefault(token, []).append(i)
+                term_tfs.setdefault(token, []).append(tf)
+
+        # BM25 가중치 미리 계산: idf × tf(k1+1) / (tf + k1(1 - b + b·dl/avgdl))
+        avgdl = float(doc_len.mean()) if n else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / max(avgdl, 1e-6))
+
+        self.postings = {}
+        for token, docs in term_docs.items():
+            ids = np.asarray(docs, dtype=np.int32)
+            tf = np.asarray(term_tfs[token], dtype=np.float32)
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            weights = idf * tf * (BM25_K1 + 1) / (tf + norm[ids])
+            self.postings[token] = (ids, weights.astype(np.float32))
+
+        # 벡터 행렬 (L2 정규화)
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(n, -1) if n else np.zeros((0, 0), np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True) if n else None
+        self.matrix = matrix / np.maximum(norms, 1e-12) if n else matrix
+
+        self.size = n
+        logger.info(
+            f"Search index built: {n} chunks, {len(self.postings)} terms, "
+            f"{len(url_lookup)} pages in {time.time() - start:.2f}s"
+        )
+        return self
+
+    def build_from_collection(self, collection=None, chunker: Optional[HeaderChunker] = None) -> "HybridSearchEngine":
+        """documents 컬렉션에서 청킹 + 임베딩(캐시)으로 색인 구축"""
+        if self.embedder is None:
+            from app.services.embedding_service import EmbeddingService
+            self.embedder = EmbeddingService()
+
+        chunks: List[Chunk] = []
+        blocks: List[np.ndarray] = []
+        buffer: List[Chunk] = []
+
+        for chunk in iter_corpus_chunks(collection, chunker):
+            buffer.append(chunk)
+            if len(buffer) >= BUILD_EMBED_BATCH:
+                blocks.append(self.embedder.embed_chunks(buffer))
+                chunks.extend(buffer)
+                buffer = []
+
+        if buffer:
+            blocks.append(self.embedder.embed_chunks(buffer))
+            chunks.extend(buffer)
+
+        vectors = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+        return self.build(chunks, vectors)
+
+    # ==================== 점수 계산 ====================
+
+    def filter_mask(self, filters: Optional[Dict]) -> np.ndarray:
+        """메타 필터 → 불리언 마스크 (카테고리는 비트마스크 AND)"""
+        mask = np.ones(self.size, dtype=bool)
+        if not filters:
+            return mask
+
+        categories = filters.get('category')
+        if categories:
+            if isinstance(categories, str):
+                categories = [categories]
+            wanted = np.uint64(0)
+            for category in categories:
+                bit = self.category_bits.get(category)
+                if bit is not None:
+                    wanted |= np.uint64(1) << np.uint64(bit)
+            mask &= (self.chunk_categories & wanted) != 0
+
+        exclude = filters.get('exclude_urls')
+        if exclude:
+            mask &= ~np.isin(np.asarray(self.source_urls, dtype=object), list(exclude))
+
+        return mask
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        """쿼리 BM25 점수 (전체 청크, 벡터화)"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is not None:
+                ids, weights = posting
+                # 한 용어의 포스팅 내 ID는 유일하므로 fancy-index 누적 가능
+                scores[ids] += weights
+        return scores
+
+    def vector_scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """코사인 유사도 (정규화 행렬 × 쿼리)"""
+        q = np.asarray(query_vector, dtype=np.float32).ravel()
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        return self.matrix @ q
+
+    def score(self, query: str, query_vector: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """score = 0.7·norm(vector) + 0.3·norm(bm25), 필터 밖은 -inf"""
+        fused = (
+            VECTOR_WEIGHT * _min_max(self.vector_scores(query_vector), mask)
+            + KEYWORD_WEIGHT * _min_max(self.bm25_scores(query), mask)
+        )
+        fused[~mask] = -np.inf
+        return fused
+
+    # ==================== 검색 ====================
+
+    def _merge_adjacent(self, ranked: np.ndarray, scores: np.ndarray, top_k: int) -> List[Retrieved]:
+        """
+        같은 URL의 인접 청크 병합
+
+        점수순으로 훑으면서 이미 선택된 구간과 chunk_index가 맞닿으면
+        그 구간에 합친다. 청크 간 오버랩 문단은 한 번만 남긴다.
+        """
+        spans: List[Dict] = []
+        by_url: Dict[int, List[Dict]] = {}
+
+        for i in ranked:
+            # 필터 밖(-inf) 또는 관련도 0 이하 → 이후 후보도 모두 해당
+            if not np.isfinite(scores[i]) or scores[i] <= 0:
+                break
+            url_id = int(self.url_ids[i])
+            idx = int(self.chunk_index[i])
+
+            merged = False
+            for span in by_url.get(url_id, []):
+                if span['start'] - 1 <= idx <= span['end'] + 1:
+                    if idx < span['start']:
+                        span['start'], span['members'] = idx, [i] + span['members']
+                    elif idx > span['end']:
+                        span['end'], span['members'] = idx, span['members'] + [i]
+                    merged = True
+                    break
+
+            if not merged:
+                if len(spans) >= top_k:
+                    continue
+                span = {'start': idx, 'end': idx, 'members': [i], 'score': float(scores[i])}
+                spans.append(span)
+                by_url.setdefault(url_id, []).append(span)
+
+        results: List[Retrieved] = []
+        for span in spans:
+            first = span['members'][0]
+            paragraphs: List[str] = []
+            for member in span['members']:
+                for paragraph in self.texts[member].split('\n'):
+                    # 오버랩 제거: 직전 청크 꼬리에 이미 있는 문단 스킵
+                    if paragraph not in paragraphs[-20:]:
+                        paragraphs.append(paragraph)
+            results.append(Retrieved(
+                text='\n'.join(paragraphs),
+                source_url=self.source_urls[first],
+                title=self.titles[first],
+                section=self.sections[first],
+                score=round(span['score'], 4)
+            ))
+
+        return results
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict] = None,
+        query_vector: Optional[np.ndarray] = None
+    ) -> List[Retrieved]:
+        """
+        하이브리드 검색
+
+        Args:
+            query: 사용자 질문
+            top_k: 반환할 컨텍스트 수 (병합 후)
+            filters: {'category': str | list, 'exclude_urls': list}
+            query_vector: 미리 계산된 쿼리 임베딩 (없으면 embedder 사용)
+        """
+        if self.size == 0:
+            return []
+
+        if query_vector is None:
+            query_vector = self.embedder.embed_query(query)
+
+        mask = self.filter_mask(filters)
+        scores = self.score(query, query_vector, mask)
+
+        n_candidates = min(self.size, top_k * CANDIDATE_MULTIPLIER)
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return self._merge_adjacent(ranked, scores, top_k)
+
+
+# ==================== 전역 엔진 ====================
+
+# 색인이 바뀔 때마다 올리는 버전 (index_documents / rebuild / sweep 후), 쿼리마다 비교
+SEARCH_VERSION_KEY = "search:index:version"
+
+_engine: Optional[HybridSearchEngine] = None
+_engine_version: Optional[str] = None
+# 구축은 한 번에 하나만 (검색은 이 잠금을 기다리지 않음, 최초 구축 / 강제 재구축만 대기)
+_build_lock = threading.Lock()
+
+
+def bump_search_version(redis=None) -> Optional[int]:
+    """색인 변경 알림 (각 프로세스의 엔진이 다음 쿼리에서 재구축)"""
+    if redis is None:
+        from app.core.database import redis_client
+        redis = redis_client
+    try:
+        return redis.incr(SEARCH_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Search index version bump failed: {e}")
+        return None
+
+
+def _current_version(redis=None) -> Optional[str]:
+    """Redis의 색인 버전 (Redis 오류면 None → 지금 엔진 계속 사용)"""
+    if redis is None:
+        from app.core.database import redis_client
+        redis = redis_client
+    try:
+        version = redis.get(SEARCH_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Search index version read failed: {e}")
+        return None
+    if isinstance(version, bytes):
+        version = version.decode('utf-8')
+    return str(version or 0)
+
+
+def _build(version: Optional[str]):
+    """새 엔진 구축 후 참조만 교체 (구축 중에도 다른 스레드는 이전 엔진으로 검색)"""
+    global _engine, _engine_version
+    engine = HybridSearchEngine().build_from_collection()
+    _engine, _engine_version = engine, version
+
+
+def _refresh_in_background(version: Optional[str]):
+    try:
+        _build(version)
+    except Exception as e:
+        logger.error(f"Search index refresh failed: {e}", exc_info=True)
+    finally:
+        _build_lock.release()
+
+
+def get_engine(rebuild: bool = False, redis=None) -> HybridSearchEngine:
+    """
+    프로세스 전역 검색 엔진
+
+    최초 호출 시 documents 컬렉션에서 구축한다. 이후에는 쿼리마다 Redis 색인 버전을 비교해
+    바뀌었으면 백그라운드 스레드에서 다시 구축하고, 그동안은 이전 엔진으로 응답한다.
+    rebuild=True면 호출한 스레드에서 바로 다시 구축한다.
+    """
+    version = _current_version(redis)
+    engine = _engine
+
+    if engine is not None and not rebuild:
+        if version is not None and version != _engine_version and _build_lock.acquire(blocking=False):
+            threading.Thread(
+                target=_refresh_in_background, args=(version,), name="search-refresh", daemon=True
+            ).start()
+        return engine
+
+    with _build_lock:
+        if _engine is None or rebuild:
+            _build(version)
+        return _engine
+
+
+def hybrid_search(query: str, top_k: int = 10, filters: Optional[Dict] = None) -> List[Retrieved]:
+    """하이브리드 검색 (ai_context.md 계약)"""
+    return get_engine().search(query, top_k=top_k, filters=filters)
+
+
+# 테스트 코드 (지연 시간 벤치마크)
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    dim = 384
+    vocab = [f"term{i}" for i in range(20000)]
+    # Zipf 분포 단어 빈도
+    weights = 1.0 / np.arange(1, len(vocab) + 1)
+    weights /= weights.sum()
+    categories = ['academics', 'admissions', 'campus_life', 'news', 'events', 'about', 'general']
+
+    def make_corpus(n: int):
+        chunks = []
+        words = rng.choice(len(vocab), size=(n, 200), p=weights)
+        for i in range(n):
+            chunks.append(Chunk(
+                id=f"c{i}", doc_id=f"d{i // 5}", chunk_index=i % 5,
+                text=' '.join(vocab[w] for w in words[i]),
+                section="h2:Section", title=f"Page {i // 5}",
+                source_url=f"https://www.dickinson.edu/page/{i // 5}",
+                category=categories[(i // 5) % len(categories)]
+            ))
+        return chunks, rng.standard_normal((n, dim)).astype(np.float32)
+
+    print(f"\n{'='*60}")
+    print("Hybrid Search Latency (query embedding excluded)")
+    for n in (5000, 50000):
+        chunks, vectors = make_corpus(n)
+        engine = HybridSearchEngine().build(chunks, vectors)
+
+        for label, filters in (("no filter", None), ("category", {'category': ['academics', 'news']})):
+            latencies = []
+            for _ in range(300):
+                query = ' '.join(vocab[w] for w in rng.choice(len(vocab), size=6, p=weights))
+                qv = rng.standard_normal(dim).astype(np.float32)
+                t0 = time.perf_counter()
+                engine.search(query, top_k=10, filters=filters, query_vector=qv)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"  {n:>6} chunks, {label:<9}: p50 {p50:6.2f} ms | p99 {p99:6.2f} ms")
@@ -0,0 +1,56 @@
+from typing import Optional
+import hashlib
+
+from app.core.logger import logger
+
+
+# Redis 키 (작업 종류 + 정규화 URL 해시 → 진행 중인 Celery 작업 ID)
+SINGLE_FLIGHT_PREFIX = "singleflight:"
+# 워커가 죽어 해제하지 못해도 이 시간이 지나면 다시 요청 가능 (단일 페이지 작업보다 충분히 길게)
+SINGLE_FLIGHT_TTL = 600
+
+# 자기 작업 ID일 때만 삭제 (TTL 만료 후 다른 작업이 잡은 키를 지우지 않도록)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def single_flight_key(kind: str, normalized_url: str) -> str:
+    digest = hashlib.sha1(normalized_url.encode('utf-8')).hexdigest()[:16]
+    return f"{SINGLE_FLIGHT_PREFIX}{kind}:{digest}"
+
+
+async def claim_async(redis, key: str, task_id: str, ttl: int = SINGLE_FLIGHT_TTL) -> Optional[str]:
+    """
+    같은 키의 진행 중인 작업이 없으면 task_id로 선점
+
+    Returns:
+        선점했으면 None (호출자가 task_id로 작업 시작), 이미 있으면 그 작업 ID
+    """
+    for _ in range(2):
+        if await redis.set(key, task_id, nx=True, ex=ttl):
+            return None
+        existing = await redis.get(key)
+        if existing:
+            return existing
+        # get 직전에 만료/해제됨 → 한 번 더 선점 시도
+    return None  # 두 번 모두 경합에 지면 중복 작업을 허용 (잠금 없이 진행)
+
+
+async def release_async(redis, key: str, task_id: str):
+    """작업 시작에 실패했을 때 선점 해제"""
+    await redis.eval(_RELEASE_SCRIPT, 1, key, task_id)
+
+
+def release(key: str, task_id: str, redis=None):
+    """작업이 끝나면 해제 (이후 요청은 새 작업으로)"""
+    if redis is None:
+        from app.core.database import redis_client
+        redis = redis_client
+    try:
+        redis.eval(_RELEASE_SCRIPT, 1, key, task_id)
+    except Exception as e:
+        logger.warning(f"Single-flight release failed for {key}: {e}")
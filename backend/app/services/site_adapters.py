@@ -0,0 +1,288 @@
+from typing import Dict, List, Optional, Type
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from urllib.parse import urlparse
+import re
+
+from bs4 import BeautifulSoup
+
+from app.core.logger import logger
+from app.services.url_utils import URLNormalizer
+
+
+@dataclass
+class StructuredPage:
+    """어댑터 결과 (ContentExtractor가 extract_content와 같은 딕셔너리로 변환)"""
+    url: str
+    title: str
+    content: str
+    sections: List[Dict]                          # [{'level', 'title'}] (본문에 같은 줄로 포함)
+    links: List[str] = field(default_factory=list)
+    category: Optional[str] = None
+
+
+class PageBuilder:
+    """헤딩 + 줄 단위 본문 작성 (헤딩 줄은 HeaderChunker/hash_sections가 섹션 경계로 인식)"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.sections: List[Dict] = []
+
+    def heading(self, level: str, title: str):
+        title = _clean(title)
+        if title:
+            self.lines.append(title)
+            self.sections.append({'level': level, 'title': title})
+
+    def line(self, text: Optional[str]):
+        text = _clean(text)
+        if text:
+            self.lines.append(text)
+
+    @property
+    def content(self) -> str:
+        return '\n'.join(self.lines)
+
+
+def _clean(text: Optional[str]) -> str:
+    """HTML 태그 제거 + 공백 정리"""
+    if not text:
+        return ""
+    if '<' in text:
+        text = BeautifulSoup(text, 'html.parser').get_text(separator=' ')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class SiteAdapter(ABC):
+    """
+    클라이언트 렌더링 사이트용 JSON API 어댑터 (추상)
+
+    페이지 URL을 사이트의 JSON 엔드포인트로 바꿔 호출하고 StructuredPage로 변환한다.
+    """
+
+    name = ""
+
+    def __init__(self, http):
+        self.http = http
+
+    def get_json(self, url: str, params: Optional[Dict] = None):
+        response = self.http.get(url, params=params, headers={'Accept': 'application/json'})
+        response.raise_for_status()
+        return response.json()
+
+    @abstractmethod
+    def fetch(self, url: str) -> Optional[StructuredPage]:
+        """페이지 URL → StructuredPage (이 어댑터가 처리하지 않는 URL이면 None)"""
+
+
+class NutrisliceAdapter(SiteAdapter):
+    """
+    dickinson.nutrislice.com (식당 메뉴)
+
+    /menu                                → 식당 / 메뉴 종류 목록
+    /menu/{school}/{menu_type}[/{date}]  → 해당 주의 일별 메뉴
+    """
+
+    name = "nutrislice"
+
+    def _api_base(self, host: str) -> str:
+        subdomain = host.split('.')[0]
+        return f"https://{subdomain}.api.nutrislice.com/menu/api"
+
+    def fetch(self, url: str) -> Optional[StructuredPage]:
+        parsed = urlparse(url)
+        segments = [s for s in parsed.path.split('/') if s]
+        api = self._api_base(parsed.netloc)
+        base_url = f"https://{parsed.netloc}/menu"
+
+        if len(segments) >= 3 and segments[0] == 'menu':
+            menu_date = segments[3] if len(segments) > 3 else date.today().isoformat()
+            return self._week(api, url, segments[1], segments[2], menu_date)
+
+        return self._schools(api, url, base_url)
+
+    def _schools(self, api: str, url: str, base_url: str) -> StructuredPage:
+        schools = self.get_json(f"{api}/schools/")
+        page = PageBuilder()
+        links = []
+
+        for school in schools:
+            page.heading('h2', school.get('name'))
+            page.line(school.get('address'))
+            for menu_type in school.get('active_menu_types') or []:
+                page.line(menu_type.get('name'))
+                links.append(f"{base_url}/{school['slug']}/{menu_type['slug']}")
+
+        return StructuredPage(
+            url=url,
+            title="Dining Menus",
+            content=page.content,
+            sections=page.sections,
+            links=links,
+            category='campus_life'
+        )
+
+    def _week(self, api: str, url: str, school: str, menu_type: str, menu_date: str) -> StructuredPage:
+        year, month, day = menu_date.split('-')
+        week = self.get_json(f"{api}/weeks/school/{school}/menu-type/{menu_type}/{year}/{month}/{day}/")
+
+        school_name = school.replace('-', ' ').title()
+        menu_name = menu_type.replace('-', ' ').title()
+        page = PageBuilder()
+
+        for day_menu in week.get('days') or []:
+            items = day_menu.get('menu_items') or []
+            if not items:
+                continue
+
+            day = datetime.strptime(day_menu['date'], '%Y-%m-%d')
+            day_label = f"{day:%A, %B} {day.day}, {day.year}"
+            page.heading('h2', f"{menu_name} - {day_label}")
+
+            for item in items:
+                if item.get('is_section_title'):
+                    page.heading('h3', item.get('text'))
+                    continue
+
+                food = item.get('food')
+                if not food:
+                    page.line(item.get('text'))
+                    continue
+
+                details = []
+                calories = (food.get('rounded_nutrition_info') or {}).get('calories')
+                if calories is not None:
+                    details.append(f"{int(calories)} cal")
+                icons = [
+                    icon.get('synced_name') or icon.get('name')
+                    for icon in (food.get('icons') or {}).get('food_icons') or []
+                ]
+                details.extend(icon for icon in icons if icon)
+
+                line = food.get('name') or item.get('text') or ""
+                if details:
+                    line += f" ({', '.join(details)})"
+                if food.get('description'):
+                    line += f": {_clean(food['description'])}"
+                page.line(line)
+
+        return StructuredPage(
+            url=url,
+            title=f"{school_name} {menu_name} Menu",
+            content=page.content,
+            sections=page.sections,
+            category='campus_life'
+        )
+
+
+class CampusLabsAdapter(SiteAdapter):
+    """
+    dickinson.campuslabs.com (Engage 동아리 정보)
+
+    /engage/organizations         → 전체 동아리 목록 (분류별)
+    /engage/organization/{key}    → 동아리 상세
+    """
+
+    name = "campuslabs"
+
+    PAGE_SIZE = 100
+
+    def fetch(self, url: str) -> Optional[StructuredPage]:
+        parsed = urlparse(url)
+        segments = [s for s in parsed.path.split('/') if s]
+        base = f"https://{parsed.netloc}/engage"
+
+        if len(segments) >= 3 and segments[:2] == ['engage', 'organization']:
+            return self._organization(base, url, segments[2])
+
+        if segments[:2] == ['engage', 'organizations'] or segments == ['engage'] or not segments:
+            return self._organizations(base, url)
+
+        return None
+
+    def _organizations(self, base: str, url: str) -> StructuredPage:
+        organizations = []
+        skip = 0
+        while True:
+            result = self.get_json(
+                f"{base}/api/discovery/search/organizations",
+                params={'top': self.PAGE_SIZE, 'skip': skip, 'orderBy[0]': 'UpperName asc'}
+            )
+            batch = result.get('value') or []
+            organizations.extend(batch)
+            skip += len(batch)
+            if not batch or skip >= result.get('@odata.count', 0):
+                break
+
+        by_category: Dict[str, List[Dict]] = {}
+        for org in organizations:
+            category = (org.get('CategoryNames') or ['Other'])[0]
+            by_category.setdefault(category, []).append(org)
+
+        page = PageBuilder()
+        links = []
+        for category in sorted(by_category):
+            page.heading('h2', category)
+            for org in by_category[category]:
+                summary = _clean(org.get('Summary'))
+                page.line(f"{org['Name']}: {summary}" if summary else org['Name'])
+                if org.get('WebsiteKey'):
+                    links.append(f"{base}/organization/{org['WebsiteKey']}")
+
+        return StructuredPage(
+            url=url,
+            title="Student Organizations",
+            content=page.content,
+            sections=page.sections,
+            links=links,
+            category='campus_life'
+        )
+
+    def _organization(self, base: str, url: str, key: str) -> StructuredPage:
+        org = self.get_json(f"{base}/api/discovery/organization/bykey/{key}")
+
+        page = PageBuilder()
+        page.line(org.get('name'))
+        page.line(org.get('summary'))
+
+        categories = [c.get('name') for c in org.get('categories') or [] if c.get('name')]
+        if categories:
+            page.line(f"Categories: {', '.join(categories)}")
+
+        if org.get('description'):
+            page.heading('h2', 'About')
+            page.line(org['description'])
+
+        contact = [org.get('email')]
+        social = org.get('socialMedia') or {}
+        contact.extend(value for key_, value in social.items() if value and key_.endswith('Url'))
+        contact = [c for c in contact if c]
+        if contact:
+            page.heading('h2', 'Contact')
+            for item in contact:
+                page.line(item)
+
+        return StructuredPage(
+            url=url,
+            title=org.get('name') or key,
+            content=page.content,
+            sections=page.sections,
+            category='campus_life'
+        )
+
+
+# URLNormalizer.WHITELIST_DOMAINS의 어댑터 이름 → 클래스
+ADAPTERS: Dict[str, Type[SiteAdapter]] = {
+    NutrisliceAdapter.name: NutrisliceAdapter,
+    CampusLabsAdapter.name: CampusLabsAdapter,
+}
+
+
+def get_adapter(url: str, http) -> Optional[SiteAdapter]:
+    """URL 호스트에 등록된 어댑터 (없으면 None → 일반 HTML 추출)"""
+    name = URLNormalizer.get_adapter_name(url)
+    adapter_cls = ADAPTERS.get(name) if name else None
+    if name and adapter_cls is None:
+        logger.warning(f"Unknown site adapter '{name}' for {url}")
+    return adapter_cls(http) if adapter_cls else None
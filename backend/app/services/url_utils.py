@@ -7,11 +7,11 @@ class URLNormalizer:
     
     ALLOWED_DOMAIN = "dickinson.edu"
 
-    # 화이트리스트 외부 도메인
-    WHITELIST_DOMAINS = [
-        'dickinson.campuslabs.com',    # 동아리 정보
-        'dickinson.nutrislice.com',    # 식당 메뉴
-    ]
+    # 화이트리스트 외부 도메인 → JSON 어댑터 이름 (site_adapters.ADAPTERS)
+    WHITELIST_DOMAINS = {
+        'dickinson.campuslabs.com': 'campuslabs',    # 동아리 정보
+        'dickinson.nutrislice.com': 'nutrislice',    # 식당 메뉴
+    }
     
     # 블랙리스트 패턴
     BLACKLIST_PATTERNS = [
@@ -113,6 +113,15 @@ class URLNormalizer:
         """화이트리스트 도메인 체크"""
         return any(domain in netloc for domain in cls.WHITELIST_DOMAINS)
 
+    @classmethod
+    def get_adapter_name(cls, url: str) -> Optional[str]:
+        """화이트리스트 도메인의 어댑터 이름 (없으면 None)"""
+        netloc = urlparse(url).netloc.lower().replace('www.', '')
+        for domain, adapter in cls.WHITELIST_DOMAINS.items():
+            if domain in netloc:
+                return adapter
+        return None
+
     @classmethod
     def is_blacklisted(cls, url: str) -> bool:
         """블랙리스트 체크"""
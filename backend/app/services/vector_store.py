@@ -0,0 +1,206 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+from datetime import datetime, timezone
+import time
+import uuid
+
+from weaviate.classes.config import Configure, DataType, Property, Tokenization
+from weaviate.classes.query import Filter
+
+from app.core.logger import logger
+from app.services.chunker import Chunk
+from app.services.hash_utils import compute_content_hash
+
+
+# Weaviate 컬렉션 (masterdocen.md Weaviate Vector DB Schema)
+COLLECTION_NAME = "Chunk"
+UPSERT_BATCH_SIZE = 200
+QUERY_LIMIT = 10000  # 한 페이지의 청크 수 상한
+DELETE_SOURCES_BATCH = 100  # delete_many 필터 하나에 넣는 소스 URL 수
+
+# 청크 UUID 네임스페이스 (normalized_url + chunk_index → 결정적 UUID)
+CHUNK_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "rush:chunk")
+
+
+def chunk_uuid(normalized_url: str, chunk_index: int) -> str:
+    """
+    청크의 결정적 UUID
+
+    같은 페이지의 같은 위치 청크는 항상 같은 UUID를 가지므로
+    재색인 시 배치 upsert가 기존 객체를 덮어쓴다.
+    """
+    return str(uuid.uuid5(CHUNK_NAMESPACE, f"{normalized_url}#{chunk_index}"))
+
+
+def build_points(
+    chunks: Sequence[Chunk],
+    vectors: Sequence,
+    last_updated: Optional[datetime] = None
+) -> List[Dict]:
+    """
+    청크 + 벡터 → upsert 포인트 (ai_context.md 5) Vector DB Schema)
+    """
+    last_updated = last_updated or datetime.now(timezone.utc)
+    points = []
+
+    for chunk, vector in zip(chunks, vectors):
+        points.append({
+            "id": chunk_uuid(chunk.source_url, chunk.chunk_index),
+            "values": [float(v) for v in vector],
+            "metadata": {
+                "text": chunk.text,
+                "source_url": chunk.source_url,
+                "title": chunk.title,
+                "category": chunk.category,
+                "section": chunk.section,
+                "content_hash": compute_content_hash(chunk.text),
+                "last_updated": last_updated,
+                "chunk_index": chunk.chunk_index
+            }
+        })
+
+    return points
+
+
+class VectorStore:
+    """Weaviate 청크 저장소 (배치 upsert / 소스 단위 삭제)"""
+
+    def __init__(
+        self,
+        client=None,
+        collection_name: str = COLLECTION_NAME,
+        batch_size: int = UPSERT_BATCH_SIZE
+    ):
+        if client is None:
+            from app.core.database import weaviate_client
+            client = weaviate_client
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+
+    @property
+    def collection(self):
+        return self.client.collections.get(self.collection_name)
+
+    def ensure_collection(self):
+        """컬렉션이 없으면 생성 (벡터는 직접 제공)"""
+        if self.client.collections.exists(self.collection_name):
+            return
+
+        logger.info(f"Creating Weaviate collection: {self.collection_name}")
+        self.client.collections.create(
+            name=self.collection_name,
+            description="Searchable text chunks",
+            vectorizer_config=Configure.Vectorizer.none(),
+            properties=[
+                Property(name="text", data_type=DataType.TEXT),
+                Property(name="source_url", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+                Property(name="title", data_type=DataType.TEXT),
+                Property(name="category", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+                Property(name="section", data_type=DataType.TEXT),
+                Property(name="content_hash", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+                Property(name="chunk_index", data_type=DataType.INT),
+                Property(name="last_updated", data_type=DataType.DATE),
+            ]
+        )
+
+    def recreate_collection(self):
+        """컬렉션 삭제 후 재생성 (전체 재구축용)"""
+        if self.client.collections.exists(self.collection_name):
+            self.client.collections.delete(self.collection_name)
+        self.ensure_collection()
+
+    def upsert_vectors(self, points: Iterable[Dict]) -> int:
+        """
+        배치 API로 벡터 upsert
+
+        Args:
+            points: build_points() 형식의 포인트 스트림
+
+        Returns:
+            성공한 객체 수
+        """
+        collection = self.collection
+        start = time.time()
+        sent = 0
+
+        with collection.batch.fixed_size(batch_size=self.batch_size) as batch:
+            for point in points:
+                metadata = point["metadata"]
+                batch.add_object(
+                    properties=metadata,
+                    uuid=point.get("id") or chunk_uuid(metadata["source_url"], metadata["chunk_index"]),
+                    vector=point["values"]
+                )
+                sent += 1
+
+        failed = collection.batch.failed_objects
+        if failed:
+            logger.error(f"Vector upsert: {len(failed)}/{sent} objects failed (first: {failed[0].message})")
+
+        elapsed = time.time() - start
+        if sent:
+            logger.info(f"Upserted {sent - len(failed)} vectors in {elapsed:.2f}s ({sent / max(elapsed, 1e-6):.0f}/s)")
+
+        return sent - len(failed)
+
+    def delete_vectors_by_source(self, source_url: str) -> int:
+        """소스 URL의 모든 청크 삭제 (ai_context.md 계약)"""
+        result = self.collection.data.delete_many(
+            where=Filter.by_property("source_url").equal(source_url)
+        )
+        return result.successful
+
+    def delete_vectors_by_sources(self, source_urls: Sequence[str]) -> int:
+        """여러 소스 URL의 청크 일괄 삭제 (DELETE_SOURCES_BATCH개씩 delete_many 한 번)"""
+        deleted = 0
+        for start in range(0, len(source_urls), DELETE_SOURCES_BATCH):
+            batch = list(source_urls[start:start + DELETE_SOURCES_BATCH])
+            result = self.collection.data.delete_many(
+                where=Filter.by_property("source_url").contains_any(batch)
+            )
+            deleted += result.successful
+        return deleted
+
+    def get_chunk_hashes(self, source_url: str, min_chunk_index: int = 0) -> Dict[int, str]:
+        """
+        저장된 청크의 {chunk_index: content_hash} (벡터 제외)
+        """
+        where = Filter.by_property("source_url").equal(source_url)
+        if min_chunk_index > 0:
+            where = where & Filter.by_property("chunk_index").greater_or_equal(min_chunk_index)
+
+        response = self.collection.query.fetch_objects(
+            filters=where,
+            limit=QUERY_LIMIT,
+            return_properties=["chunk_index", "content_hash"]
+        )
+        return {
+            int(obj.properties["chunk_index"]): obj.properties.get("content_hash", "")
+            for obj in response.objects
+        }
+
+    def delete_stale_chunks(self, source_url: str, chunk_count: int) -> int:
+        """
+        페이지가 짧아져 남은 꼬리 청크 삭제 (chunk_index >= chunk_count)
+        """
+        result = self.collection.data.delete_many(
+            where=(
+                Filter.by_property("source_url").equal(source_url)
+                & Filter.by_property("chunk_index").greater_or_equal(chunk_count)
+            )
+        )
+        return result.successful
+
+    def replace_source(self, source_url: str, points: List[Dict]) -> Dict:
+        """
+        한 페이지의 청크만 교체
+
+        결정적 UUID로 덮어쓰고 남는 꼬리만 삭제하므로
+        다른 페이지의 청크는 건드리지 않는다.
+        """
+        if not points:
+            return {"upserted": 0, "deleted": self.delete_vectors_by_source(source_url)}
+
+        upserted = self.upsert_vectors(points)
+        deleted = self.delete_stale_chunks(source_url, len(points))
+        return {"upserted": upserted, "deleted": deleted}
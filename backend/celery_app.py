@@ -1,8 +1,15 @@
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.services.progress import ProgressPublisher
+from app.services.profiling import profiled
+from app.services.pipeline import (
+    CRAWL_QUEUE, URL_CRAWL_QUEUE, FETCH_QUEUE, EXTRACT_QUEUE, PERSIST_QUEUE, EMBED_QUEUE,
+    INDEX_FLUSH_DELAY, MAX_FETCH_WAIT, MAX_FETCH_RETRIES
+)
 
 celery_app = Celery(
     'rush',
@@ -22,30 +29,78 @@ celery_app.conf.update(
     task_soft_time_limit=6600,  # 1.5시간 소프트 타임아웃
 )
 
+# 단계별 큐 (워커 종류 / 동시성은 docker-compose 참고)
+# - crawl: 전체 사이트 / 증분 크롤링 → prefork, 동시성 1
+#          (threads 풀은 task_time_limit을 적용하지 못하고, 작업 내부에서 호스트별 스레드를 직접 띄움)
+# - crawl_urls: 단일 URL / URL 목록 크롤링 → prefork, 전용 워커 (몇 시간짜리 전체 크롤링 뒤에서 기다리지 않도록)
+# - fetch: 페이지 단위 fetch_page만 → threads 풀, 높은 동시성
+# - extract: HTML 파싱 → prefork, CPU 코어 수
+# - persist: MongoDB / Redis 쓰기 → threads 풀
+# - embed: 청킹 / 임베딩 / 벡터 저장 → prefork, 낮은 동시성
+# 로컬에서 워커 하나로 돌릴 때: celery -A celery_app worker -Q celery,crawl,crawl_urls,fetch,extract,persist,embed
+celery_app.conf.update(
+    task_queues=(
+        Queue('celery'),
+        Queue(CRAWL_QUEUE),
+        Queue(URL_CRAWL_QUEUE),
+        Queue(FETCH_QUEUE),
+        Queue(EXTRACT_QUEUE),
+        Queue(PERSIST_QUEUE),
+        Queue(EMBED_QUEUE),
+    ),
+    task_default_queue='celery',
+    task_routes={
+        'celery_app.crawl_single_url': {'queue': URL_CRAWL_QUEUE},
+        'celery_app.crawl_full_site': {'queue': CRAWL_QUEUE},
+        'celery_app.incremental_update': {'queue': CRAWL_QUEUE},
+        'celery_app.crawl_url_batch': {'queue': URL_CRAWL_QUEUE},
+        'celery_app.recrawl_urls': {'queue': FETCH_QUEUE},
+        'celery_app.fetch_page': {'queue': FETCH_QUEUE},
+        'celery_app.extract_page': {'queue': EXTRACT_QUEUE},
+        'celery_app.persist_page': {'queue': PERSIST_QUEUE},
+        'celery_app.flush_index_queue': {'queue': PERSIST_QUEUE},
+        'celery_app.reconcile_corpus_stats': {'queue': PERSIST_QUEUE},
+        'celery_app.decay_boilerplate_models': {'queue': PERSIST_QUEUE},
+        'celery_app.sweep_inactive_documents': {'queue': EMBED_QUEUE},
+        'celery_app.index_documents': {'queue': EMBED_QUEUE},
+        'celery_app.rebuild_vector_index': {'queue': EMBED_QUEUE},
+        'celery_app.build_local_vector_index': {'queue': EMBED_QUEUE},
+    },
+)
+
 
 # ==================== 크롤링 Tasks ====================
 
 @celery_app.task(bind=True)
-def crawl_single_url(self, url: str):
-    """단일 URL 크롤링"""
+def crawl_single_url(self, url: str, lock_key: str = None):
+    """
+    단일 URL 크롤링 (링크 추출 / rate limit 대기 없는 단일 페이지 경로)
+    
+    Args:
+        url: 크롤링할 URL
+        lock_key: API가 잡은 single-flight 키 (끝나면 해제)
+    """
     from app.services.crawl_service import CrawlService
+    from app.services.single_flight import release
     
     logger.info(f"Task: Crawling single URL: {url}")
 
     try:
-        service = CrawlService()
+        stats = CrawlService().crawl_single(url)
         
-        # crawl_and_save를 max_pages=1로 호출
-        stats = service.crawl_and_save(
-            seed_url=url,
-            max_pages=1,  # 단일 URL만
-            rate_limit_delay=1.0
-        )
+        # 변경된 문서 재색인
+        changed_urls = stats.pop("changed_urls", [])
+        changed_sections = stats.pop("changed_sections", {})
+        if changed_urls:
+            index_documents.delay(changed_urls, changed_sections)
         
-        logger.info(f"Save completed: {stats}")
+        # 바뀐 허브가 링크하는 페이지 재크롤링
+        recrawl_targets = stats.pop("recrawl_targets", [])
+        if recrawl_targets:
+            recrawl_urls.delay(recrawl_targets)
         
         return {
-            "status": "success",
+            "status": "success" if stats["status"] != "failed" else "error",
             "url": url,
             "stats": stats
         }
@@ -53,43 +108,56 @@ def crawl_single_url(self, url: str):
     except Exception as e:
         logger.error(f"Task failed for {url}: {e}", exc_info=True)
         return {"status": "error", "url": url, "error": str(e)}
+    
+    finally:
+        if lock_key:
+            release(lock_key, self.request.id)
 
 @celery_app.task(bind=True)
-def crawl_full_site(self, seed_url: str = "https://www.dickinson.edu", max_pages: int = None):
+@profiled('crawl_full_site')
+def crawl_full_site(
+    self,
+    seed_url: str = "https://www.dickinson.edu",
+    max_pages: int = None,
+    seed_urls: list = None
+):
     """
     전체 사이트 크롤링 (최대 페이지 제한 옵션)
     
     Args:
         seed_url: 시작 URL
         max_pages: 최대 크롤링 페이지 수 (None이면 무제한)
+        seed_urls: 여러 시드 (주면 seed_url 대신 사용, 시드 호스트별 병렬 크롤링)
     """
     from app.services.crawl_service import CrawlService
     
-    logger.info(f"Task: Full site crawl starting (seed={seed_url}, max_pages={max_pages or 'unlimited'})")
+    seeds = seed_urls or [seed_url]
+    logger.info(f"Task: Full site crawl starting (seeds={seeds}, max_pages={max_pages or 'unlimited'})")
     
     try:
         service = CrawlService()
         
-        # 진행률 업데이트 콜백
+        # 진행률 발행 (Redis pub/sub, 합쳐서 발행 / result backend는 드물게)
+        publisher = ProgressPublisher(
+            self.request.id,
+            state_callback=lambda meta: self.update_state(state='PROGRESS', meta=meta)
+        )
         crawled_count = [0]  # mutable object to update from callback
         
         def progress_callback(current, total):
             crawled_count[0] = current
-            self.update_state(
-                state='PROGRESS',
-                meta={
-                    'current': current,
-                    'total': total or 'unknown',
-                    'status': f'Crawling page {current}{"/" + str(total) if total else ""}...',
-                    'percentage': int((current / total) * 100) if total else None
-                }
-            )
+            publisher.publish({
+                'current': current,
+                'total': total or 'unknown',
+                'status': f'Crawling page {current}{"/" + str(total) if total else ""}...',
+                'percentage': int((current / total) * 100) if total else None
+            })
         
         # 전체 사이트 크롤링 (max_pages가 있으면 제한)
         if max_pages:
             # 최대 페이지 수 제한
             stats = service.crawl_and_save(
-                seed_url=seed_url,
+                seed_urls=seeds,
                 max_pages=max_pages,
                 rate_limit_delay=1.0,
                 progress_callback=progress_callback
@@ -98,16 +166,30 @@ def crawl_full_site(self, seed_url: str = "https://www.dickinson.edu", max_pages
         else:
             # 무제한 크롤링 (사이트 전체)
             stats = service.crawl_and_save(
-                seed_url=seed_url,
+                seed_urls=seeds,
                 max_pages=10000,  # 매우 큰 숫자 (실질적 무제한)
                 rate_limit_delay=1.0,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                mark_unseen=True  # 사이트 전체를 돌았으면 확인되지 않은 문서 inactive
             )
             logger.info(f"Full site crawl completed: crawled {crawled_count[0]} pages")
         
+        # 변경된 문서 재색인
+        changed_urls = stats.pop("changed_urls", [])
+        changed_sections = stats.pop("changed_sections", {})
+        if changed_urls:
+            index_documents.delay(changed_urls, changed_sections)
+        
+        # 바뀐 허브가 링크하는 페이지 재크롤링
+        recrawl_targets = stats.pop("recrawl_targets", [])
+        if recrawl_targets:
+            recrawl_urls.delay(recrawl_targets)
+        
         # 최종 통계
         final_stats = service.get_statistics()
         
+        publisher.finish('SUCCESS', {'current': crawled_count[0], 'status': 'Completed'})
+        
         return {
             "status": "completed",
             "crawl_stats": stats,
@@ -116,6 +198,7 @@ def crawl_full_site(self, seed_url: str = "https://www.dickinson.edu", max_pages
     
     except Exception as e:
         logger.error(f"Full site crawl failed: {e}", exc_info=True)
+        ProgressPublisher(self.request.id).finish('FAILURE', {'error': str(e)})
         self.update_state(
             state='FAILURE',
             meta={'error': str(e)}
@@ -124,6 +207,7 @@ def crawl_full_site(self, seed_url: str = "https://www.dickinson.edu", max_pages
 
 
 @celery_app.task(bind=True)
+@profiled('incremental_update')
 def incremental_update(self, priority: str = "high"):
     """증분 업데이트 (변경된 페이지만 재크롤링)"""
     from app.services.crawl_service import CrawlService
@@ -135,46 +219,83 @@ def incremental_update(self, priority: str = "high"):
     try:
         service = CrawlService()
         extractor = ContentExtractor()
+        publisher = ProgressPublisher(
+            self.request.id,
+            state_callback=lambda meta: self.update_state(state='PROGRESS', meta=meta)
+        )
         
         # 우선순위 필터링
-        urls = service.repo.get_urls_by_priority()
+        urls = service.repo.get_urls_by_priority(priority)
         
         updated_count = 0
+        changed_urls = []
+        changed_sections = {}
         unchanged_count = 0
         failed_count = 0
+        seen_urls = []
         
         total = len(urls)
         
         for i, url in enumerate(urls):
             # 진행률 업데이트
-            self.update_state(
-                state='PROGRESS',
-                meta={
-                    'current': i + 1,
-                    'total': total,
-                    'updated': updated_count,
-                    'unchanged': unchanged_count
-                }
-            )
+            publisher.publish({
+                'current': i + 1,
+                'total': total,
+                'updated': updated_count,
+                'unchanged': unchanged_count
+            })
             
             # 기존 문서 가져오기
             existing = service.repo.find_by_url(url)
             if not existing:
                 continue
             
-            # 새 콘텐츠 크롤링
-            new_data = extractor.crawl_page(url)
+            # 새 콘텐츠 크롤링 (원본 HTML이 같으면 저장된 추출 결과 재사용)
+            new_data = extractor.crawl_page(url, stored=existing)
             if not new_data:
                 failed_count += 1
+                # 연속 실패가 쌓이면 inactive (sweep 대상)
+                if service.repo.record_failure(existing.normalized_url, "crawl_failed"):
+                    logger.info(f"Marked inactive after repeated failures: {url}")
                 continue
+            seen_urls.append(existing.normalized_url)
             
             # 변경 감지
             if has_content_changed(existing.content_hash, new_data['content']):
-                service.save_crawl_result(new_data)
+                save_result = service.save_crawl_result(new_data)
                 updated_count += 1
+                changed_urls.append(existing.normalized_url)
+                if save_result and save_result[2] is not None:
+                    changed_sections[existing.normalized_url] = save_result[2]
                 logger.info(f"Updated: {url}")
             else:
                 unchanged_count += 1
+                # 마크업만 바뀐 경우 다음 업데이트에서 추출을 생략하도록 원본 해시 갱신
+                if new_data.get('raw_hash') and new_data['raw_hash'] != existing.raw_hash:
+                    service.repo.set_raw_hash(existing.normalized_url, new_data['raw_hash'])
+        
+        service.repo.mark_seen(seen_urls)
+        
+        # 변경된 문서 재색인
+        if changed_urls:
+            index_documents.delay(changed_urls, changed_sections)
+            
+            # 바뀐 허브가 링크하는 페이지 재크롤링 (이번에 확인하지 않은 페이지만)
+            from app.services.link_graph import LinkGraph
+            from app.services.url_utils import URLNormalizer
+            recrawl_targets = LinkGraph.load().recrawl_targets(
+                changed_urls,
+                exclude={URLNormalizer.normalize(url) for url in urls}
+            )
+            if recrawl_targets:
+                recrawl_urls.delay(recrawl_targets)
+        
+        publisher.finish('SUCCESS', {
+            'current': total,
+            'total': total,
+            'updated': updated_count,
+            'unchanged': unchanged_count
+        })
         
         return {
             "status": "completed",
@@ -186,6 +307,321 @@ def incremental_update(self, priority: str = "high"):
     
     except Exception as e:
         logger.error(f"Incremental update failed: {e}")
+        ProgressPublisher(self.request.id).finish('FAILURE', {'error': str(e)})
+        raise
+
+
+@celery_app.task(bind=True)
+def recrawl_urls(self, urls: list):
+    """
+    URL 목록 재크롤링 (링크 그래프가 고른 대상)
+    
+    페이지마다 fetch → extract → persist 단계 작업으로 나눠 보내고, 저장된 페이지는
+    persist 단계가 모아서 색인한다. 허브 재크롤링이 연쇄되지 않도록 recrawl 대상은 다시 만들지 않는다.
+    """
+    logger.info(f"Task: Recrawling {len(urls)} linked pages")
+    
+    for url in urls:
+        fetch_page.delay(url)
+    
+    return {"status": "dispatched", "total": len(urls)}
+
+
+# ==================== 페이지 파이프라인 Tasks (fetch → extract → persist) ====================
+# 단계 사이에는 Redis(StageStore) 키만 넘긴다
+
+@celery_app.task(bind=True, max_retries=MAX_FETCH_RETRIES)
+def fetch_page(self, url: str, slot_reserved: bool = False):
+    """
+    1단계: HTML 가져오기 (원본 HTML이 같으면 추출 없이 바로 저장 단계로)
+    
+    같은 호스트 요청은 HostRateLimiter 간격을 지킨다. 예약한 자리가 멀면 그 시각에 한 번만 다시 실행하고
+    (slot_reserved=True), MAX_RESERVE_AHEAD보다 멀어 예약하지 못했으면 예약 가능해지는 시각에 다시 시도한다.
+    """
+    import time
+    from app.services.crawl_service import CrawlService
+    from app.services.pipeline import HostRateLimiter, StageStore, fetched_payload
+    
+    service = CrawlService()
+    target = service.alias_map.resolve(url)
+    extractor = service.extractor
+    store = StageStore()
+    
+    if not slot_reserved:
+        limiter = HostRateLimiter()
+        reserved, wait = limiter.reserve(target)
+        if not reserved:
+            raise self.retry(countdown=wait - limiter.max_ahead + 1)
+        if wait > MAX_FETCH_WAIT:
+            raise self.retry(countdown=wait, kwargs={'url': url, 'slot_reserved': True})
+        if wait > 0:
+            time.sleep(wait)
+    
+    try:
+        # 동적 사이트 JSON 어댑터는 추출이 가벼우므로 여기서 처리
+        adapter = extractor.get_adapter(target)
+        if adapter is not None:
+            content_data = extractor.crawl_structured(target, adapter)
+            if not content_data:
+                return {"status": "failed", "url": target}
+            content_data.pop('links', None)
+            persist_page.delay(store.put("persist", content_data))
+            return {"status": "extracted", "url": target}
+        
+        fetched = extractor.fetch(target)
+        if not fetched:
+            service.repo.record_failure(target, "fetch_failed")
+            return {"status": "failed", "url": target}
+        
+        reused = extractor.reuse_extraction(fetched, service.repo.find_by_url(target))
+        if reused:
+            persist_page.delay(store.put("persist", reused))
+            return {"status": "raw_unchanged", "url": target}
+        
+        extract_page.delay(store.put("extract", fetched_payload(fetched)))
+        return {"status": "fetched", "url": target}
+    
+    except Exception as e:
+        logger.error(f"Fetch stage failed for {url}: {e}", exc_info=True)
+        return {"status": "error", "url": url, "error": str(e)}
+
+
+@celery_app.task(bind=True)
+def extract_page(self, key: str):
+    """2단계: 본문 추출 (CPU)"""
+    from app.services.content_extractor import ContentExtractor
+    from app.services.pipeline import StageStore
+    
+    store = StageStore()
+    fetched = store.take(key)
+    if fetched is None:
+        return {"status": "expired", "key": key}
+    
+    try:
+        extractor = ContentExtractor()
+        content_data = extractor.extract_content(fetched['html'], fetched['final_url'])
+        content_data['url'], content_data['aliases'] = extractor.resolve_final_url(fetched, content_data)
+        content_data['permanent_aliases'] = extractor.permanent_aliases(fetched, content_data['url'])
+        content_data['raw_hash'] = fetched['raw_hash']
+        
+        persist_page.delay(store.put("persist", content_data))
+        return {"status": "extracted", "url": content_data['url']}
+    
+    except Exception as e:
+        logger.error(f"Extract stage failed for {fetched['url']}: {e}", exc_info=True)
+        return {"status": "error", "url": fetched['url'], "error": str(e)}
+
+
+@celery_app.task(bind=True)
+def persist_page(self, key: str):
+    """3단계: MongoDB 저장 (바뀐 페이지는 색인 대기 목록에 모음)"""
+    from app.services.crawl_service import CrawlService
+    from app.services.pipeline import StageStore
+    from app.services.url_utils import URLNormalizer
+    
+    store = StageStore()
+    content_data = store.take(key)
+    if content_data is None:
+        return {"status": "expired", "key": key}
+    
+    service = CrawlService()
+    save_result = service.save_crawl_result(content_data)
+    if not save_result:
+        return {"status": "failed", "url": content_data['url']}
+    
+    _, status, sections = save_result
+    url = URLNormalizer.normalize(content_data['url'])
+    service.repo.mark_seen([url])
+    if status in ('created', 'updated'):
+        if store.add_index_pending(url, sections):
+            flush_index_queue.apply_async(countdown=INDEX_FLUSH_DELAY)
+    
+    return {"status": status, "url": content_data['url']}
+
+
+@celery_app.task(bind=True)
+def flush_index_queue(self):
+    """저장 단계가 모은 페이지를 한 번에 색인 작업으로 (임베딩 배치 유지)"""
+    from app.services.pipeline import StageStore
+    
+    urls, changed_sections = StageStore().take_index_pending()
+    if urls:
+        index_documents.delay(urls, changed_sections)
+    return {"status": "flushed", "total": len(urls)}
+
+
+@celery_app.task(bind=True)
+def crawl_url_batch(self, urls: list, rate_limit_delay: float = 1.0):
+    """
+    URL 목록 새로고침 (호스트별 병렬, 하나의 작업 ID로 전체 진행률)
+    
+    Args:
+        urls: 정규화 / 중복 제거된 URL 목록 (API에서 처리, 여기서도 다시 확인)
+        rate_limit_delay: 같은 호스트 요청 간격 (초)
+    """
+    from app.services.crawl_service import CrawlService
+    
+    logger.info(f"Task: Batch crawl of {len(urls)} URLs")
+    
+    try:
+        publisher = ProgressPublisher(
+            self.request.id,
+            state_callback=lambda meta: self.update_state(state='PROGRESS', meta=meta)
+        )
+        
+        def progress_callback(current, total):
+            publisher.publish({
+                'current': current,
+                'total': total,
+                'status': f'Crawling page {current}/{total}...',
+                'percentage': int((current / total) * 100) if total else None
+            })
+        
+        stats = CrawlService().crawl_batch(urls, rate_limit_delay=rate_limit_delay, progress_callback=progress_callback)
+        
+        # 변경된 문서 재색인
+        changed_urls = stats.pop("changed_urls", [])
+        changed_sections = stats.pop("changed_sections", {})
+        if changed_urls:
+            index_documents.delay(changed_urls, changed_sections)
+        
+        # 바뀐 허브가 링크하는 페이지 재크롤링
+        recrawl_targets = stats.pop("recrawl_targets", [])
+        if recrawl_targets:
+            recrawl_urls.delay(recrawl_targets)
+        
+        publisher.finish('SUCCESS', {'current': stats['total'], 'total': stats['total'], 'status': 'Completed'})
+        return {"status": "completed", **stats}
+    
+    except Exception as e:
+        logger.error(f"Batch crawl failed: {e}", exc_info=True)
+        ProgressPublisher(self.request.id).finish('FAILURE', {'error': str(e)})
+        raise
+
+
+# ==================== 색인 Tasks ====================
+
+@celery_app.task(bind=True)
+def index_documents(self, urls: list, changed_sections: dict = None):
+    """
+    문서 청킹 → 임베딩 → Weaviate 저장 (페이지 단위 교체)
+    
+    changed_sections: {normalized_url: [섹션 인덱스]} - 있으면 변경된 부분의 청크만 재처리
+    """
+    from app.services.index_service import IndexService
+    from app.services.search_engine import bump_search_version
+    
+    logger.info(f"Task: Indexing {len(urls)} documents")
+    
+    try:
+        stats = IndexService().index_urls(urls, changed_sections)
+        # 검색 프로세스들이 다음 쿼리에서 엔진을 다시 구축하도록
+        bump_search_version()
+        return stats
+    
+    except Exception as e:
+        logger.error(f"Indexing failed: {e}", exc_info=True)
+        raise
+
+
+@celery_app.task(bind=True)
+def rebuild_vector_index(self):
+    """Weaviate 전체 재구축 (배치 upsert)"""
+    from app.services.index_service import IndexService
+    from app.services.search_engine import bump_search_version
+    
+    logger.info("Task: Rebuilding vector index")
+    
+    try:
+        stats = IndexService().rebuild()
+        bump_search_version()
+        
+        # 로컬 인덱스도 갱신 (임베딩은 캐시에서 재사용)
+        build_local_vector_index.delay()
+        return stats
+    
+    except Exception as e:
+        logger.error(f"Vector index rebuild failed: {e}", exc_info=True)
+        raise
+
+
+@celery_app.task(bind=True)
+def build_local_vector_index(self, dtype: str = "int8"):
+    """mmap 로컬 벡터 인덱스 구축 (Weaviate 장애/재구축 시 대체 검색)"""
+    from app.services.local_index import build_local_index_from_corpus
+    
+    logger.info(f"Task: Building local vector index ({dtype})")
+    
+    try:
+        return build_local_index_from_corpus(dtype=dtype)
+    
+    except Exception as e:
+        logger.error(f"Local vector index build failed: {e}", exc_info=True)
+        raise
+
+
+# ==================== 통계 Tasks ====================
+
+@celery_app.task(bind=True)
+def reconcile_corpus_stats(self):
+    """코퍼스 통계 카운터를 전체 집계로 보정 (드리프트 수정)"""
+    from app.services.crawl_service import CrawlService
+    
+    logger.info("Task: Reconciling corpus statistics")
+    
+    try:
+        stats = CrawlService().repo.reconcile_statistics()
+        if any(stats["drift"].values()):
+            logger.warning(f"Corpus statistics drift corrected: {stats['drift']}")
+        return stats
+    
+    except Exception as e:
+        logger.error(f"Corpus statistics reconcile failed: {e}", exc_info=True)
+        raise
+
+
+@celery_app.task(bind=True)
+def sweep_inactive_documents(self, grace_days: int = None):
+    """
+    inactive 문서 정리 (벡터 / 문서 / 캐시 답변 일괄 삭제 + 통계 재집계, 만료된 URL 별칭 삭제)
+    
+    Args:
+        grace_days: inactive가 된 뒤 삭제까지 유예 일수 (None이면 SWEEP_GRACE_DAYS)
+    """
+    from app.services.crawl_service import CrawlService, SWEEP_GRACE_DAYS
+    
+    logger.info("Task: Sweeping inactive documents")
+    
+    try:
+        service = CrawlService()
+        stats = service.sweep_inactive(grace_days=SWEEP_GRACE_DAYS if grace_days is None else grace_days)
+        # 오래 재확인되지 않은 URL 별칭도 만료 (다음 크롤링에서 다시 확인)
+        stats["aliases"] = service.alias_map.prune()
+        
+        # 로컬 인덱스 / 검색 엔진에서도 삭제된 청크 제거
+        if stats["documents"]:
+            from app.services.search_engine import bump_search_version
+            bump_search_version()
+            build_local_vector_index.delay()
+        return stats
+    
+    except Exception as e:
+        logger.error(f"Inactive document sweep failed: {e}", exc_info=True)
+        raise
+
+
+@celery_app.task(bind=True)
+def decay_boilerplate_models(self):
+    """호스트별 boilerplate 모델 감쇠 (템플릿 변경 반영, 드문 블록 정리)"""
+    from app.services.boilerplate import BoilerplateModel
+    
+    logger.info("Task: Decaying boilerplate models")
+    
+    try:
+        return BoilerplateModel().decay_all()
+    
+    except Exception as e:
+        logger.error(f"Boilerplate model decay failed: {e}", exc_info=True)
         raise
 
 
@@ -210,6 +646,21 @@ celery_app.conf.beat_schedule = {
         'schedule': crontab(hour=3, minute=0, day_of_month=1),
         'args': ('low',)
     },
+    # 매일 4시: 코퍼스 통계 카운터 보정 (증분 업데이트 이후)
+    'daily-corpus-stats-reconcile': {
+        'task': 'celery_app.reconcile_corpus_stats',
+        'schedule': crontab(hour=4, minute=0)
+    },
+    # 매일 4시 30분: boilerplate 모델 감쇠
+    'daily-boilerplate-decay': {
+        'task': 'celery_app.decay_boilerplate_models',
+        'schedule': crontab(hour=4, minute=30)
+    },
+    # 매주 일요일 5시: 유예 기간이 지난 inactive 문서 / 벡터 삭제
+    'weekly-inactive-sweep': {
+        'task': 'celery_app.sweep_inactive_documents',
+        'schedule': crontab(hour=5, minute=0, day_of_week=0)
+    },
 }
 
 
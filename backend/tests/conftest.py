@@ -0,0 +1,141 @@
+# backend/tests/conftest.py
+import pytest
+
+
+# ==================== Weaviate 대체 (in-process) ====================
+
+def _match(where, properties: dict) -> bool:
+    """weaviate Filter 객체를 속성 dict에 대해 평가"""
+    operator = where.operator.value
+
+    if operator == 'And':
+        return all(_match(f, properties) for f in where.filters)
+    if operator == 'Or':
+        return any(_match(f, properties) for f in where.filters)
+
+    value = properties.get(where.target)
+    if operator == 'Equal':
+        return value == where.value
+    if operator == 'NotEqual':
+        return value != where.value
+    if operator == 'GreaterThanEqual':
+        return value is not None and value >= where.value
+    if operator == 'GreaterThan':
+        return value is not None and value > where.value
+    if operator == 'LessThan':
+        return value is not None and value < where.value
+    if operator == 'ContainsAny':
+        return value in where.value
+    raise NotImplementedError(operator)
+
+
+class FakeDeleteResult:
+    def __init__(self, matches: int):
+        self.matches = matches
+        self.successful = matches
+        self.failed = 0
+
+
+class FakeBatch:
+    def __init__(self, collection):
+        self.collection = collection
+        self.batch_calls = 0
+
+    def fixed_size(self, batch_size: int = 100):
+        self.collection.batch_sizes.append(batch_size)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.batch_calls += 1
+        return False
+
+    def add_object(self, properties, uuid=None, vector=None):
+        self.collection.objects[str(uuid)] = {"properties": dict(properties), "vector": vector}
+
+    @property
+    def failed_objects(self):
+        return []
+
+
+class FakeData:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def delete_many(self, where, **kwargs):
+        targets = [
+            uid for uid, obj in self.collection.objects.items()
+            if _match(where, obj["properties"])
+        ]
+        for uid in targets:
+            del self.collection.objects[uid]
+        return FakeDeleteResult(len(targets))
+
+
+class FakeObject:
+    def __init__(self, uid: str, properties: dict):
+        self.uuid = uid
+        self.properties = properties
+
+
+class FakeQueryResult:
+    def __init__(self, objects):
+        self.objects = objects
+
+
+class FakeQuery:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def fetch_objects(self, filters=None, limit=None, return_properties=None, **kwargs):
+        objects = [
+            FakeObject(uid, {
+                k: v for k, v in obj["properties"].items()
+                if return_properties is None or k in return_properties
+            })
+            for uid, obj in self.collection.objects.items()
+            if filters is None or _match(filters, obj["properties"])
+        ]
+        return FakeQueryResult(objects[:limit])
+
+
+class FakeCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self.objects = {}
+        self.batch_sizes = []
+        self.batch = FakeBatch(self)
+        self.data = FakeData(self)
+        self.query = FakeQuery(self)
+
+
+class FakeCollections:
+    def __init__(self):
+        self._collections = {}
+
+    def exists(self, name: str) -> bool:
+        return name in self._collections
+
+    def create(self, name: str, **kwargs):
+        self._collections[name] = FakeCollection(name)
+        return self._collections[name]
+
+    def get(self, name: str):
+        return self._collections[name]
+
+    def delete(self, name: str):
+        self._collections.pop(name, None)
+
+
+class FakeWeaviateClient:
+    """VectorStore가 사용하는 weaviate v4 클라이언트 API의 부분집합"""
+
+    def __init__(self):
+        self.collections = FakeCollections()
+
+
+@pytest.fixture
+def fake_weaviate():
+    return FakeWeaviateClient()
@@ -0,0 +1,137 @@
+# backend/tests/test_boilerplate.py
+import lxml.html
+
+from app.services import boilerplate
+from app.services.boilerplate import BoilerplateModel
+
+HOST = "www.dickinson.edu"
+
+NAV = '<nav class="mega-menu"><ul><li>Admissions and Financial Aid</li><li>Academics and Research</li></ul></nav>'
+FOOTER = '<footer id="site-footer"><p>Dickinson College, 28 N. College St, Carlisle, PA 17013</p></footer>'
+
+
+class MiniRedis:
+    """BoilerplateModel이 쓰는 명령만 구현"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+        return fields[field]
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hlen(self, key):
+        return len(self.hashes.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def expire(self, key, seconds):
+        return True
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+        self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.values) if key.startswith(match.rstrip("*"))]
+
+    def pipeline(self, transaction=True):
+        return MiniPipeline(self)
+
+
+class MiniPipeline:
+    """watch() 후 multi() 전까지는 바로 실행 (redis-py와 같음)"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+        self.immediate = False
+
+    def watch(self, *keys):
+        self.immediate = True
+
+    def multi(self):
+        self.immediate = False
+
+    def reset(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        if self.immediate:
+            return getattr(self.redis, name)
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def page(i: int) -> str:
+    body = f"<article><h1>Page {i}</h1><p>{'Unique content for page %d. ' % i * 20}</p></article>"
+    return f"<html><body><header>{NAV}</header><main>{body}</main>{FOOTER}</body></html>"
+
+
+def test_learns_and_prunes_repeated_blocks(monkeypatch):
+    monkeypatch.setattr(boilerplate, "MIN_PAGES", 5)
+    model = BoilerplateModel(redis=MiniRedis(), refresh_interval=0)
+
+    for i in range(5):
+        model.prune(HOST, lxml.html.fromstring(page(i)))
+
+    tree = lxml.html.fromstring(page(99))
+    pruned = model.prune(HOST, tree)
+    text = tree.text_content()
+
+    assert pruned['blocks'] == 2   # header(안의 nav 포함) + footer
+    assert "Admissions" not in text and "Carlisle" not in text
+    assert "Unique content for page 99" in text
+
+    # 다른 호스트에는 적용되지 않음
+    other = lxml.html.fromstring(page(1))
+    assert model.prune("other.example.edu", other)['blocks'] == 0
+
+
+def test_decay_drops_rare_blocks():
+    redis = MiniRedis()
+    model = BoilerplateModel(redis=redis, refresh_interval=0)
+    redis.hashes[boilerplate.DF_KEY_PREFIX + HOST] = {"common": 40, "rare": 1}
+    redis.values[boilerplate.PAGES_KEY_PREFIX + HOST] = 40
+
+    model.decay(HOST)
+
+    assert redis.hashes[boilerplate.DF_KEY_PREFIX + HOST] == {"common": 20}
+    assert redis.values[boilerplate.PAGES_KEY_PREFIX + HOST] == 20
+
+
+def test_df_hash_is_capped(monkeypatch):
+    monkeypatch.setattr(boilerplate, "MAX_DF_FIELDS", 10)
+    redis = MiniRedis()
+    model = BoilerplateModel(redis=redis, refresh_interval=0)
+    df_key = boilerplate.DF_KEY_PREFIX + HOST
+
+    # 페이지마다 다른 블록 3개 + 공통 블록 1개
+    for i in range(12):
+        model.observe(HOST, {"common"} | {f"page{i}-{j}" for j in range(3)})
+        assert len(redis.hashes[df_key]) <= 10 + 4
+
+    assert "common" in redis.hashes[df_key]
+    assert not redis.values.get(boilerplate.DECAY_LOCK_PREFIX + HOST)
+    assert model.decay_all(min_pages=1000) == {'hosts': 0, 'skipped': 1}
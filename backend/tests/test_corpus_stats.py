@@ -0,0 +1,102 @@
+# backend/tests/test_corpus_stats.py
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError
+
+from app.models.document import (
+    Document, DocumentRepository, _stats_drift, _stats_from_doc, _stats_from_facet, _stats_increment
+)
+
+
+def test_increment_touches_totals_category_and_priority():
+    update = _stats_increment("news", "low", -1, -120)
+
+    assert update["$inc"] == {
+        "total_documents": -1,
+        "total_words": -120,
+        "categories.news.count": -1,
+        "categories.news.total_words": -120,
+        "priorities.low": -1
+    }
+
+
+def test_reconcile_totals_and_drift():
+    facet = {
+        "categories": [
+            {"_id": "news", "count": 2, "total_words": 150},
+            {"_id": "about", "count": 1, "total_words": 10}
+        ],
+        "priorities": [{"_id": "high", "count": 2}, {"_id": "low", "count": 1}]
+    }
+    actual = _stats_from_facet(facet)
+
+    assert actual["total_documents"] == 3
+    assert actual["total_words"] == 160
+    assert _stats_drift({"total_documents": 5, "total_words": 160}, actual) == {"total_documents": -2, "total_words": 0}
+    assert _stats_drift(None, actual) == {"total_documents": 3, "total_words": 160}
+
+
+def test_emptied_buckets_are_hidden():
+    stats = _stats_from_doc({
+        "total_documents": 1,
+        "total_words": 10,
+        "categories": {"news": {"count": 0, "total_words": 0}, "about": {"count": 1, "total_words": 10}},
+        "priorities": {"low": 0, "high": 1}
+    })
+
+    assert stats["categories"] == {"about": {"count": 1, "total_words": 10}}
+    assert stats["priorities"] == {"high": 1}
+
+
+class FakeBulkCollection:
+    """bulk_write 결과만 흉내 (이미 있는 URL은 upsert되지 않음, fail_urls는 쓰기 오류)"""
+
+    def __init__(self, existing=(), fail_urls=()):
+        self.existing = set(existing)
+        self.fail_urls = set(fail_urls)
+
+    def bulk_write(self, ops, ordered=True):
+        upserted, errors = [], []
+        for i, op in enumerate(ops):
+            url = op._filter["normalized_url"]
+            if url in self.fail_urls:
+                errors.append({"index": i, "code": 11000, "errmsg": "duplicate key"})
+            elif url not in self.existing:
+                self.existing.add(url)
+                upserted.append({"index": i, "_id": url})
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "upserted": upserted})
+        return SimpleNamespace(upserted_ids={item["index"]: item["_id"] for item in upserted})
+
+
+class FakeStats:
+    def __init__(self):
+        self.updates = []
+
+    def update_one(self, query, update, upsert=False):
+        self.updates.append(update)
+
+
+def make_document(path, words=100):
+    url = f"https://www.dickinson.edu/{path}"
+    return Document(
+        url=url, normalized_url=url, title=path, category="news", content="x",
+        content_hash="h", word_count=words, priority="low"
+    )
+
+
+def test_create_many_counts_and_stats_follow_write_result():
+    repo = DocumentRepository(SimpleNamespace(
+        documents=FakeBulkCollection(existing=[make_document("b").normalized_url], fail_urls=[make_document("c").normalized_url]),
+        corpus_stats=FakeStats()
+    ))
+
+    written = repo.create_many([make_document("a"), make_document("a"), make_document("b"), make_document("c"), make_document("d", 50)])
+
+    assert written == {
+        "created": [make_document("a").normalized_url, make_document("d").normalized_url],
+        "failed": [make_document("c").normalized_url]
+    }
+    # 통계는 실제로 만든 두 문서만
+    assert repo.stats.updates[0]["$inc"]["total_documents"] == 2
+    assert repo.stats.updates[0]["$inc"]["total_words"] == 150
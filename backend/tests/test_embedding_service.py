@@ -0,0 +1,107 @@
+# backend/tests/test_embedding_service.py
+import hashlib
+
+import numpy as np
+
+from app.services.embedding_service import EmbeddingService, embedding_cache_key
+
+DIM = 32
+
+
+class WordTokenizer:
+    """공백 단위 토크나이저 (단어 하나 = 토큰 하나)"""
+
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+class FakeModel:
+    """단어 해시 bag-of-words 벡터, max_seq_length만큼만 읽음 (실제 모델처럼 뒤는 잘림)"""
+
+    def __init__(self, max_seq_length=10):
+        self.max_seq_length = max_seq_length
+        self.tokenizer = WordTokenizer()
+        self.inputs = []
+
+    def encode(self, texts, **kwargs):
+        self.inputs.extend(texts)
+        rows = []
+        for text in texts:
+            vector = np.zeros(DIM, dtype=np.float32)
+            for word in text.split()[:self.max_seq_length - 2]:
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1.0
+            rows.append(vector / max(np.linalg.norm(vector), 1e-12))
+        return np.array(rows, dtype=np.float32)
+
+
+class DictCache:
+    def __init__(self):
+        self.store = {}
+
+    def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    def pipeline(self, transaction=False):
+        cache = self
+
+        class Pipe:
+            def set(self, key, value, ex=None):
+                cache.store[key] = value
+
+            def execute(self):
+                pass
+
+        return Pipe()
+
+
+def make_service(**kwargs):
+    service = EmbeddingService(model_name="fake-model", redis=DictCache(), **kwargs)
+    service._model = FakeModel()
+    return service
+
+
+def test_tail_of_long_text_changes_vector():
+    service = make_service()
+    head = " ".join(f"w{i}" for i in range(40))
+
+    a, b = service.embed_texts([head + " alpha beta gamma", head + " delta epsilon zeta"])
+
+    assert not np.allclose(a, b)
+    assert abs(np.linalg.norm(a) - 1.0) < 1e-5
+    # 모든 윈도우가 모델 입력 한도 안
+    assert all(len(text.split()) <= service.max_tokens for text in service._model.inputs)
+    assert service.last_stats["windows"] > 2
+
+
+def test_make_batches_sorts_and_respects_limits():
+    service = make_service(max_batch_size=3, batch_token_budget=100)
+    lengths = [50, 10, 10, 40, 10, 10]
+
+    batches = service._make_batches(lengths)
+
+    assert batches[0] == [1, 2, 4]
+    assert all(len(b) <= 3 for b in batches)
+    assert all(max(lengths[i] for i in b) * len(b) <= 100 for b in batches)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+
+
+def test_cache_key_and_second_run_hits_cache():
+    service = make_service()
+    text = "dickinson college admissions deadline"
+
+    first = service.embed_texts([text, text])
+    key = embedding_cache_key(text, service.cache_model_id)
+
+    assert key == f"emb:fake-model#mean:{hashlib.sha256(text.encode()).hexdigest()}"
+    assert list(service.redis.store) == [key]
+    assert service.last_stats["unique"] == 1
+
+    calls = len(service._model.inputs)
+    second = service.embed_texts([text])
+
+    assert len(service._model.inputs) == calls
+    assert service.last_stats["cache_hits"] == 1
+    assert np.allclose(first[0], second[0])
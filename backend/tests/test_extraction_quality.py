@@ -0,0 +1,26 @@
+# backend/tests/test_extraction_quality.py
+from app.services.content_extractor import QUALITY_THRESHOLD, extraction_quality
+
+PROSE = "\n".join(
+    f"Section {i}\nDickinson offers a useful and distinctive liberal arts education in paragraph {i}, "
+    f"with small classes, global study and close faculty mentoring for every student."
+    for i in range(6)
+)
+
+
+def test_prose_with_headings_passes():
+    headings = [f"Section {i}" for i in range(6)]
+    assert extraction_quality(PROSE, len(PROSE) * 20, headings) >= QUALITY_THRESHOLD
+
+
+def test_poor_extractions_fall_below_threshold():
+    headings = [f"Section {i}" for i in range(6)]
+    menu = "\n".join(f"Item {i}" for i in range(200))
+
+    assert extraction_quality("", 10_000, headings) == 0.0
+    assert extraction_quality("Too short", 10_000, headings) == 0.0
+    # 메뉴만 뽑힘 (짧은 줄, 헤딩 누락)
+    assert extraction_quality(menu, 100_000, headings) < QUALITY_THRESHOLD
+    # 본문 일부만 뽑힘 (헤딩 대부분 누락, HTML 대비 너무 짧음)
+    partial = PROSE.split("\n")[1]
+    assert extraction_quality(partial, 500_000, headings) < QUALITY_THRESHOLD
@@ -0,0 +1,57 @@
+# backend/tests/test_frontier.py
+from app.services.frontier import CrawlFrontier
+
+
+def classify(url: str):
+    return url.split('/')[1] if url.count('/') > 1 else 'general'
+
+
+def test_pops_valuable_pages_first_and_rescores_on_inlinks():
+    frontier = CrawlFrontier(100, classify)
+    frontier.push("/news/article/1", depth=1)
+    frontier.push("/academics/majors", depth=2)
+    frontier.push("/general/a", depth=1)
+    frontier.push("/general/b", depth=1)
+
+    # in-link이 많이 생긴 일반 페이지는 한 단계 깊은 학과 페이지보다 앞섬
+    for _ in range(5):
+        frontier.push("/general/b", depth=1, linked=True)
+
+    assert frontier.pop() == "/general/b"
+    assert frontier.pop() == "/academics/majors"
+    assert frontier.pop() == "/general/a"
+    assert frontier.pop() == "/news/article/1"
+    assert frontier.pop() is None
+
+    # 이미 꺼낸 URL은 다시 들어가지 않음
+    frontier.push("/general/a")
+    assert len(frontier) == 0
+
+
+def test_category_quota_defers_until_other_candidates_run_out():
+    frontier = CrawlFrontier(4, classify)   # academics 상한 ceil(4 * 0.35) = 2
+    for i in range(4):
+        frontier.push(f"/academics/{i}", depth=1)
+    frontier.push("/general/x", depth=3)
+
+    popped = []
+    for _ in range(5):
+        popped.append(frontier.pop())
+        frontier.commit(popped[-1])
+    assert popped[:3] == ["/academics/0", "/academics/1", "/general/x"]
+    assert sorted(popped[3:]) == ["/academics/2", "/academics/3"]
+
+
+def test_quota_counts_only_committed_pages():
+    frontier = CrawlFrontier(4, classify)
+    for i in range(3):
+        frontier.push(f"/academics/{i}", depth=1)
+    frontier.push("/general/x", depth=3)
+
+    # 가져오기에 실패한 (commit하지 않은) URL은 상한을 쓰지 않음
+    assert frontier.pop() == "/academics/0"
+    assert frontier.pop() == "/academics/1"
+    assert frontier.pop() == "/academics/2"
+    frontier.commit("/academics/2")
+    frontier.commit("/academics/2")
+    assert frontier.get_statistics()['taken_by_category'] == {'academics': 1}
@@ -0,0 +1,64 @@
+# backend/tests/test_link_graph.py
+import numpy as np
+
+from app.services.link_graph import LinkGraph
+
+A, B, C, D = (f"https://www.dickinson.edu/{p}" for p in "abcd")
+
+
+def test_incremental_update_round_trips(tmp_path):
+    graph = LinkGraph(str(tmp_path / "graph"))
+    graph.set_outlinks(A, [B, C, C, A])
+    graph.set_outlinks(B, [C])
+    graph.save()
+
+    graph = LinkGraph.load(str(tmp_path / "graph"))
+    assert graph.num_edges == 3
+    assert sorted(graph.outlinks(A)) == [B, C]
+
+    # A만 바뀜 → B 행은 그대로 유지
+    assert graph.set_outlinks(A, [D]) == (1, 2)
+    graph.save()
+
+    graph = LinkGraph.load(str(tmp_path / "graph"))
+    assert graph.outlinks(A) == [D]
+    assert graph.outlinks(B) == [C]
+    assert graph.in_degree().tolist() == [0, 0, 1, 1]
+    assert graph.orphans() == [A, B]
+
+
+def test_pagerank_and_hub_targets():
+    graph = LinkGraph("unused")
+    graph.set_outlinks(A, [B, C, D])
+    graph.set_outlinks(B, [C])
+    graph.set_outlinks(D, [C])
+
+    rank = graph.pagerank()
+    assert np.isclose(rank.sum(), 1.0)
+    assert graph.top_pages(1)[0][0] == C
+
+    # 허브 A의 대상 중 in-degree 높은 순
+    assert graph.recrawl_targets([A], min_out_degree=3, exclude=[B]) == [C, D]
+    assert graph.recrawl_targets([B], min_out_degree=3) == []
+
+
+def test_concurrent_sessions_merge_on_save(tmp_path):
+    path = str(tmp_path / "graph")
+    graph = LinkGraph(path)
+    graph.set_outlinks(A, [B])
+    graph.save()
+
+    # 두 작업이 같은 버전을 로드해 서로 다른 페이지를 기록
+    full_crawl = LinkGraph.load(path)
+    incremental = LinkGraph.load(path)
+    full_crawl.set_outlinks(B, [C])
+    incremental.set_outlinks(D, [A])
+    incremental.set_outlinks(A, [C])
+    incremental.save()
+    full_crawl.save()
+
+    merged = LinkGraph.load(path)
+    assert merged.outlinks(A) == [C]
+    assert merged.outlinks(B) == [C]
+    assert merged.outlinks(D) == [A]
+    assert merged.version == full_crawl.version == LinkGraph.saved_version(path)
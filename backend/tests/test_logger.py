@@ -0,0 +1,29 @@
+# backend/tests/test_logger.py
+import logging
+
+from app.core.logger import SamplingFilter
+
+
+def make_record(level=logging.INFO, lineno=10, **extra):
+    record = logging.LogRecord("rush", level, "crawler.py", lineno, "msg", (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_info_is_sampled_per_call_site_after_burst():
+    sampling = SamplingFilter(window=3600, burst=3, every=10)
+
+    kept = [sampling.filter(make_record()) for _ in range(33)]
+    assert sum(kept) == 3 + 3          # 처음 3개 + 이후 10개 중 1개
+    # 다른 호출 위치는 따로 셈
+    assert sampling.filter(make_record(lineno=20))
+
+
+def test_warnings_and_marked_records_always_pass():
+    sampling = SamplingFilter(window=3600, burst=1, every=1000)
+    for _ in range(5):
+        sampling.filter(make_record())
+
+    assert sampling.filter(make_record(level=logging.WARNING))
+    assert sampling.filter(make_record(always=True))
+    assert not sampling.filter(make_record())
@@ -0,0 +1,32 @@
+# backend/tests/test_multi_crawler.py
+import queue
+
+from app.services.multi_crawler import CrawlCoordinator
+
+
+class StubCrawler:
+    def __init__(self, seed_url):
+        self.seed_url = seed_url
+        self.inbox = queue.SimpleQueue()
+
+
+def test_non_seed_host_is_owned_by_first_finder():
+    coordinator = CrawlCoordinator()
+    main, admissions = StubCrawler("https://www.dickinson.edu/"), StubCrawler("https://admissions.dickinson.edu/")
+    coordinator.register("www.dickinson.edu", main)
+    coordinator.register("admissions.dickinson.edu", admissions)
+
+    # 시드 호스트 링크는 그 호스트 크롤러로
+    assert coordinator.route("https://admissions.dickinson.edu/visit", 1, main)
+    assert admissions.inbox.get_nowait() == ("https://admissions.dickinson.edu/visit", 1)
+
+    # 시드가 아닌 호스트는 처음 발견한 크롤러가 맡고, 이후 다른 크롤러의 링크도 그쪽으로
+    assert not coordinator.route("https://news.dickinson.edu/a", 2, main)
+    assert not coordinator.route("https://news.dickinson.edu/b", 2, main)
+    assert coordinator.route("https://news.dickinson.edu/c", 3, admissions)
+    assert main.inbox.get_nowait() == ("https://news.dickinson.edu/c", 3)
+
+    # 맡은 크롤러가 끝나면 보낸 크롤러가 이어받음
+    coordinator.finished(main)
+    assert not coordinator.route("https://news.dickinson.edu/d", 3, admissions)
+    assert coordinator.owners["news.dickinson.edu"] is admissions
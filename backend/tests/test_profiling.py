@@ -0,0 +1,75 @@
+# backend/tests/test_profiling.py
+import os
+import threading
+
+import pytest
+
+from app.services.profiling import (
+    MAX_PROFILE_TTL, ProfilingSwitch, finish_profile, maybe_profile, profile_run, start_profile
+)
+
+
+class StaticSwitch:
+    def __init__(self, config):
+        self.config = config
+
+    def get(self, target):
+        return self.config
+
+
+def work():
+    return sorted(str(i) for i in range(20_000))
+
+
+def test_profile_run_writes_profile_and_memory_snapshot(tmp_path):
+    for mode, ext in (("cprofile", ".prof"), ("sample", ".folded")):
+        with profile_run("test", mode=mode, directory=str(tmp_path)) as run:
+            work()
+
+        names = {os.path.basename(path) for path in run['files']}
+        assert names == {run['run_id'] + suffix for suffix in (ext, ".tracemalloc", ".mem.txt")}
+        assert all(os.path.getsize(path) > 0 for path in run['files'] if not path.endswith(".folded"))
+
+
+def test_maybe_profile_is_noop_when_switched_off(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.profiling.default_profile_dir", lambda: str(tmp_path))
+
+    with maybe_profile("api", switch=StaticSwitch(None)) as run:
+        work()
+    assert run is None
+    assert os.listdir(tmp_path) == []
+
+    with maybe_profile("api", switch=StaticSwitch({'mode': 'cprofile', 'memory': False})) as run:
+        # 같은 프로세스에서 겹친 프로파일링은 건너뜀
+        with maybe_profile("api", switch=StaticSwitch({'mode': 'cprofile'})) as nested:
+            work()
+    assert nested is None
+    assert os.listdir(tmp_path) == [run['run_id'] + ".prof"]
+
+
+def test_profile_finishes_on_another_thread(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.profiling.default_profile_dir", lambda: str(tmp_path))
+
+    run = start_profile("api", {'mode': 'cprofile', 'memory': True})
+    work()
+    run.pause()
+    # 미들웨어처럼 저장은 다른 스레드에서
+    worker = threading.Thread(target=finish_profile, args=(run,))
+    worker.start()
+    worker.join()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in run.result['files'])
+    # 잠금이 풀려 다음 실행 가능
+    assert start_profile("api", None) is None
+    next_run = start_profile("api", {'mode': 'sample', 'memory': False})
+    assert next_run is not None
+    next_run.pause()
+    finish_profile(next_run)
+
+
+def test_switch_rejects_ttl_over_cap():
+    switch = ProfilingSwitch(redis=object())
+
+    for ttl in (0, MAX_PROFILE_TTL + 1):
+        with pytest.raises(ValueError):
+            switch.enable("api", ttl=ttl)
@@ -0,0 +1,83 @@
+# backend/tests/test_query_cache.py
+from app.services.query_cache import QUERY_KEY_PREFIX, QueryCache, normalize_query, query_hash
+
+CS = "https://www.dickinson.edu/computer-science"
+AID = "https://www.dickinson.edu/financial-aid"
+
+
+class MiniRedis:
+    """QueryCache가 쓰는 명령만 구현 (TTL 무시)"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.hashes = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += int(self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None)
+            self.hashes.pop(key, None)
+        return removed
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return MiniPipeline(self)
+
+
+class MiniPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def test_query_normalization_shares_key():
+    assert normalize_query("  What are the CS   requirements?") == "what are the cs requirements"
+    assert query_hash("What are the CS requirements?") == query_hash("what are the cs requirements")
+    assert query_hash("cs requirements") != query_hash("aid requirements")
+
+
+def test_eviction_follows_reverse_index_and_counts():
+    cache = QueryCache(redis=MiniRedis())
+    cache.set("CS requirements?", {"answer": "...", "sources": [CS]})
+    cache.set("cs and aid", {"answer": "...", "sources": [CS, AID]})
+    cache.set("aid deadline", {"answer": "...", "sources": [AID]})
+
+    assert cache.get("cs requirements") is not None
+    assert cache.get("housing") is None
+
+    # CS를 인용한 답변 둘만 제거
+    assert cache.invalidate_sources([CS]) == 2
+    assert cache.get("CS requirements?") is None
+    assert cache.get("aid deadline") is not None
+    assert cache.invalidate_source(CS) == 0
+
+    assert cache.get_stats() == {"hits": 2, "misses": 2, "evictions": 2, "hit_rate": 0.5}
+    assert list(cache.redis.values) == [QUERY_KEY_PREFIX + query_hash("aid deadline")]
@@ -0,0 +1,101 @@
+# backend/tests/test_search_engine.py
+import numpy as np
+
+from app.services import search_engine
+from app.services.chunker import Chunk
+from app.services.search_engine import SEARCH_VERSION_KEY, HybridSearchEngine, get_engine
+
+CS = "https://www.dickinson.edu/computer-science"
+AID = "https://www.dickinson.edu/financial-aid"
+NEWS = "https://www.dickinson.edu/news/robotics"
+
+
+def chunk(url, index, text, category):
+    return Chunk(
+        id=f"{url}#{index}", doc_id=url, chunk_index=index, text=text,
+        section="h2:Overview", title=url.rsplit("/", 1)[-1], source_url=url, category=category
+    )
+
+
+def corpus():
+    chunks = [
+        chunk(CS, 0, "computer science major requirements\ncore courses", "academics"),
+        chunk(CS, 1, "core courses\nelectives in machine learning", "academics"),
+        chunk(AID, 0, "financial aid deadlines and scholarships", "admissions"),
+        chunk(NEWS, 0, "students build robots for computer science fair", "news"),
+    ]
+    vectors = np.array([[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0.5, 0, 0.5]], dtype=np.float32)
+    return HybridSearchEngine().build(chunks, vectors)
+
+
+def test_fusion_weights_vector_and_keyword_scores():
+    engine = corpus()
+    mask = engine.filter_mask(None)
+
+    scores = engine.score("financial aid", np.array([1, 0, 0], dtype=np.float32), mask)
+
+    # 벡터 최고점 (CS#0) = 0.7, 키워드만 맞는 AID = 0.3
+    assert np.isclose(scores[0], search_engine.VECTOR_WEIGHT)
+    assert np.isclose(scores[2], search_engine.KEYWORD_WEIGHT)
+    assert scores.argmax() == 0
+
+
+def test_category_bitmask_filter():
+    engine = corpus()
+
+    assert engine.filter_mask({"category": "news"}).tolist() == [False, False, False, True]
+    assert engine.filter_mask({"category": ["academics", "admissions"]}).tolist() == [True, True, True, False]
+    assert not engine.filter_mask({"category": "unknown"}).any()
+    assert engine.filter_mask({"exclude_urls": [CS]}).tolist() == [False, False, True, True]
+
+    results = engine.search("computer science", top_k=5, filters={"category": "news"}, query_vector=np.array([1, 0, 0]))
+    assert [r["source_url"] for r in results] == [NEWS]
+
+
+def test_merge_adjacent_chunks_dedupes_overlap():
+    engine = corpus()
+
+    results = engine.search("computer science courses", top_k=2, query_vector=np.array([1, 0, 0]))
+
+    assert results[0]["source_url"] == CS
+    # 인접한 CS#0, CS#1은 한 결과로, 겹친 문단("core courses")은 한 번만
+    assert results[0]["text"].split("\n") == [
+        "computer science major requirements", "core courses", "electives in machine learning"
+    ]
+    assert len(results) == 2 and results[1]["source_url"] == NEWS
+
+
+class VersionRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+def test_engine_refreshes_when_index_version_changes(monkeypatch):
+    builds = []
+
+    def build_from_collection(self):
+        builds.append(self)
+        return self
+
+    monkeypatch.setattr(HybridSearchEngine, "build_from_collection", build_from_collection)
+    monkeypatch.setattr(search_engine, "_engine", None)
+    redis = VersionRedis()
+
+    first = get_engine(redis=redis)
+    assert get_engine(redis=redis) is first
+
+    search_engine.bump_search_version(redis)
+    assert redis.get(SEARCH_VERSION_KEY) == 1
+    # 재구축 중에는 이전 엔진으로 응답, 끝나면 교체
+    assert get_engine(redis=redis) is first
+    with search_engine._build_lock:
+        pass
+    assert get_engine(redis=redis) is builds[-1] is not first
+    assert len(builds) == 2
@@ -0,0 +1,90 @@
+# backend/tests/test_section_hashes.py
+import numpy as np
+
+from app.services.chunker import Chunk
+from app.services.hash_utils import diff_sections, hash_sections
+from app.services.index_service import IndexService
+from app.services.vector_store import VectorStore
+
+URL = "https://www.dickinson.edu/academics"
+HEADINGS = [
+    {'level': 'h2', 'title': 'Overview'},
+    {'level': 'h2', 'title': 'Courses'},
+    {'level': 'h2', 'title': 'Contact'},
+]
+
+
+def page(courses: str = "CS 101", contact: str = "Tome Hall") -> str:
+    return f"Intro\nOverview\nAbout the major\nCourses\n{courses}\nContact\n{contact}"
+
+
+def test_hash_sections_records_spans():
+    content = page()
+    sections = hash_sections(content, HEADINGS + [{'level': 'h3', 'title': 'Missing'}])
+
+    assert content[sections[1]['start']:sections[1]['end']] == "Courses\nCS 101\n"
+    assert sections[2]['end'] == len(content)
+    assert sections[3]['start'] == -1 and sections[3]['content_hash'] == ""
+
+
+def test_diff_sections_reports_only_edited_section():
+    old = page()
+    new = page(courses="CS 101, CS 102")
+
+    assert diff_sections(old, hash_sections(old, HEADINGS), new, hash_sections(new, HEADINGS)) == [1]
+    assert diff_sections(old, hash_sections(old, HEADINGS), old, hash_sections(old, HEADINGS)) == []
+
+
+def test_diff_sections_marks_predecessor_of_removed_section():
+    old = page()
+    new = "Intro\nOverview\nAbout the major\nContact\nTome Hall"
+    headings = [HEADINGS[0], HEADINGS[2]]
+
+    assert diff_sections(old, hash_sections(old, HEADINGS), new, hash_sections(new, headings)) == [0]
+
+
+def test_diff_sections_without_stored_hashes_is_unknown():
+    legacy = [{'level': h['level'], 'title': h['title'], 'content_hash': None} for h in HEADINGS]
+    assert diff_sections(page(), legacy, page(), hash_sections(page(), HEADINGS)) is None
+
+
+class FixedChunker:
+    """섹션 하나 = 청크 하나"""
+
+    def chunk_document(self, document):
+        for i, text in enumerate(document['content'].split('|')):
+            yield Chunk(
+                id=f"{URL}_chunk_{i}", doc_id=URL, chunk_index=i, text=text,
+                section="", title="Page", source_url=URL,
+                section_index=i, end_section_index=i
+            )
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.embedded = []
+
+    def embed_chunks(self, chunks):
+        self.embedded.extend(chunk.chunk_index for chunk in chunks)
+        return np.ones((len(chunks), 4))
+
+
+def test_partial_reindex_embeds_only_changed_chunks(fake_weaviate):
+    embedder = CountingEmbedder()
+    service = IndexService(
+        collection=object(),
+        chunker=FixedChunker(),
+        embedder=embedder,
+        store=VectorStore(client=fake_weaviate),
+        query_cache=object()
+    )
+    service.store.ensure_collection()
+
+    service.index_document({'normalized_url': URL, 'content': "a|b|c|d"})
+    embedder.embedded.clear()
+
+    result = service.index_document({'normalized_url': URL, 'content': "a|B|c"}, changed_sections=[1])
+
+    assert embedder.embedded == [1]
+    assert result == {"url": URL, "chunks": 3, "upserted": 1, "deleted": 1, "reused": 2}
+    assert len(fake_weaviate.collections.get("Chunk").objects) == 3
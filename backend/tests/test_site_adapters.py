@@ -0,0 +1,101 @@
+# backend/tests/test_site_adapters.py
+import json
+from pathlib import Path
+
+from app.services.hash_utils import hash_sections
+from app.services.site_adapters import CampusLabsAdapter, NutrisliceAdapter, get_adapter
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class RecordedHttp:
+    """API URL → 기록된 JSON fixture"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, params=None, headers=None):
+        self.calls.append((url, params))
+        return FakeResponse(json.loads((FIXTURES / self.routes[url]).read_text()))
+
+
+def test_adapter_registry_uses_whitelist():
+    http = RecordedHttp({})
+    assert isinstance(get_adapter("https://dickinson.nutrislice.com/menu", http), NutrisliceAdapter)
+    assert isinstance(get_adapter("https://dickinson.campuslabs.com/engage/organizations", http), CampusLabsAdapter)
+    assert get_adapter("https://www.dickinson.edu/academics", http) is None
+
+
+def test_nutrislice_schools_lists_menu_pages():
+    http = RecordedHttp({
+        "https://dickinson.api.nutrislice.com/menu/api/schools/": "nutrislice_schools.json"
+    })
+    page = NutrisliceAdapter(http).fetch("https://dickinson.nutrislice.com/menu")
+
+    assert [s['title'] for s in page.sections] == ["Dining Hall", "Devil's Den"]
+    assert page.links == [
+        "https://dickinson.nutrislice.com/menu/dining-hall/breakfast",
+        "https://dickinson.nutrislice.com/menu/dining-hall/lunch",
+        "https://dickinson.nutrislice.com/menu/devils-den/grill",
+    ]
+
+
+def test_nutrislice_week_menu():
+    http = RecordedHttp({
+        "https://dickinson.api.nutrislice.com/menu/api/weeks/school/dining-hall/menu-type/breakfast/2025/09/08/":
+            "nutrislice_week.json"
+    })
+    url = "https://dickinson.nutrislice.com/menu/dining-hall/breakfast/2025-09-08"
+    page = NutrisliceAdapter(http).fetch(url)
+
+    assert page.title == "Dining Hall Breakfast Menu"
+    assert page.content.split('\n') == [
+        "Breakfast - Monday, September 8, 2025",
+        "Entrees",
+        "Buttermilk Pancakes (310 cal, Vegetarian): Served with maple syrup",
+        "Scrambled Eggs",
+        "Sides",
+        "Fresh Fruit Bar",
+    ]
+    assert [(s['level'], s['title']) for s in page.sections] == [
+        ('h2', "Breakfast - Monday, September 8, 2025"), ('h3', "Entrees"), ('h3', "Sides")
+    ]
+    # 헤딩이 본문 줄과 일치 → 섹션 범위/해시 계산 가능
+    assert all(s['start'] >= 0 for s in hash_sections(page.content, page.sections))
+
+
+def test_campuslabs_organizations_grouped_by_category():
+    http = RecordedHttp({
+        "https://dickinson.campuslabs.com/engage/api/discovery/search/organizations": "campuslabs_organizations.json"
+    })
+    page = CampusLabsAdapter(http).fetch("https://dickinson.campuslabs.com/engage/organizations")
+
+    assert [s['title'] for s in page.sections] == ["Academic", "Other", "Recreational"]
+    assert "Computer Science Society: Talks, hackathons and study sessions." in page.content
+    assert "https://dickinson.campuslabs.com/engage/organization/CSS" in page.links
+    assert len(http.calls) == 1
+
+
+def test_campuslabs_organization_detail():
+    http = RecordedHttp({
+        "https://dickinson.campuslabs.com/engage/api/discovery/organization/bykey/css": "campuslabs_organization.json"
+    })
+    page = CampusLabsAdapter(http).fetch("https://dickinson.campuslabs.com/engage/organization/css")
+
+    assert page.title == "Computer Science Society"
+    assert "We host weekly talks. Everyone is welcome." in page.content
+    assert "css@dickinson.edu" in page.content
+    assert "https://instagram.com/dickinsoncss" in page.content
+    assert [s['title'] for s in page.sections] == ["About", "Contact"]
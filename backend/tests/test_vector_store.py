@@ -0,0 +1,90 @@
+# backend/tests/test_vector_store.py
+import numpy as np
+
+from app.services.chunker import Chunk
+from app.services.vector_store import VectorStore, build_points, chunk_uuid
+
+
+def make_chunks(url: str, n: int, text: str = "body"):
+    return [
+        Chunk(
+            id=f"{url}_chunk_{i}",
+            doc_id=url,
+            chunk_index=i,
+            text=f"{text} {i}",
+            section="h2:Overview",
+            title="Page",
+            source_url=url,
+            category="academics"
+        )
+        for i in range(n)
+    ]
+
+
+def upsert(store, url, n, text="body"):
+    chunks = make_chunks(url, n, text)
+    return store.replace_source(url, build_points(chunks, np.ones((n, 4))))
+
+
+def test_chunk_uuid_is_deterministic():
+    a = chunk_uuid("https://www.dickinson.edu/academics", 3)
+    assert a == chunk_uuid("https://www.dickinson.edu/academics", 3)
+    assert a != chunk_uuid("https://www.dickinson.edu/academics", 4)
+    assert a != chunk_uuid("https://www.dickinson.edu/admissions", 3)
+
+
+def test_upsert_uses_batch_api(fake_weaviate):
+    store = VectorStore(client=fake_weaviate, batch_size=50)
+    store.ensure_collection()
+
+    upsert(store, "https://www.dickinson.edu/a", 120)
+
+    collection = fake_weaviate.collections.get("Chunk")
+    assert len(collection.objects) == 120
+    assert collection.batch_sizes == [50]
+
+
+def test_reindex_overwrites_and_trims_only_that_page(fake_weaviate):
+    store = VectorStore(client=fake_weaviate)
+    store.ensure_collection()
+    collection = fake_weaviate.collections.get("Chunk")
+
+    upsert(store, "https://www.dickinson.edu/a", 5)
+    upsert(store, "https://www.dickinson.edu/b", 3)
+
+    # 페이지 a가 짧아짐 → 꼬리 2개 삭제, b는 그대로
+    result = upsert(store, "https://www.dickinson.edu/a", 3, text="new")
+
+    assert result == {"upserted": 3, "deleted": 2}
+    assert len(collection.objects) == 6
+    a_texts = sorted(
+        o["properties"]["text"] for o in collection.objects.values()
+        if o["properties"]["source_url"] == "https://www.dickinson.edu/a"
+    )
+    assert a_texts == ["new 0", "new 1", "new 2"]
+
+
+def test_delete_vectors_by_source(fake_weaviate):
+    store = VectorStore(client=fake_weaviate)
+    store.ensure_collection()
+
+    upsert(store, "https://www.dickinson.edu/a", 4)
+    upsert(store, "https://www.dickinson.edu/b", 2)
+
+    assert store.delete_vectors_by_source("https://www.dickinson.edu/a") == 4
+    assert store.delete_vectors_by_source("https://www.dickinson.edu/a") == 0
+    assert len(fake_weaviate.collections.get("Chunk").objects) == 2
+
+
+def test_delete_by_sources_removes_only_listed_pages(fake_weaviate):
+    store = VectorStore(client=fake_weaviate)
+    store.ensure_collection()
+    collection = fake_weaviate.collections.get("Chunk")
+
+    for page in ("a", "b", "c"):
+        upsert(store, f"https://www.dickinson.edu/{page}", 3)
+
+    deleted = store.delete_vectors_by_sources(["https://www.dickinson.edu/a", "https://www.dickinson.edu/c"])
+
+    assert deleted == 6
+    assert {obj["properties"]["source_url"] for obj in collection.objects.values()} == {"https://www.dickinson.edu/b"}